@@ -12,6 +12,7 @@ about where a new class should go, post a question on Piazza.
 from consts import *
 from game2d import *
 from wave import *
+from replay import *
 
 
 
@@ -46,9 +47,11 @@ class Invaders(GameApp):
 
     INSTANCE ATTRIBUTES:
         view:   the game view, used in drawing (see examples from class)
-                [instance of GView; it is inherited from GameApp]
+                [instance of GView, or of GRaster or GNullView on a headless backend;
+                it is inherited from GameApp]
         input:  the user input, used to control the ship and change state
-                [instance of GInput; it is inherited from GameApp]
+                [instance of GInput, or of GFakeInput on a headless backend;
+                it is inherited from GameApp]
         _state: the current state of the game represented as a value from consts.py
                 [one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE, STATE_PAUSED, STATE_CONTINUE, STATE_COMPLETE]
         _wave:  the subcontroller for a single wave, which manages the ships and aliens
@@ -72,8 +75,15 @@ class Invaders(GameApp):
     _last_keys: the number of keys pressed during the frame [int > 0]
     _soundEffect: sound effect implemented when the alien or the ship is destroyed (extension)
     _scoreBoard:
+    _seed:     the seed of the waves of the game [int >= 0]
+    _recorder: the input of every update so far [ReplayWriter if REPLAY_FILE is not
+               None, else InputRecorder if record is True, else None]
     """
 
+    # Whether to keep the input of every update in memory when there is no REPLAY_FILE.
+    # It is off by default, as the recording grows with the time played.
+    record = False
+
     # DO NOT MAKE A NEW INITIALIZER!
 
     # THREE MAIN GAMEAPP METHODS
@@ -95,9 +105,16 @@ class Invaders(GameApp):
                             font_size=30, linecolor=introcs.HSV(0.5,1.0,0.3),
                             fillcolor = introcs.HSV(0.2,0.3,0.4),
                             text='PRESS ANY KEY TO PLAY', 
-                            font_name = "Retrogame.ttf")
+                            font_name = "RetroGame.ttf")
         self._last_keys = None
         self._scoreBoard = None
+        self._seed = newSeed()
+        if REPLAY_FILE is not None:
+            self._recorder = ReplayWriter(REPLAY_FILE, self._seed)
+        elif self.record:
+            self._recorder = InputRecorder(self._seed)
+        else:
+            self._recorder = None
         # self._soundEffect = True # Extension
 
     def update(self,dt):
@@ -148,11 +165,20 @@ class Invaders(GameApp):
         """
         #backgroundMusic = Sound('background.wav')
 
+        if self._recorder is not None:
+            if self._recorder.needsKeyframe():
+                self._recorder.keyframe(self.getSnapshot())
+            self._recorder.record(dt, self.input)
+
+        # A frame that does not move the wave must draw it where it stopped
+        if self._wave != None:
+            self._wave.beginStep()
+
         if self._state == STATE_INACTIVE:
             self.determine_state()
 
         if self._state == STATE_NEWWAVE:
-            self._wave = Wave()
+            self._wave = Wave(self._seed)
             self._state = STATE_ACTIVE
 
         if self._state == STATE_ACTIVE:
@@ -171,7 +197,7 @@ class Invaders(GameApp):
                                 font_size=30, linecolor=LINE_COLOR,
                 fillcolor=TEXT_COLOR, text='PRESS S TO CONTINUE '
                 + str(self._wave.getLives()) + ' LIFE LEFT',
-                font_name="Retrogame.ttf")
+                font_name="RetroGame.ttf")
             self._last_keys = None
             self.determine_state()
 
@@ -235,13 +261,75 @@ class Invaders(GameApp):
         Wave. In order to draw them, you either need to add getters for these attributes
         or you need to add a draw method to class Wave.  We suggest the latter.  See
         the example subcontroller.py from class.
+
+        With a fixed tick rate, the wave is drawn the fraction alpha of the way from
+        the update before the last one to the last one, so that motion stays smooth
+        when the display rate is not a multiple of the tick rate.
         """
 
         if self._text != None:
             self._text.draw(self.view)
 
         if self._wave != None:
-            self._wave.draw(self.view)
+            self._wave.draw(self.view, self.alpha)
+
+    def getRecorder(self):
+        """
+        Returns the seed and the input recorded so far, which replay (in replay.py)
+        can play back to get exactly the same game
+
+        This is None if the game is not recorded (see the class attribute record).
+        """
+        return self._recorder
+
+    def getSnapshot(self):
+        """
+        Returns the whole state of the game as a snapshot (see packState in headless.py)
+
+        A HeadlessGame set to this snapshot continues the game exactly as this one.
+        """
+        wave = None if self._wave is None else self._wave.getSim()
+        return packState(self._seed, self._state, wave)
+
+    def save(self):
+        """
+        Returns the whole state of the game as a tuple (seed, state, wave)
+
+        This is the same tuple as HeadlessGame.save (in headless.py), so a state saved
+        here can be restored by a HeadlessGame, and the other way around.
+        """
+        wave = None if self._wave is None else self._wave.getSim()
+        return saveGame(self._seed, self._state, wave)
+
+    def restore(self, state):
+        """
+        Sets the whole state of the game to a tuple returned by save
+
+        The wave is reused if there is one, so no models are made again.  The
+        message on screen is not part of the state; it is cleared in STATE_ACTIVE
+        and is otherwise left as it is.
+
+        Parameter state: The state of the game
+        Precondition: state is a tuple returned by save or by HeadlessGame.save
+        """
+        seed, self._state, wave = state
+        if wave is None:
+            self._wave = None
+        else:
+            if self._wave is None:
+                self._wave = Wave(seed)
+            self._wave.restore(wave)
+        if self._state == STATE_ACTIVE:
+            self._text = None
+
+    def on_stop(self):
+        """
+        Finishes the recording when the window is closed.
+
+        This is a Kivy event handler, called by the method stop.
+        """
+        if self._recorder is not None:
+            self._recorder.close()
 
     # HELPER METHODS FOR THE STATES GO HERE
     def determine_state(self):
@@ -289,8 +377,6 @@ class Invaders(GameApp):
         if the life of the ship reaches 0, or if the alien passes the defense 
         line
         """
-        count = 0
-
         if self._wave.getLives() < 1 or self._wave.overDefenseLine():
             self._text = GLabel(x=GAME_WIDTH/2.0, y=GAME_HEIGHT/2.0,
                                 font_size=30, 
@@ -298,16 +384,12 @@ class Invaders(GameApp):
                                 text='GAME OVER')
             self._state = STATE_COMPLETE
         
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if self._wave.getAliens()[row][col] == None:
-                    count += 1
-                if count == ALIEN_ROWS * ALIENS_IN_ROW:
-                    self._text = GLabel(x=GAME_WIDTH/2.0, y=GAME_HEIGHT/2.0,
-                                        font_size=30, 
-                                        linecolor=introcs.HSV(0.5, 1.0, 0.3),
-                                        text='CONGRADULATION YOU WON!!')
-                    self._state = STATE_COMPLETE
+        if self._wave.countAlienAlive() == 0:
+            self._text = GLabel(x=GAME_WIDTH/2.0, y=GAME_HEIGHT/2.0,
+                                font_size=30, 
+                                linecolor=introcs.HSV(0.5, 1.0, 0.3),
+                                text='CONGRADULATION YOU WON!!')
+            self._state = STATE_COMPLETE
 
     def turnOnOffSound(self):
         """
@@ -0,0 +1,473 @@
+"""
+Batch simulation module for Alien Invaders
+
+This module contains the class BatchWave, which plays many waves of Alien Invaders
+at once.  A HeadlessWave keeps one wave in Python objects and lists; a BatchWave
+keeps N waves in NumPy arrays with one row per wave, and every step is a fixed
+number of array operations no matter how many waves there are.  This is what bots
+and balance studies need, where hundreds of games are played side by side:
+
+    waves = BatchWave(256, seed=1)
+    while not waves.isDone().all():
+        reward, score, done = waves.step(actions)
+
+The rules are the ones in HeadlessWave, with the state machine of HeadlessGame
+reduced to what a bot needs:
+
+    - A game starts as soon as the batch is made (or reset).
+    - When the ship is destroyed, a life is lost and the ship is restored at the
+      start of the next step, as if the player pressed 's' at once.
+    - A game is done when it has no lives left, when an alien passes the defense
+      line or when every alien is destroyed.  A game that is done no longer
+      changes until it is reset.
+
+The aliens fire with a NumPy generator shared by the batch, not with the generator of
+a HeadlessWave, so a game in a batch does not play the same as a HeadlessWave with
+the same seed.
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from formation import *
+from collide import *
+from headless import alienScore
+import numpy as np
+
+# PRIMARY RULE: This module may only access consts.py, config.py, formation.py,
+# collide.py and headless.py.  It must never import game2d, models.py or anything else
+# that needs Kivy.
+
+# The bit of an action that moves the ship left (the same bit as 'left' in replay.py)
+ACTION_LEFT = 1
+
+# The bit of an action that moves the ship right (the same bit as 'right' in replay.py)
+ACTION_RIGHT = 2
+
+# The bit of an action that fires a bolt (the same bit as 'up' in replay.py)
+ACTION_FIRE = 4
+
+# The number of alien bolts a wave can hold before the arrays grow
+ALIEN_BOLTS = 4
+
+
+class BatchWave(object):
+    """
+    This class simulates N waves of Alien Invaders at once, without any graphics.
+
+    Every attribute with n in its shape has one row per wave.  A player can only have
+    one bolt on screen, so the player bolts need one entry per wave.  The alien bolts
+    are kept in slots; _alienon says which slots hold a bolt, and the arrays grow when
+    a wave needs more slots than there are.
+
+    INSTANCE ATTRIBUTES:
+        _n:         the number of waves [int > 0]
+        _config:    the constants of every wave [Config]
+        _rows:      the number of rows of aliens [int > 0]
+        _cols:      the number of aliens in a row [int > 0]
+        _rng:       the random number generator for the alien shots [np.random.Generator]
+        _x:         the x-coordinate of each alien, relative to the formation
+                    [float array of size rows*cols, shared by every wave]
+        _y:         the y-coordinate of each alien, relative to the formation
+                    [float array of size rows*cols, shared by every wave]
+        _points:    the points for destroying each alien [int array of size rows*cols]
+        _shipx:     the x-coordinate of each ship [float array of shape (n,)]
+        _shipalive: whether each ship is on screen [bool array of shape (n,)]
+        _alive:     whether each alien is alive [bool array of shape (n, rows*cols)]
+        _offx:      the horizontal offset of each formation [float array of shape (n,)]
+        _offy:      the vertical offset of each formation [float array of shape (n,)]
+        _direction: the direction in which the aliens are moving [int array of 1 or -1]
+        _time:      the time since the last alien step [float array of shape (n,)]
+        _moved:     whether the aliens moved since the last test against the walls
+                    [bool array of shape (n,)]
+        _tofire:    the number of alien steps until the next shot
+                    [int array of shape (n,)]
+        _boltx:     the x-coordinate of each player bolt [float array of shape (n,)]
+        _bolty:     the y-coordinate of each player bolt [float array of shape (n,)]
+        _bolton:    whether each player bolt is on screen [bool array of shape (n,)]
+        _alienx:    the x-coordinate of each alien bolt [float array of shape (n, slots)]
+        _alieny:    the y-coordinate of each alien bolt [float array of shape (n, slots)]
+        _alienon:   whether each slot holds an alien bolt [bool array of shape (n, slots)]
+        _lives:     the number of lives left [int array of shape (n,)]
+        _score:     the score of each game [int array of shape (n,)]
+        _done:      whether each game is over [bool array of shape (n,)]
+    """
+
+    # GETTERS
+
+    def getSize(self):
+        """
+        Returns the number of waves in the batch
+        """
+        return self._n
+
+    def getShipX(self):
+        """
+        Returns the array of x-coordinates of the ships
+
+        The value for a ship that is not on screen is meaningless (see getShipAlive).
+        """
+        return self._shipx
+
+    def getShipAlive(self):
+        """
+        Returns the array saying which ships are on screen
+        """
+        return self._shipalive
+
+    def getAlive(self):
+        """
+        Returns the array saying which aliens are alive, with one row per wave
+
+        Alien r*cols+c of a wave is in row r and column c, as in Formation.
+        """
+        return self._alive
+
+    def getOffset(self):
+        """
+        Returns the arrays (x, y) of the offsets of the formations
+        """
+        return (self._offx, self._offy)
+
+    def getBolts(self):
+        """
+        Returns the arrays (x, y, on) of the player bolts, with one entry per wave
+        """
+        return (self._boltx, self._bolty, self._bolton)
+
+    def getAlienBolts(self):
+        """
+        Returns the arrays (x, y, on) of the alien bolts, with one row per wave
+        """
+        return (self._alienx, self._alieny, self._alienon)
+
+    def getLives(self):
+        """
+        Returns the array of the number of lives left in each game
+        """
+        return self._lives
+
+    def getScore(self):
+        """
+        Returns the array of the score of each game
+
+        This array is part of the batch and changes in every step.
+        """
+        return self._score
+
+    def isDone(self):
+        """
+        Returns the array saying which games are over
+
+        This array is part of the batch and changes in every step.
+        """
+        return self._done
+
+    def isWon(self):
+        """
+        Returns the array saying which games are over with every alien destroyed
+        """
+        return self._done & ~self._alive.any(axis=1)
+
+    # INITIALIZER
+
+    def __init__(self, n, seed=None, config=None):
+        """
+        Initializer: Creates n waves at their starting positions
+
+        Parameter n: The number of waves
+        Precondition: n is an int > 0
+
+        Parameter seed: The seed of the random number generator (a new one if None)
+        Precondition: seed is None or an int >= 0
+
+        Parameter config: The configuration of every wave (the one in consts.py if None)
+        Precondition: config is None or a Config
+        """
+        assert type(n) == int and n > 0
+        assert config is None or isinstance(config, Config)
+        self._n = n
+        self._rng = np.random.default_rng(seed)
+        self._config = config = DEFAULT if config is None else config
+        self._rows = config.ALIEN_ROWS
+        self._cols = config.ALIENS_IN_ROW
+
+        formation = Formation(self._rows, self._cols,
+                              config.LEFT_TO_FIRST, config.TOP_TO_FIRST,
+                              config.ADDING_ROW, config.ADDING_COLUMN,
+                              config.ALIEN_WIDTH, config.ALIEN_HEIGHT)
+        self._x = formation.getX()
+        self._y = formation.getY()
+        self._points = np.array([alienScore(int(row)) for row in formation.getRow()])
+
+        self._shipx = np.zeros(n)
+        self._shipalive = np.zeros(n, dtype=bool)
+        self._alive = np.zeros((n, self._rows * self._cols), dtype=bool)
+        self._offx = np.zeros(n)
+        self._offy = np.zeros(n)
+        self._direction = np.ones(n, dtype=int)
+        self._time = np.zeros(n)
+        self._moved = np.zeros(n, dtype=bool)
+        self._tofire = np.zeros(n, dtype=int)
+        self._boltx = np.zeros(n)
+        self._bolty = np.zeros(n)
+        self._bolton = np.zeros(n, dtype=bool)
+        self._alienx = np.zeros((n, ALIEN_BOLTS))
+        self._alieny = np.zeros((n, ALIEN_BOLTS))
+        self._alienon = np.zeros((n, ALIEN_BOLTS), dtype=bool)
+        self._lives = np.zeros(n, dtype=int)
+        self._score = np.zeros(n, dtype=int)
+        self._done = np.zeros(n, dtype=bool)
+        self.reset()
+
+    # PUBLIC METHODS
+
+    def reset(self, which=None):
+        """
+        Starts new games in some of the waves
+
+        Parameter which: The waves to reset (all of them if None)
+        Precondition: which is None or a bool array of shape (n,)
+        """
+        config = self._config
+        if which is None:
+            which = np.ones(self._n, dtype=bool)
+        self._shipx[which] = config.GAME_WIDTH / 2
+        self._shipalive[which] = True
+        self._alive[which] = True
+        self._offx[which] = 0
+        self._offy[which] = 0
+        self._direction[which] = 1
+        self._time[which] = 0
+        self._moved[which] = True
+        self._tofire[which] = self._rng.integers(1, config.BOLT_RATE, size=self._n)[which]
+        self._bolton[which] = False
+        self._alienon[which] = False
+        self._lives[which] = config.SHIP_LIVES
+        self._score[which] = 0
+        self._done[which] = False
+
+    def step(self, actions, dt=1/TICK_RATE):
+        """
+        Plays one frame of every game that is not over, and returns the arrays
+        (reward, score, done)
+
+        The reward of a game is the number of points it scored in this frame.  The
+        arrays are copies, so they do not change in the steps after this one.
+
+        Parameter actions: The keys held down in each game
+        Precondition: actions is an int array of shape (n,), where each value is a
+        combination of ACTION_LEFT, ACTION_RIGHT and ACTION_FIRE
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        config = self._config
+        actions = np.asarray(actions)
+        live = ~self._done
+        before = self._score.copy()
+
+        # Ships lost in the last frame come back, if there are lives left
+        back = live & ~self._shipalive
+        self._shipx[back] = config.GAME_WIDTH / 2
+        self._shipalive[back] = True
+
+        self._updateShip(live, (actions & ACTION_LEFT) != 0,
+                         (actions & ACTION_RIGHT) != 0)
+        self._updateAliens(live, dt)
+        self._updateBolts(live, (actions & ACTION_FIRE) != 0)
+        self._updateAlienBolts(live)
+        self._collision(live)
+        self._collisionShip(live)
+        self._updateDone(live)
+        return (self._score - before, self._score.copy(), self._done.copy())
+
+    # HIDDEN METHODS
+
+    def _updateShip(self, live, left, right):
+        """
+        Moves the ships, as in HeadlessWave.updateShip
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+
+        Parameter left: The games where 'left' is held down
+        Precondition: left is a bool array of shape (n,)
+
+        Parameter right: The games where 'right' is held down
+        Precondition: right is a bool array of shape (n,)
+        """
+        config = self._config
+        move = live & self._shipalive
+        left = move & left & (self._shipx - config.SHIP_WIDTH/2 >= 0)
+        self._shipx[left] -= config.SHIP_MOVEMENT
+        right = move & right & (self._shipx + config.SHIP_WIDTH/2 <= config.GAME_WIDTH)
+        self._shipx[right] += config.SHIP_MOVEMENT
+
+    def _updateAliens(self, live, dt):
+        """
+        Marches the aliens and turns them at the walls, as in HeadlessWave.updateAlien
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        config = self._config
+        self._time[live] += dt
+        march = live & (self._time > config.ALIEN_SPEED)
+        self._offx[march] += self._direction[march] * config.ALIEN_H_WALK
+        self._moved |= march
+        self._time[march] -= config.ALIEN_SPEED
+        self._tofire[march] -= 1
+
+        columns = self._columns()
+        test = live & self._moved & columns.any(axis=1)
+        self._moved[test] = False
+        mostright = self._x[self._cols-1 - columns[:, ::-1].argmax(axis=1)] + self._offx
+        mostleft = self._x[columns.argmax(axis=1)] + self._offx
+
+        right = test & (mostright >= config.BORDER_RIGHT)
+        left = test & ~right & (mostleft <= config.ALIEN_WIDTH/2 + config.ALIEN_H_SEP)
+        self._offx[right] -= config.ALIEN_H_WALK
+        self._offx[left] += config.ALIEN_H_WALK
+        self._offy[right | left] -= config.ALIEN_V_WALK
+        self._moved |= right | left
+        self._direction[right] = -1
+        self._direction[left] = 1
+
+    def _updateBolts(self, live, fire):
+        """
+        Fires and moves the player bolts, as in HeadlessWave.updateBolts
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+
+        Parameter fire: The games where 'up' is held down
+        Precondition: fire is a bool array of shape (n,)
+        """
+        config = self._config
+        make = live & fire & ~self._bolton & self._shipalive
+        self._boltx[make] = self._shipx[make]
+        self._bolty[make] = config.SHIP_BOTTOM + config.SHIP_HEIGHT/2
+        self._bolton |= make
+
+        move = live & self._bolton
+        self._bolty[move] += config.BOLT_SPEED
+        gone = self._bolty - config.BOLT_HEIGHT/2 > config.GAME_HEIGHT
+        self._bolton &= ~(move & gone)
+
+    def _updateAlienBolts(self, live):
+        """
+        Fires and moves the alien bolts, as in HeadlessWave.updateAlienBolts
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+        """
+        config = self._config
+        columns = self._columns()
+        games = np.flatnonzero(live & (self._tofire == 0) & columns.any(axis=1))
+        if len(games) > 0:
+            # A random column with an alien alive, and the lowest alien in it
+            columns = columns[games]
+            pick = self._rng.integers(0, columns.sum(axis=1))
+            col = (np.cumsum(columns, axis=1) > pick[:, None]).argmax(axis=1)
+            rows = self._alive.reshape(self._n, self._rows, self._cols)[games, :, col]
+            index = (self._rows-1 - rows[:, ::-1].argmax(axis=1)) * self._cols + col
+
+            slot = self._freeSlots(games)
+            self._alienx[games, slot] = self._x[index] + self._offx[games]
+            y = self._y[index] + self._offy[games]
+            self._alieny[games, slot] = y - config.ALIEN_WIDTH/2
+            self._alienon[games, slot] = True
+
+        move = live[:, None] & self._alienon
+        self._alieny[move] -= config.BOLT_SPEED
+        firing = move.any(axis=1)
+        self._tofire[firing] = self._rng.integers(1, config.BOLT_RATE, size=firing.sum())
+        self._alienon &= ~(move & (self._alieny + config.BOLT_HEIGHT/2 < 0))
+
+    def _collision(self, live):
+        """
+        Destroys the aliens hit by the player bolts, as in HeadlessWave.collision
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+        """
+        config = self._config
+        games = np.flatnonzero(live & self._bolton)
+        if len(games) == 0:
+            return
+
+        # Every bolt on screen moved up BOLT_SPEED in this frame
+        times = sweptHits(self._boltx[games] - self._offx[games],
+                          self._bolty[games] - self._offy[games], config.BOLT_SPEED,
+                          config.BOLT_WIDTH, config.BOLT_HEIGHT, self._x, self._y,
+                          config.ALIEN_WIDTH, config.ALIEN_HEIGHT, self._alive[games])
+        hit = np.isfinite(times).any(axis=1)
+        games = games[hit]
+        alien = times[hit].argmin(axis=1)
+        self._alive[games, alien] = False
+        self._score[games] += self._points[alien]
+        self._bolton[games] = False
+
+    def _collisionShip(self, live):
+        """
+        Destroys the ships hit by an alien bolt, as in HeadlessWave.collisionShip, and
+        takes away a life for each one
+
+        If two alien bolts hit a ship in the same frame, the one that reaches it first
+        is removed (the one in the first slot if they reach it together).
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+        """
+        config = self._config
+        # The alien bolts moved down BOLT_SPEED, so the ship moved up relative to them
+        times = sweptHits(self._shipx, np.full(self._n, config.SHIP_BOTTOM),
+                          config.BOLT_SPEED, config.SHIP_WIDTH, config.SHIP_HEIGHT,
+                          self._alienx, self._alieny, config.BOLT_WIDTH, config.BOLT_HEIGHT)
+        times[~(self._alienon & (live & self._shipalive)[:, None])] = np.inf
+        games = np.flatnonzero(np.isfinite(times).any(axis=1))
+        self._alienon[games, times[games].argmin(axis=1)] = False
+        self._shipalive[games] = False
+        self._lives[games] -= 1
+
+    def _updateDone(self, live):
+        """
+        Ends the games that are lost or won, as in HeadlessGame.determine_win_or_lose
+
+        Parameter live: The games being played
+        Precondition: live is a bool array of shape (n,)
+        """
+        config = self._config
+        rows = self._alive.reshape(self._n, self._rows, self._cols).any(axis=2)
+        empty = ~rows.any(axis=1)
+        lowest = (self._rows-1 - rows[:, ::-1].argmax(axis=1)) * self._cols
+        bottom = self._y[lowest] + self._offy - config.ALIEN_HEIGHT/2
+        over = ~empty & (bottom <= config.DEFENSE_LINE)
+        self._done |= live & ((self._lives < 1) | over | empty)
+
+    def _columns(self):
+        """
+        Returns the bool array of shape (n, cols) saying which columns of each wave
+        have an alien alive
+        """
+        return self._alive.reshape(self._n, self._rows, self._cols).any(axis=1)
+
+    def _freeSlots(self, games):
+        """
+        Returns a free alien bolt slot for each of the given waves, growing the arrays
+        if one of them has no free slot
+
+        Parameter games: The waves that need a slot
+        Precondition: games is an int array of distinct indices in 0..n-1
+        """
+        if self._alienon[games].all(axis=1).any():
+            more = (self._n, self._alienon.shape[1])
+            self._alienx = np.concatenate((self._alienx, np.zeros(more)), axis=1)
+            self._alieny = np.concatenate((self._alieny, np.zeros(more)), axis=1)
+            self._alienon = np.concatenate((self._alienon, np.zeros(more, dtype=bool)),
+                                           axis=1)
+        return (~self._alienon[games]).argmax(axis=1)
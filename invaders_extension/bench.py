@@ -0,0 +1,169 @@
+"""
+Frame benchmark for Alien Invaders
+
+This module is a command line tool that plays a Wave on the null backend of game2d
+(no window and nothing drawn, see game2d/backend.py) and reports how long the parts
+of a frame take, in microseconds per frame:
+
+    updateAlien: Wave.updateAlien, which moves the formation
+    collision:   Wave.collision and Wave.collisionShip, with the models they update
+    draw:        Wave.draw, which moves every model to the simulation and draws it
+    frame:       the whole frame, as played by Invaders.updateGame
+
+The game2d setters (x, y, width, ...) and contains check their arguments with
+asserts.  Running Python with -O is the release mode of game2d: the asserts are
+compiled out, while a normal run keeps them.  To see the saving, run the benchmark
+both ways and compare the rows:
+
+    python bench.py --frames 3000
+    python -O bench.py --frames 3000
+
+Each row is the best of --repeat runs.  The ship holds 'up' down and walks left and
+right, and a new wave is made (outside the timed code) when one is over.
+
+# Toshi Tokuyama (tt426)
+"""
+import sys
+
+# consts.py reads the size and speed of the aliens from sys.argv when it is imported,
+# so the options of this tool must be hidden from it first.  This is only done when
+# the tool is run; importing this module leaves sys.argv alone.
+if __name__ == '__main__':
+    _ARGV = sys.argv[1:]
+    sys.argv = sys.argv[:1]
+
+# The backend must be chosen before any model is made
+import game2d
+game2d.set_backend('null')
+
+from consts import *
+from game2d import *
+from app import Invaders
+from wave import *
+import argparse
+import time
+
+# PRIMARY RULE: This module may only access consts.py, game2d, app.py and wave.py.
+# It plays a Wave the way Invaders does, but never runs the application.
+
+# The parts of a frame that are timed
+PHASES = ('updateAlien', 'collision', 'draw', 'frame')
+
+
+def main(argv):
+    """
+    Runs the benchmark given by the command line options
+
+    Parameter argv: The command line options
+    Precondition: argv is a list of str
+    """
+    parser = argparse.ArgumentParser(prog='bench.py',
+                                     description='Times the parts of a frame of a Wave '
+                                     '(run with python -O for the release mode).')
+    parser.add_argument('--frames', type=int, default=3000,
+                        help='the number of frames in a run (default 3000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='the number of runs; the best one is kept (default 5)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='the seed of the first wave (default 0)')
+    args = parser.parse_args(argv)
+
+    if args.frames < 1 or args.repeat < 1 or args.seed < 0:
+        parser.error('--frames and --repeat must be > 0, and --seed >= 0')
+
+    # Making the application sets the paths to the images of the models
+    Invaders(width=GAME_WIDTH, height=GAME_HEIGHT, tickrate=TICK_RATE)
+    times = bench(args.frames, args.repeat, args.seed)
+
+    print('mode: %s' % ('debug (asserts on)' if __debug__ else 'release (python -O)'))
+    for phase in PHASES:
+        print('%-12s %8.1f us/frame' % (phase, times[phase]))
+
+
+def bench(frames, repeat, seed):
+    """
+    Returns a dict with the best time of each phase in PHASES, in microseconds per frame
+
+    Parameter frames: The number of frames in a run
+    Precondition: frames is an int > 0
+
+    Parameter repeat: The number of runs
+    Precondition: repeat is an int > 0
+
+    Parameter seed: The seed of the first wave
+    Precondition: seed is an int >= 0
+    """
+    best = dict.fromkeys(PHASES, float('inf'))
+    for run in range(repeat):
+        seconds = playWave(frames, seed)
+        for phase in PHASES:
+            best[phase] = min(best[phase], seconds[phase]*1e6/frames)
+    return best
+
+
+def playWave(frames, seed):
+    """
+    Returns a dict with the total time in seconds of each phase in PHASES, for a
+    number of frames of play
+
+    Parameter frames: The number of frames to play
+    Precondition: frames is an int > 0
+
+    Parameter seed: The seed of the first wave
+    Precondition: seed is an int >= 0
+    """
+    dt = 1/TICK_RATE
+    clock = time.perf_counter
+    seconds = dict.fromkeys(PHASES, 0.0)
+    view = GNullView(GAME_WIDTH, GAME_HEIGHT)
+    input = GFakeInput()
+    wave = _newWave(seed)
+
+    for frame in range(frames):
+        input.set_keys(('up', 'left') if (frame//60) % 2 == 0 else ('up', 'right'))
+
+        start = clock()
+        wave.beginStep()
+        wave.updateShip(input)
+        t0 = clock()
+        wave.updateAlien(dt)
+        t1 = clock()
+        wave.updateBolts(input)
+        wave.updateAlienBolts()
+        t2 = clock()
+        wave.collision()
+        wave.collisionShip()
+        t3 = clock()
+        view.clear()
+        wave.draw(view)
+        end = clock()
+
+        seconds['updateAlien'] += t1-t0
+        seconds['collision'] += t3-t2
+        seconds['draw'] += end-t3
+        seconds['frame'] += end-start
+
+        if wave.loseRound():
+            wave.restoreShip()
+        if wave.countAlienAlive() == 0 or wave.overDefenseLine():
+            seed += 1
+            wave = _newWave(seed)
+    return seconds
+
+
+# HELPER FUNCTIONS
+
+def _newWave(seed):
+    """
+    Returns a new wave with no sound
+
+    Parameter seed: The seed of the wave
+    Precondition: seed is an int >= 0
+    """
+    wave = Wave(seed)
+    wave.setsoundEffect(False)
+    return wave
+
+
+if __name__ == '__main__':
+    main(_ARGV)
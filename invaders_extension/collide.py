@@ -0,0 +1,247 @@
+"""
+Collision module for Alien Invaders
+
+This module contains the functions that find the laser bolts hitting the aliens or
+the ship.  Instead of testing one bolt against one target at a time, they test every
+bolt against every target at once with a single NumPy broadcast.
+
+A bolt moves BOLT_SPEED pixels in a frame, so a fast bolt could jump over a target
+between two frames.  sweptHits tests the whole path of each bolt in the frame instead
+of its end position, and resolveSweptHits turns the result into the list of hits for
+the frame, letting each bolt destroy the first target in its way.  These are the two
+functions that the game uses (see headless.py and batch.py).
+
+The class SpatialHash is the broadphase.  It finds the few aliens near the path of a
+bolt, so that sweptHits only has to test those.
+
+All boxes are unrotated rectangles given by their centers and sizes, which is how the
+ship, the aliens and the bolts are drawn.
+
+# Toshi Tokuyama (tt426)
+"""
+import numpy as np
+import math
+
+# PRIMARY RULE: This module does not need anything from the game.  It must never
+# import game2d, models.py or anything else that needs Kivy.
+
+
+def sweptHits(bx, by, dy, bwidth, bheight, tx, ty, twidth, theight, alive=None):
+    """
+    Returns a 2d float array saying when the moving bolts first overlap the targets.
+
+    Each bolt moved straight up or down by dy in the frame, so at the start of the frame
+    it was at (bx, by-dy).  The value at [i, j] is the fraction of the frame (0..1) at
+    which bolt i first overlaps target j on the way, or inf if it never does.  This
+    finds a fast bolt that passes through a target between two frames.  A bolt
+    overlaps a target during the frame if the times at which it enters and leaves the
+    target overlap the frame, so a bolt that starts inside a target hits it at time 0,
+    even if it has left it by the end of the frame.
+
+    Parameter bx: The x-coordinates of the bolt centers
+    Precondition: bx is a 1d array (or list) of numbers
+
+    Parameter by: The y-coordinates of the bolt centers at the end of the frame
+    Precondition: by is a 1d array (or list) of numbers, the same length as bx
+
+    Parameter dy: The distance moved up by each bolt in the frame (down if negative)
+    Precondition: dy is a number, or a 1d array of numbers the same length as bx
+
+    Parameter bwidth: The width of a bolt
+    Precondition: bwidth is a number > 0
+
+    Parameter bheight: The height of a bolt
+    Precondition: bheight is a number > 0
+
+    Parameter tx: The x-coordinates of the target centers
+    Precondition: tx is a 1d array (or list) of numbers
+
+    Parameter ty: The y-coordinates of the target centers
+    Precondition: ty is a 1d array (or list) of numbers, the same length as tx
+
+    Parameter twidth: The width of a target
+    Precondition: twidth is a number > 0
+
+    Parameter theight: The height of a target
+    Precondition: theight is a number > 0
+
+    Parameter alive: Which targets can be hit (all of them if None)
+    Precondition: alive is None or a 1d bool array, the same length as tx
+    """
+    bx = np.asarray(bx, dtype=float)[:, None]
+    by = np.asarray(by, dtype=float)[:, None]
+    dy = np.asarray(dy, dtype=float)
+    if dy.ndim > 0:
+        dy = dy[:, None]
+    reach = (bheight + theight)/2
+
+    # The bolt overlaps a target in y from the time enter to the time leave
+    gap = ty - (by - dy)
+    still = dy == 0
+    step = np.where(still, 1.0, dy)
+    first = (gap - reach)/step
+    second = (gap + reach)/step
+    inside = np.abs(gap) < reach
+    enter = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(first, second))
+    leave = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(first, second))
+
+    hits = np.abs(bx - tx) < (bwidth + twidth)/2
+    hits &= (enter < 1) & (leave > 0)
+    if alive is not None:
+        hits &= alive
+    return np.where(hits, np.clip(enter, 0, 1), np.inf)
+
+
+def resolveSweptHits(times):
+    """
+    Returns the list of (target, bolt) pairs destroyed by the swept hits in a frame.
+
+    A bolt can only destroy one target and a target can only be destroyed once.  The
+    hits are taken from the earliest to the latest, so each bolt destroys the first
+    target in its way.  Hits at the same time are taken by target, then by bolt.
+    The pairs are listed in the order they happen.
+
+    Parameter times: The times of the hits between the bolts and the targets
+    Precondition: times is a 2d float array as returned by sweptHits
+    """
+    result = []
+    if times.size == 0:
+        return result
+
+    bolts, targets = np.nonzero(np.isfinite(times))
+    order = np.lexsort((bolts, targets, times[bolts, targets]))
+    usedbolts = set()
+    usedtargets = set()
+    for bolt, target in zip(bolts[order].tolist(), targets[order].tolist()):
+        if bolt not in usedbolts and target not in usedtargets:
+            usedbolts.add(bolt)
+            usedtargets.add(target)
+            result.append((target, bolt))
+    return result
+
+
+class SpatialHash(object):
+    """
+    A class to find the objects near a box without testing every object.
+
+    The plane is cut into a uniform grid of cells, and every object is stored in the
+    cells that its box overlaps.  A query only looks at the cells that the query box
+    overlaps, so it only returns objects that are close to it.  The caller still has
+    to test the returned objects (e.g. with sweptHits).
+
+    The grid has an origin that can be moved with translate.  Objects are stored
+    relative to the origin, so moving all of them together costs a single translate
+    instead of moving every object.
+
+    INSTANCE ATTRIBUTES:
+        _cellw:   the width of a cell [float > 0]
+        _cellh:   the height of a cell [float > 0]
+        _originx: the x-coordinate of the corner of cell (0,0) [float]
+        _originy: the y-coordinate of the corner of cell (0,0) [float]
+        _cells:   the objects in each cell [dict of (int, int) to nonempty set]
+    """
+
+    # GETTERS
+
+    def getOrigin(self):
+        """
+        Returns the position (x, y) of the corner of cell (0,0)
+        """
+        return (self._originx, self._originy)
+
+    # INITIALIZER
+
+    def __init__(self, cellwidth, cellheight):
+        """
+        Initializer: Creates an empty spatial hash with its origin at (0,0)
+
+        Parameter cellwidth: The width of a cell
+        Precondition: cellwidth is a number (int or float) > 0
+
+        Parameter cellheight: The height of a cell
+        Precondition: cellheight is a number (int or float) > 0
+        """
+        assert cellwidth > 0 and cellheight > 0
+        self._cellw = float(cellwidth)
+        self._cellh = float(cellheight)
+        self._originx = 0.0
+        self._originy = 0.0
+        self._cells = {}
+
+    # PUBLIC METHODS
+
+    def translate(self, dx, dy):
+        """
+        Moves every object in the hash by (dx, dy)
+
+        Parameter dx: The horizontal distance
+        Precondition: dx is a number (int or float)
+
+        Parameter dy: The vertical distance
+        Precondition: dy is a number (int or float)
+        """
+        self._originx += dx
+        self._originy += dy
+
+    def insert(self, key, left, bottom, right, top):
+        """
+        Adds an object to every cell that its box overlaps
+
+        Parameter key: The object to add
+        Precondition: key is hashable
+
+        Parameter left, bottom, right, top: The edges of the box of the object
+        Precondition: left, bottom, right, top are numbers, left <= right, bottom <= top
+        """
+        for cell in self._overlapped(left, bottom, right, top):
+            if cell in self._cells:
+                self._cells[cell].add(key)
+            else:
+                self._cells[cell] = {key}
+
+    def remove(self, key, left, bottom, right, top):
+        """
+        Removes an object from every cell that its box overlaps
+
+        The box must be the one the object was inserted with, moved by every translate
+        since then.
+
+        Parameter key: The object to remove
+        Precondition: key is hashable
+
+        Parameter left, bottom, right, top: The edges of the box of the object
+        Precondition: left, bottom, right, top are numbers, left <= right, bottom <= top
+        """
+        for cell in self._overlapped(left, bottom, right, top):
+            if cell in self._cells:
+                self._cells[cell].discard(key)
+                if len(self._cells[cell]) == 0:
+                    del self._cells[cell]
+
+    def query(self, left, bottom, right, top):
+        """
+        Returns the set of objects in the cells that a box overlaps
+
+        Parameter left, bottom, right, top: The edges of the box
+        Precondition: left, bottom, right, top are numbers, left <= right, bottom <= top
+        """
+        result = set()
+        for cell in self._overlapped(left, bottom, right, top):
+            if cell in self._cells:
+                result |= self._cells[cell]
+        return result
+
+    # HIDDEN METHODS
+
+    def _overlapped(self, left, bottom, right, top):
+        """
+        Returns the list of cells (i, j) that a box overlaps
+
+        Parameter left, bottom, right, top: The edges of the box
+        Precondition: left, bottom, right, top are numbers, left <= right, bottom <= top
+        """
+        i0 = math.floor((left - self._originx) / self._cellw)
+        i1 = math.floor((right - self._originx) / self._cellw)
+        j0 = math.floor((bottom - self._originy) / self._cellh)
+        j1 = math.floor((top - self._originy) / self._cellh)
+        return [(i, j) for i in range(i0, i1+1) for j in range(j0, j1+1)]
@@ -0,0 +1,129 @@
+"""
+Configuration module for Alien Invaders
+
+The constants in consts.py are fixed when the module is imported, so a program can
+only play one configuration of the game.  This module contains the class Config,
+which holds the same constants as an object.  The simulation (see headless.py and
+batch.py) reads its constants from a Config, so one process can play games with
+different aliens, speeds or sizes side by side:
+
+    config = Config(ALIEN_ROWS=3, ALIEN_SPEED=0.5)
+    game = HeadlessGame(seed, config)
+
+A Config starts with the values in consts.py and replaces the ones given to it.  The
+constants that consts.py computes from others (LEFT_TO_FIRST, ADDING_ROW,
+TOP_TO_FIRST, ADDING_COLUMN and BORDER_RIGHT) are computed again from the values of
+the Config, so they always agree with them.
+
+# Toshi Tokuyama (tt426)
+"""
+import consts
+
+# PRIMARY RULE: This module may only access consts.py.  It must never import game2d,
+# models.py or anything else that needs Kivy.
+
+# The constants that a configuration can set
+NAMES = ('GAME_WIDTH', 'GAME_HEIGHT', 'SHIP_WIDTH', 'SHIP_HEIGHT', 'SHIP_BOTTOM',
+         'SHIP_MOVEMENT', 'SHIP_LIVES', 'DEFENSE_LINE', 'ALIEN_WIDTH', 'ALIEN_HEIGHT',
+         'ALIEN_H_SEP', 'ALIEN_V_SEP', 'ALIEN_H_WALK', 'ALIEN_V_WALK', 'ALIEN_CEILING',
+         'ALIEN_ROWS', 'ALIENS_IN_ROW', 'ALIEN_SPEED', 'BOLT_WIDTH', 'BOLT_HEIGHT',
+         'BOLT_SPEED', 'BOLT_RATE')
+
+# The constants that a configuration computes from the others
+DERIVED = ('LEFT_TO_FIRST', 'ADDING_ROW', 'TOP_TO_FIRST', 'ADDING_COLUMN', 'BORDER_RIGHT')
+
+
+class Config(object):
+    """
+    A class to hold the constants of one configuration of the game.
+
+    Every name in NAMES and in DERIVED is an attribute, with the same meaning as the
+    constant of that name in consts.py.  A Config must not be changed once it is made;
+    use the method replace to make a Config with different values.
+
+    INSTANCE ATTRIBUTES:
+        the names in NAMES:   the values of the configuration [int or float]
+        the names in DERIVED: the values computed from the others [int or float]
+    """
+
+    # INITIALIZER
+
+    def __init__(self, **values):
+        """
+        Initializer: Creates a configuration with the values in consts.py, except for
+        the given ones
+
+        A TypeError is raised if a name is not in NAMES, or if a value has the wrong
+        type, and a ValueError is raised if a value is out of range.  These are errors
+        rather than asserts, so a Config made from the input of a user (see sweep.py)
+        is checked even when Python runs with -O.
+
+        Parameter values: The constants to change, by name
+        Precondition: every name is in NAMES, ALIEN_ROWS, ALIENS_IN_ROW and BOLT_RATE
+        are ints (with BOLT_RATE > 1), and every other value is a number > 0
+        """
+        for name in values:
+            if name not in NAMES:
+                raise TypeError('%s is not a constant of a configuration' % repr(name))
+        for name in NAMES:
+            value = values.get(name, getattr(consts, name))
+            if name in ('ALIEN_ROWS', 'ALIENS_IN_ROW', 'BOLT_RATE'):
+                valid = [int]
+            else:
+                valid = [int, float]
+            if type(value) not in valid:
+                raise TypeError('%s is not a valid value for %s' % (repr(value), name))
+            if value <= 0 or (name == 'BOLT_RATE' and value <= 1):
+                raise ValueError('%s is not a valid value for %s' % (repr(value), name))
+            setattr(self, name, value)
+
+        self.LEFT_TO_FIRST = self.ALIEN_H_SEP + self.ALIEN_WIDTH/2
+        self.ADDING_ROW = self.ALIEN_WIDTH + self.ALIEN_H_SEP
+        self.TOP_TO_FIRST = self.GAME_HEIGHT - (self.ALIEN_CEILING + self.ALIEN_WIDTH/2)
+        self.ADDING_COLUMN = self.ALIEN_V_SEP + self.ALIEN_HEIGHT
+        self.BORDER_RIGHT = self.GAME_WIDTH - self.ALIEN_WIDTH/2 - self.ALIEN_H_SEP
+
+    def __eq__(self, other):
+        """
+        Returns True if other is a Config with the same values
+        """
+        return isinstance(other, Config) and self.asDict() == other.asDict()
+
+    def __hash__(self):
+        """
+        Returns a hash of the values, so that a Config can be a key of a dict
+        """
+        return hash(tuple(self.asDict().items()))
+
+    def __repr__(self):
+        """
+        Returns the values that differ from consts.py, as a call to Config
+        """
+        changed = ['%s=%s' % (name, repr(value))
+                   for (name, value) in self.asDict().items()
+                   if value != getattr(consts, name)]
+        return 'Config(%s)' % ', '.join(changed)
+
+    # PUBLIC METHODS
+
+    def asDict(self):
+        """
+        Returns the values of the names in NAMES as a dict
+        """
+        return {name: getattr(self, name) for name in NAMES}
+
+    def replace(self, **values):
+        """
+        Returns a new configuration with the values of this one, except for the given
+        ones
+
+        Parameter values: The constants to change, by name
+        Precondition: values are as in the initializer
+        """
+        result = self.asDict()
+        result.update(values)
+        return Config(**result)
+
+
+# The configuration with the values in consts.py
+DEFAULT = Config()
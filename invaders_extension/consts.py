@@ -17,6 +17,8 @@ import sys
 GAME_WIDTH  = 800
 #: the height of the game display
 GAME_HEIGHT = 700
+#: the number of fixed simulation ticks per second (see GameApp.tickrate)
+TICK_RATE   = 60
 
 
 ### SHIP CONSTANTS ###
@@ -72,6 +74,8 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 5
+# the most unused bolt models of each kind that a wave keeps for reuse
+BOLT_POOL_SIZE = 32
 
 
 ### GAME CONSTANTS ###
@@ -99,7 +103,11 @@ arguments are everything after the word python. So if you start the game typing
 
 Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv. Below, we take
 advantage of this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW, and
-ALIEN_SPEED.
+ALIEN_SPEED.  A fourth argument, as in
+
+    python invaders 3 4 0.5 session.replay
+
+records the whole session to the file session.replay (see replay.py).
 """
 try:
     rows = int(sys.argv[1])
@@ -122,6 +130,13 @@ try:
 except:
     pass # Use original value
 
+# the file to record the session to (see replay.py), or None not to record it
+REPLAY_FILE = None
+try:
+    REPLAY_FILE = sys.argv[4]
+except:
+    pass # Use original value
+
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
 
 ####### New Variables for drawing aliens #######
@@ -0,0 +1,270 @@
+"""
+Learning environment module for Alien Invaders
+
+This module contains the class InvadersEnv, which lets an agent play one wave of
+Alien Invaders in the style of a gym environment:
+
+    env = InvadersEnv()
+    obs = env.reset(seed)
+    done = False
+    while not done:
+        obs, reward, done, info = env.step(agent(obs))
+
+An action is a combination of the bits ACTION_LEFT, ACTION_RIGHT and ACTION_FIRE
+(see batch.py), so there are ACTIONS different actions.  The bits stand for the keys
+'left', 'right' and 'up' that HeadlessWave.updateShip and updateBolts read.  The
+reward of a step is the number of points scored in it.
+
+The rules are the ones of BatchWave: a game starts at once, a lost ship comes back
+at the start of the next step, and a game is done when it has no lives left, when
+an alien passes the defense line or when every alien is destroyed.  Unlike a game in
+a BatchWave, the aliens fire with the generator of the HeadlessWave, so the same
+seed and the same actions always play the same game.
+
+An observation is a float32 vector of fixed size.  The first FEATURES entries are
+the values at the indices OBS_SHIP_X to OBS_BOLT_ON below, followed by the alive
+mask of the formation (1 for an alien that is alive) and by NEAREST_BOLTS triples
+(dx, dy, on) for the alien bolts nearest to the ship.  Positions are divided by the
+size of the game, so every value is roughly in -1..1.  The vector is allocated once
+and filled in place from the arrays of the simulation at every step; an agent that
+keeps an observation must copy it.
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from headless import *
+from batch import ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE
+import heapq
+import numpy as np
+
+# PRIMARY RULE: This module may only access consts.py, config.py, headless.py and
+# batch.py.  It must never import game2d, models.py or anything else that needs Kivy.
+
+# The number of different actions
+ACTIONS = 8
+
+# The number of alien bolts in an observation (the ones nearest to the ship)
+NEAREST_BOLTS = 3
+
+# The x-coordinate of the ship (0 if the ship is destroyed)
+OBS_SHIP_X = 0
+# Whether the ship is on screen (1 or 0)
+OBS_SHIP_ALIVE = 1
+# The horizontal offset of the formation
+OBS_OFFSET_X = 2
+# The vertical offset of the formation
+OBS_OFFSET_Y = 3
+# The direction in which the aliens are moving (1 or -1)
+OBS_DIRECTION = 4
+# The fraction of ALIEN_SPEED that has passed since the last alien step
+OBS_CLOCK = 5
+# The x-coordinate of the player bolt (0 if there is none)
+OBS_BOLT_X = 6
+# The y-coordinate of the player bolt (0 if there is none)
+OBS_BOLT_Y = 7
+# Whether the player bolt is on screen (1 or 0)
+OBS_BOLT_ON = 8
+
+# The number of entries before the alive mask
+FEATURES = 9
+
+# The bit of each key that an action can hold down
+_KEY_BITS = {'left': ACTION_LEFT, 'right': ACTION_RIGHT, 'up': ACTION_FIRE}
+
+
+class ActionInput(object):
+    """
+    A class to hold down the keys of an action for a HeadlessWave.
+
+    This class has the two parts of GInput that the game reads, like HeadlessInput,
+    but the keys are the bits of an int, so setting them makes no objects.
+
+    INSTANCE ATTRIBUTES:
+        _action: the keys held down [int, a combination of the ACTION bits]
+    """
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down.
+        """
+        return bin(self._action).count('1')
+
+    def __init__(self, action=0):
+        """
+        Initializer: Creates an input with the keys of an action held down
+
+        Parameter action: The keys held down
+        Precondition: action is an int in 0..ACTIONS-1
+        """
+        self.setAction(action)
+
+    def setAction(self, action):
+        """
+        Sets the keys that are held down, releasing all other keys
+
+        Parameter action: The keys held down
+        Precondition: action is an int in 0..ACTIONS-1
+        """
+        self._action = action
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is currently held down
+
+        Parameter key: The key to test
+        Precondition: key is a str
+        """
+        return (self._action & _KEY_BITS.get(key, 0)) != 0
+
+
+class InvadersEnv(object):
+    """
+    A class to play one wave of Alien Invaders as a learning environment.
+
+    INSTANCE ATTRIBUTES:
+        _config: the constants of the game [Config]
+        _dt:     the time in seconds of a step [float > 0]
+        _wave:   the wave being played [HeadlessWave, or None before reset]
+        _input:  the keys held down in the step [ActionInput]
+        _done:   whether the game is over [bool]
+        _obs:    the observation [float32 array of size getObservationSize()]
+        _alive:  the alive mask inside _obs [view of _obs]
+        _near:   the nearest alien bolts inside _obs
+                 [view of _obs of shape (NEAREST_BOLTS, 3)]
+    """
+
+    # GETTERS
+
+    def getConfig(self):
+        """
+        Returns the configuration of the game
+        """
+        return self._config
+
+    def getWave(self):
+        """
+        Returns the wave being played, or None before the first reset
+        """
+        return self._wave
+
+    def getObservationSize(self):
+        """
+        Returns the number of entries in an observation
+        """
+        return self._obs.size
+
+    def isDone(self):
+        """
+        Returns True if the game is over
+        """
+        return self._done
+
+    # INITIALIZER
+
+    def __init__(self, config=None, dt=1/TICK_RATE):
+        """
+        Initializer: Creates an environment with no game (see reset)
+
+        Parameter config: The configuration of the game (the one in consts.py if None)
+        Precondition: config is None or a Config
+
+        Parameter dt: The time in seconds of a step
+        Precondition: dt is a number > 0
+        """
+        assert config is None or isinstance(config, Config)
+        assert type(dt) in [int, float] and dt > 0
+        self._config = DEFAULT if config is None else config
+        self._dt = dt
+        self._wave = None
+        self._input = ActionInput()
+        self._done = True
+
+        aliens = self._config.ALIEN_ROWS * self._config.ALIENS_IN_ROW
+        self._obs = np.zeros(FEATURES + aliens + 3*NEAREST_BOLTS, dtype=np.float32)
+        self._alive = self._obs[FEATURES:FEATURES+aliens]
+        self._near = self._obs[FEATURES+aliens:].reshape(NEAREST_BOLTS, 3)
+
+    # PUBLIC METHODS
+
+    def reset(self, seed=None):
+        """
+        Returns the first observation of a new game
+
+        Parameter seed: The seed of the wave (a new one if None)
+        Precondition: seed is None or an int >= 0
+        """
+        self._wave = HeadlessWave(seed, self._config)
+        self._done = False
+        self._observe()
+        return self._obs
+
+    def step(self, action):
+        """
+        Plays one frame with the keys of an action, and returns the tuple
+        (observation, reward, done, info)
+
+        The info is a dict with the score, the lives left and whether the game is won.
+        A RuntimeError is raised if the game is over; call reset to start a new one.
+
+        Parameter action: The keys held down
+        Precondition: action is an int in 0..ACTIONS-1
+        """
+        if self._done:
+            raise RuntimeError('the game is over; call reset')
+        wave = self._wave
+        wave.restoreShip()
+        before = wave.getScore()
+        self._input.setAction(int(action))
+        wave.step(self._dt, self._input)
+        if wave.loseRound():
+            wave.setLives(wave.getLives()-1)
+
+        won = wave.getAliens().isEmpty()
+        self._done = won or wave.getLives() < 1 or wave.overDefenseLine()
+        self._observe()
+        info = {'score': wave.getScore(), 'lives': wave.getLives(), 'won': won}
+        return (self._obs, wave.getScore() - before, self._done, info)
+
+    # HIDDEN METHODS
+
+    def _observe(self):
+        """
+        Fills the observation in place from the state of the wave
+        """
+        config = self._config
+        wave = self._wave
+        obs = self._obs
+        width = config.GAME_WIDTH
+        height = config.GAME_HEIGHT
+
+        shipx = wave.getShipX()
+        obs[OBS_SHIP_X] = 0 if shipx is None else shipx/width
+        obs[OBS_SHIP_ALIVE] = shipx is not None
+        offx, offy = wave.getAliens().getOffset()
+        obs[OBS_OFFSET_X] = offx/width
+        obs[OBS_OFFSET_Y] = offy/height
+        obs[OBS_DIRECTION] = wave.getDirection()
+        obs[OBS_CLOCK] = wave.getTime()/config.ALIEN_SPEED
+
+        bolts = wave.getBolts()
+        if bolts == []:
+            obs[OBS_BOLT_X:OBS_BOLT_ON+1] = 0
+        else:
+            obs[OBS_BOLT_X] = bolts[0][0]/width
+            obs[OBS_BOLT_Y] = bolts[0][1]/height
+            obs[OBS_BOLT_ON] = 1
+
+        np.copyto(self._alive, wave.getAliens().getAlive())
+
+        near = self._near
+        near[:] = 0
+        x = config.GAME_WIDTH/2 if shipx is None else shipx
+        y = config.SHIP_BOTTOM
+        bolts = heapq.nsmallest(NEAREST_BOLTS, wave.getAlienBolts(),
+                                key=lambda bolt: (bolt[0]-x)**2 + (bolt[1]-y)**2)
+        for (index, bolt) in enumerate(bolts):
+            near[index, 0] = (bolt[0]-x)/width
+            near[index, 1] = (bolt[1]-y)/height
+            near[index, 2] = 1
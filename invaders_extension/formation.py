@@ -0,0 +1,404 @@
+"""
+Formation module for Alien Invaders
+
+This module contains the class Formation, which stores the positions of all of the
+aliens in a wave.  Instead of a 2d list of Alien objects, a formation keeps a few
+NumPy arrays with one entry per alien (the x-coordinates, the y-coordinates, whether
+the alien is alive and its row), so it never needs Python loops over the grid.
+
+The aliens never move inside of the formation.  The arrays hold their positions
+relative to the formation, and the formation as a whole has an offset.  Marching or
+descending only changes the offset, so a step costs the same no matter how many
+aliens there are.  The position of an alien on screen is its position in the arrays
+plus the offset.
+
+A formation also keeps a SpatialHash (see collide.py) of the aliens that are alive,
+with one cell per alien.  The hash is in the coordinates of the formation, so it
+never changes when the formation moves, and a laser bolt can find the one or two
+aliens near it without looking at the others.
+
+Finally, a formation keeps the aliens that are alive as a bitmask: bit r*cols+c of
+an int is 1 if the alien in row r and column c is alive.  There is also one mask per
+row (bit c for column c) and one mask per column (bit r for row r).  Counting the
+survivors, finding the last one, finding the lowest alien in a column (the one that
+fires) and finding the edges of the formation are all bit operations on these masks,
+which only change when an alien dies.  The mask is also a compact copy of which
+aliens are alive.
+
+The aliens are stored in row-major order: the alien in row r and column c is at index
+r*cols+c.  Row 0 is the top row.
+
+Since the positions never change, the state of a formation is only its offset and
+its mask.  The method save returns these as a tuple, and restore brings the
+formation back to such a tuple by killing or reviving only the aliens that differ.
+
+# Toshi Tokuyama (tt426)
+"""
+from collide import SpatialHash
+import bisect
+import numpy as np
+
+# PRIMARY RULE: Formation does not need anything from the game.  It must never import
+# game2d, models.py or anything else that needs Kivy.
+
+
+class Formation(object):
+    """
+    A class to represent the positions of the aliens in a wave.
+
+    INSTANCE ATTRIBUTES:
+        _rows:  the number of rows of aliens [int > 0]
+        _cols:  the number of aliens in a row [int > 0]
+        _x:     the x-coordinate of each alien, relative to the formation
+                [float array of size rows*cols]
+        _y:     the y-coordinate of each alien, relative to the formation
+                [float array of size rows*cols]
+        _offx:  the horizontal offset of the formation [float]
+        _offy:  the vertical offset of the formation [float]
+        _alive: whether each alien is alive [bool array of size rows*cols]
+        _row:   the row of each alien [int array of size rows*cols]
+        _width:  the width of an alien [float > 0]
+        _height: the height of an alien [float > 0]
+        _hash:   the aliens that are alive, by cell [SpatialHash]
+        _mask:    the aliens alive [int, bit r*cols+c for row r and column c]
+        _rowmask: the aliens alive in each row [list of rows ints, bit c for column c]
+        _colmask: the aliens alive in each column [list of cols ints, bit r for row r]
+        _columns: the columns with an alien alive [sorted list of int, possibly empty]
+        _bottomrow: the lowest row with an alien alive [int, -1 if every alien is dead]
+
+    The offset starts at (0,0), so the arrays start with the positions on screen.
+    The positions of dead aliens stay in the arrays, but they are ignored by every
+    method that looks at the aliens.
+    """
+
+    # GETTERS
+
+    def getRows(self):
+        """
+        Returns the number of rows of aliens
+        """
+        return self._rows
+
+    def getCols(self):
+        """
+        Returns the number of aliens in a row
+        """
+        return self._cols
+
+    def getX(self):
+        """
+        Returns the array of x-coordinates of the aliens, relative to the formation
+        """
+        return self._x
+
+    def getY(self):
+        """
+        Returns the array of y-coordinates of the aliens, relative to the formation
+        """
+        return self._y
+
+    def getOffset(self):
+        """
+        Returns the offset (x, y) of the formation
+        """
+        return (self._offx, self._offy)
+
+    def getAlive(self):
+        """
+        Returns the array saying which aliens are alive
+        """
+        return self._alive
+
+    def getMask(self):
+        """
+        Returns the aliens alive as a bitmask (bit r*cols+c for row r and column c)
+        """
+        return self._mask
+
+    def getRowMask(self, row):
+        """
+        Returns the aliens alive in a row as a bitmask (bit c for column c)
+
+        Parameter row: The row
+        Precondition: row is an int in 0..rows-1
+        """
+        return self._rowmask[row]
+
+    def getColumnMask(self, col):
+        """
+        Returns the aliens alive in a column as a bitmask (bit r for row r)
+
+        Parameter col: The column
+        Precondition: col is an int in 0..cols-1
+        """
+        return self._colmask[col]
+
+    def getRow(self):
+        """
+        Returns the array of rows of the aliens
+        """
+        return self._row
+
+    # INITIALIZER
+
+    def __init__(self, rows, cols, left, top, hsep, vsep, width, height):
+        """
+        Initializer: Creates a formation where every alien is alive
+
+        Parameter rows: The number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: The number of aliens in a row
+        Precondition: cols is an int > 0
+
+        Parameter left: The x-coordinate of the aliens in the first column
+        Precondition: left is a number (int or float)
+
+        Parameter top: The y-coordinate of the aliens in the top row
+        Precondition: top is a number (int or float)
+
+        Parameter hsep: The horizontal distance between the centers of two aliens
+        Precondition: hsep is a number (int or float) > 0
+
+        Parameter vsep: The vertical distance between the centers of two aliens
+        Precondition: vsep is a number (int or float) > 0
+
+        Parameter width: The width of an alien
+        Precondition: width is a number (int or float), 0 < width <= hsep
+
+        Parameter height: The height of an alien
+        Precondition: height is a number (int or float), 0 < height <= vsep
+        """
+        assert type(rows) == int and rows > 0
+        assert type(cols) == int and cols > 0
+        self._rows = rows
+        self._cols = cols
+        self._row = np.repeat(np.arange(rows), cols)
+        col = np.tile(np.arange(cols), rows)
+        self._x = left + hsep * col.astype(float)
+        self._y = top - vsep * self._row.astype(float)
+        self._alive = np.ones(rows * cols, dtype=bool)
+        self._offx = 0.0
+        self._offy = 0.0
+        self._width = float(width)
+        self._height = float(height)
+
+        # One cell per alien, with every alien in the middle of its cell
+        self._hash = SpatialHash(hsep, vsep)
+        self._hash.translate(left - hsep/2, top - vsep*(rows-1) - vsep/2)
+        for index in range(rows * cols):
+            self._hash.insert(index, *self._localBox(index))
+
+        self._mask = (1 << (rows * cols)) - 1
+        self._rowmask = [(1 << cols) - 1] * rows
+        self._colmask = [(1 << rows) - 1] * cols
+        self._columns = list(range(cols))
+        self._bottomrow = rows-1
+
+    # METHODS ON THE WHOLE FORMATION
+
+    def march(self, dx, dy):
+        """
+        Moves every alien by (dx, dy)
+
+        Parameter dx: The horizontal distance
+        Precondition: dx is a number (int or float)
+
+        Parameter dy: The vertical distance
+        Precondition: dy is a number (int or float)
+        """
+        self._offx += dx
+        self._offy += dy
+
+    def save(self):
+        """
+        Returns the state of the formation as a tuple (offx, offy, mask)
+        """
+        return (self._offx, self._offy, self._mask)
+
+    def restore(self, state):
+        """
+        Sets the offset and the aliens alive to a state returned by save
+
+        Only the aliens that are alive in one of the two states and dead in the other
+        are changed.
+
+        Parameter state: The state of the formation
+        Precondition: state is a tuple returned by save on a formation of this size
+        """
+        self._offx, self._offy, mask = state
+        changed = self._mask ^ mask
+        while changed != 0:
+            index = (changed & -changed).bit_length() - 1
+            if (mask >> index) & 1 == 1:
+                self.revive(index)
+            else:
+                self.kill(index)
+            changed &= changed - 1
+
+    def count(self):
+        """
+        Returns the number of aliens that are alive
+        """
+        return bin(self._mask).count('1')
+
+    def mostleft(self):
+        """
+        Returns the x-coordinate of the leftmost alien that is alive
+
+        Precondition: at least one alien is alive
+        """
+        return float(self._x[self._columns[0]]) + self._offx
+
+    def mostright(self):
+        """
+        Returns the x-coordinate of the rightmost alien that is alive
+
+        Precondition: at least one alien is alive
+        """
+        return float(self._x[self._columns[-1]]) + self._offx
+
+    def bottom(self):
+        """
+        Returns the y-coordinate of the lowest alien that is alive
+
+        Precondition: at least one alien is alive
+        """
+        return float(self._y[self._bottomrow * self._cols]) + self._offy
+
+    def getColumns(self):
+        """
+        Returns the columns that still have an alien alive, from left to right
+
+        This list is part of the formation and must not be changed.
+        """
+        return self._columns
+
+    def lowest(self, col):
+        """
+        Returns the index of the lowest alien alive in the given column, or -1 if the
+        column has no alien alive
+
+        Parameter col: The column
+        Precondition: col is an int in 0..cols-1
+        """
+        row = self._colmask[col].bit_length() - 1
+        return -1 if row == -1 else row * self._cols + col
+
+    def near(self, left, bottom, right, top):
+        """
+        Returns the sorted array of indices of the aliens alive near a box
+
+        Every alien alive that overlaps the box is included, but so may be some
+        aliens that do not overlap it.
+
+        Parameter left, bottom, right, top: The edges of the box
+        Precondition: left, bottom, right, top are numbers, left <= right, bottom <= top
+        """
+        near = self._hash.query(left - self._offx, bottom - self._offy,
+                                right - self._offx, top - self._offy)
+        return np.array(sorted(near), dtype=int)
+
+    # METHODS ON A SINGLE ALIEN
+
+    def first(self):
+        """
+        Returns the index of the first alien (in row-major order) that is alive, or
+        -1 if every alien is dead
+        """
+        return (self._mask & -self._mask).bit_length() - 1
+
+    def isEmpty(self):
+        """
+        Returns True if every alien is dead
+        """
+        return self._mask == 0
+
+    def isOneLeft(self):
+        """
+        Returns True if exactly one alien is alive
+        """
+        return self._mask != 0 and self._mask & (self._mask - 1) == 0
+
+    def isAlive(self, index):
+        """
+        Returns True if the alien at the given index is alive
+
+        Parameter index: The index of the alien
+        Precondition: index is an int in 0..rows*cols-1
+        """
+        return (self._mask >> index) & 1 == 1
+
+    def kill(self, index):
+        """
+        Marks the alien at the given index as dead
+
+        Parameter index: The index of the alien
+        Precondition: index is an int in 0..rows*cols-1
+        """
+        if self.isAlive(index):
+            self._alive[index] = False
+            self._hash.remove(index, *self._localBox(index))
+
+            row, col = divmod(index, self._cols)
+            self._mask &= ~(1 << index)
+            self._rowmask[row] &= ~(1 << col)
+            self._colmask[col] &= ~(1 << row)
+            if self._colmask[col] == 0:
+                self._columns.remove(col)
+            while self._bottomrow >= 0 and self._rowmask[self._bottomrow] == 0:
+                self._bottomrow -= 1
+
+    def revive(self, index):
+        """
+        Marks the alien at the given index as alive
+
+        Parameter index: The index of the alien
+        Precondition: index is an int in 0..rows*cols-1
+        """
+        if not self.isAlive(index):
+            self._alive[index] = True
+            self._hash.insert(index, *self._localBox(index))
+
+            row, col = divmod(index, self._cols)
+            self._mask |= 1 << index
+            self._rowmask[row] |= 1 << col
+            if self._colmask[col] == 0:
+                bisect.insort(self._columns, col)
+            self._colmask[col] |= 1 << row
+            self._bottomrow = max(self._bottomrow, row)
+
+    def position(self, index):
+        """
+        Returns the position (x, y) of the alien at the given index
+
+        Parameter index: The index of the alien
+        Precondition: index is an int in 0..rows*cols-1
+        """
+        return (float(self._x[index]) + self._offx, float(self._y[index]) + self._offy)
+
+    def box(self, index):
+        """
+        Returns the edges (left, bottom, right, top) of the alien at the given index
+
+        Parameter index: The index of the alien
+        Precondition: index is an int in 0..rows*cols-1
+        """
+        x, y = self.position(index)
+        return (x - self._width/2, y - self._height/2,
+                x + self._width/2, y + self._height/2)
+
+    # HIDDEN METHODS
+
+    def _localBox(self, index):
+        """
+        Returns the edges (left, bottom, right, top) of the alien at the given index,
+        relative to the formation
+
+        Parameter index: The index of the alien
+        Precondition: index is an int in 0..rows*cols-1
+        """
+        x = float(self._x[index])
+        y = float(self._y[index])
+        return (x - self._width/2, y - self._height/2,
+                x + self._width/2, y + self._height/2)
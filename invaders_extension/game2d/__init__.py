@@ -2,7 +2,14 @@
 A module to support simple 2D game development.
 
 This module is a simple wrapper around Kivy interfaces to make 2D game development
-simpler for students in CS 1110.
+simpler for students in CS 1110.  Games can also run with no window, on the raster or
+null backends (see :mod:`backend`).
+
+The setters of the objects (and methods like ``contains``) check their arguments with
+asserts, to catch mistakes early.  Running Python with the -O option is the release
+mode of this module: the asserts are compiled out, which makes a frame that moves
+and draws many objects noticeably faster.  Debug runs (without -O) keep every check.
+Note that -O also removes the asserts of the rest of the program.
 
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
@@ -11,6 +18,9 @@ from .gobject import GObject, GScene
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
 from .gpath import GPath, GTriangle, GPolygon
-from .gview import GInput, GView
+from .gview import GInput, GView, GNullView, GFakeInput
+from .graster import GRaster
+from .backend import Backend, KivyBackend, HeadlessBackend, RasterBackend, NullBackend
+from .backend import get_backend, set_backend
 from .sound import Sound, SoundLibrary
 from .app import GameApp
\ No newline at end of file
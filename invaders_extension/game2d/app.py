@@ -35,10 +35,26 @@ class GameApp(kivy.app.App):
     
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
+    
+    By default, :meth:`update` is called once per animation frame with the (variable)
+    time since the last frame.  If you set ``tickrate``, the game uses a fixed time 
+    step instead.  The time of every frame is added to an accumulator, and 
+    :meth:`update` is called once for every full tick in the accumulator, always with
+    ``dt`` equal to ``1/tickrate``.  Anything that moves a fixed amount per update then
+    moves at the same speed whether the display runs at 30, 60 or 144 FPS, and the 
+    tick rate can be lower than the frame rate to save time.
+    
+    When the tick rate is lower than the frame rate, some frames have no tick, and the
+    game would appear to judder.  To avoid this, :meth:`draw` can read the attribute 
+    ``alpha``, which says how far the clock is between the last tick and the next one,
+    and draw every moving object that far between its positions at the last two ticks.
     """
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
     
+    # The most ticks to simulate in one frame before dropping the rest of the backlog
+    MAX_TICKS = 8
+    
     
     # MUTABLE ATTRIBUTES
     @property
@@ -62,8 +78,46 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def tickrate(self):
+        """
+        The number of fixed simulation ticks per second, or None for no fixed ticks
+        
+        If this value is None (the default), :meth:`update` is called once per frame 
+        with the time since the last frame.  Otherwise, :meth:`update` is called with
+        ``dt`` equal to ``1/tickrate``, as many times as needed to keep up with the 
+        clock (zero or more times per frame).  At most ``MAX_TICKS`` ticks are run in
+        a single frame; if the game falls further behind, the extra time is dropped.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._tickrate
+    
+    @tickrate.setter
+    def tickrate(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._tickrate = value
+        self._accum = 0.0
+        self._alpha = 1.0
+    
     
     # IMMUTABLE PROPERTIES
+    @property
+    def alpha(self):
+        """
+        The fraction of a tick between the last tick and the current frame.
+        
+        If ``tickrate`` is None, this value is always 1.  Otherwise, it is the time in
+        the accumulator (the time since the last tick) divided by the length of a tick.
+        To draw smooth motion, :meth:`draw` should put each object at 
+        ``previous + alpha * (current - previous)``, where ``previous`` and ``current`` 
+        are its positions after the last two ticks.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        return self._alpha
+    
     @property
     def width(self):
         """
@@ -90,7 +144,8 @@ class GameApp(kivy.app.App):
         Use the `draw` method  in this attribute to display any :class:`GObject` instance 
         on the screen.  See the class :class:`GView` for more information.
         
-        **Invariant**: Must be instance of :class:`GView`.
+        **Invariant**: Must be instance of :class:`GView` (or :class:`GRaster` or 
+        :class:`GNullView` on a headless backend).
         """
         return self._view
     
@@ -102,7 +157,8 @@ class GameApp(kivy.app.App):
         Use this attribute to get information about the mouse and keyboard.  See the
         class :class:`GInput` for more information.
         
-        **Invariant**: Must be instance of :class:`GInput`
+        **Invariant**: Must be instance of :class:`GInput` (:class:`GFakeInput` on a 
+        headless backend)
         """
         return self._input
     
@@ -232,6 +288,7 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('tickrate', None)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -241,6 +298,7 @@ class GameApp(kivy.app.App):
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self.tickrate = t
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
@@ -258,33 +316,37 @@ class GameApp(kivy.app.App):
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
         """
-        from .gview import GInput, GView
-        self._view = GView()
-        self._view.size_hint = (1,1)
-        self._input = GInput()
-        self._input._register(self._view)
+        from .backend import get_backend
+        backend = get_backend()
+        self._view = backend.make_view(self)
+        self._input = backend.make_input(self)
         return self.view
     
     def run(self):
         """
         Displays the game window and starts the game.
         
+        On a headless backend (see :mod:`backend`), there is no window, and this method
+        returns when the game is over.
+        
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
         """
-        Clock.schedule_once(self._bootstrap,-1)
-        kivy.app.App.run(self)
+        from .backend import get_backend
+        get_backend().run(self)
     
     def stop(self):
         """
         Closes the game window and exit Python.
         
+        On a headless backend (see :mod:`backend`), this method only ends the game 
+        after the current frame.
+        
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
         """
-        import sys
-        kivy.app.App.stop(self)
-        sys.exit(0)
+        from .backend import get_backend
+        get_backend().stop(self)
     
     def start(self):
         """
@@ -344,13 +406,26 @@ class GameApp(kivy.app.App):
         Processes a single animation frame.
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window.
+        important issues behind the scenes, particularly with clearing the window and
+        running the fixed ticks (see ``tickrate``).
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
         self.view.clear()
-        self.update(dt)
+        if self._tickrate is None:
+            self.update(dt)
+        else:
+            step = 1.0/self._tickrate
+            self._accum += dt
+            ticks = 0
+            while self._accum >= step and ticks < self.MAX_TICKS:
+                self.update(step)
+                self._accum -= step
+                ticks += 1
+            if self._accum >= step:
+                self._accum %= step
+            self._alpha = min(self._accum/step, 1.0)
         self.draw()
     
     def _setpaths(self):
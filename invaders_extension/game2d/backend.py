@@ -0,0 +1,385 @@
+"""
+The renderer backends for 2D game support.
+
+A backend decides how a :class:`GameApp` is shown and played.  There are three:
+
+:class:`KivyBackend`: The default.  The game runs in a Kivy window, and every
+:class:`GObject` keeps the Kivy graphics commands that draw it.
+
+:class:`RasterBackend`: The game has no window.  Its view is a :class:`GRaster`, so
+every frame is drawn into a NumPy array by software.
+
+:class:`NullBackend`: The game has no window and draws nothing.  Its view is a
+:class:`GNullView`, which only counts the objects drawn.
+
+On the last two backends, objects do not make any Kivy graphics commands and sounds
+are silent, so no OpenGL context is needed, and the input is a :class:`GFakeInput`.
+The game is played as fast as possible, with a fixed time step of ``1/fps``, for a
+given number of frames (or until it calls ``stop``).  To run a game on a backend,
+choose the backend before making any objects::
+
+    set_backend(NullBackend(frames=600,script=[('up',)]*600))
+    game = MyGame(width=800,height=700)
+    game.run()
+    print(game.view.draws)
+
+Author: Toshi Tokuyama (tt426)
+Date:   October 18, 2026
+"""
+import abc
+from .gview import GInput, GView, GNullView, GFakeInput
+from .graster import GRaster
+
+
+class Backend(abc.ABC):
+    """
+    A class representing the way a :class:`GameApp` is shown and played.
+
+    You should never make a `Backend` directly.  Instead, you should use one of the
+    subclasses: :class:`KivyBackend`, :class:`RasterBackend` or :class:`NullBackend`.
+
+    The four public methods are abstract.  A subclass that does not define all of
+    them cannot be made, so an incomplete backend fails before any game uses it.
+    """
+    # The name of the backend, as given to set_backend
+    NAME = None
+
+    # Whether objects keep the Kivy graphics commands that draw them
+    RETAINED = False
+
+    # Whether sounds are played
+    AUDIBLE = False
+
+    # PUBLIC METHODS
+    @abc.abstractmethod
+    def make_view(self,app):
+        """
+        Returns the view of a game.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def make_input(self,app):
+        """
+        Returns the input handler of a game.
+
+        This method is called after :meth:`make_view`.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def run(self,app):
+        """
+        Starts a game and plays it.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def stop(self,app):
+        """
+        Stops a game.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        raise NotImplementedError()
+
+
+# #mark -
+class KivyBackend(Backend):
+    """
+    A class representing a game shown in a Kivy window.
+
+    This is the default backend.
+    """
+    NAME = 'kivy'
+    RETAINED = True
+    AUDIBLE = True
+
+    # PUBLIC METHODS
+    def make_view(self,app):
+        """
+        Returns a new :class:`GView` for a game.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        view = GView()
+        view.size_hint = (1,1)
+        return view
+
+    def make_input(self,app):
+        """
+        Returns a new :class:`GInput` listening to the view of a game.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        input = GInput()
+        input._register(app.view)
+        return input
+
+    def run(self,app):
+        """
+        Opens the game window and starts the Kivy event loop.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        import kivy.app
+        from kivy.clock import Clock
+        Clock.schedule_once(app._bootstrap,-1)
+        kivy.app.App.run(app)
+
+    def stop(self,app):
+        """
+        Closes the game window and exits Python.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        import sys
+        import kivy.app
+        kivy.app.App.stop(app)
+        sys.exit(0)
+
+
+# #mark -
+class HeadlessBackend(Backend):
+    """
+    A class representing a game played with no window.
+
+    The game is played for :attr:`frames` frames, each of them ``1/fps`` seconds long,
+    or until it calls ``stop``.  Its input is a :class:`GFakeInput` with the script of
+    the backend.
+
+    You should never make a `HeadlessBackend` directly.  Instead, you should use one of
+    the subclasses: :class:`RasterBackend` or :class:`NullBackend`.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def frames(self):
+        """
+        The number of frames to play, or None to play until the game stops.
+
+        **Invariant**: Must be None or an int >= 0.
+        """
+        return self._frames
+
+    @frames.setter
+    def frames(self,value):
+        assert value is None or (type(value) == int and value >= 0), \
+            '%s is not a valid number of frames' % repr(value)
+        self._frames = value
+
+    @property
+    def script(self):
+        """
+        The keys to hold down in each frame (see :class:`GFakeInput`).
+
+        **Invariant**: Must be a sequence of sequences of ``str``.
+        """
+        return self._script
+
+    @script.setter
+    def script(self,value):
+        self._script = value
+
+    # BUILT-IN METHODS
+    def __init__(self,frames=None,script=()):
+        """
+        Creates a new headless backend.
+
+        :param frames: The number of frames to play (until the game stops if None)
+        :type frames:  ``None`` or ``int`` >= 0
+
+        :param script: The keys to hold down in each frame
+        :type script:  sequence of sequences of ``str``
+        """
+        self.frames = frames
+        self.script = script
+        self._running = False
+
+    # PUBLIC METHODS
+    def make_input(self,app):
+        """
+        Returns a new :class:`GFakeInput` playing the script of this backend.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        return GFakeInput(self.script)
+
+    def run(self,app):
+        """
+        Starts a game and plays it to the end, as fast as possible.
+
+        This method returns when the game is over, with the game still in memory, so
+        its final state can be read.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        app.build()
+        self._running = True
+        app.start()
+
+        step = 1.0/app.fps
+        count = 0
+        while self._running and (self._frames is None or count < self._frames):
+            app.input.advance()
+            app._refresh(step)
+            count += 1
+
+        if self._running:
+            self._running = False
+            app.dispatch('on_stop')
+
+    def stop(self,app):
+        """
+        Ends the game after the current frame.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        if self._running:
+            self._running = False
+            app.dispatch('on_stop')
+
+
+# #mark -
+class RasterBackend(HeadlessBackend):
+    """
+    A class representing a game drawn into a NumPy array.
+
+    The view of the game is a :class:`GRaster` of the size of the game, drawn at the
+    resolution :attr:`size`.
+    """
+    NAME = 'raster'
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """
+        The resolution (columns, rows) of the view, or None for the game size.
+
+        **Invariant**: Must be None or a pair of ``int`` > 0.
+        """
+        return self._size
+
+    # BUILT-IN METHODS
+    def __init__(self,size=None,frames=None,script=()):
+        """
+        Creates a new raster backend.
+
+        :param size: The resolution (columns, rows) of the view (the game size if None)
+        :type size:  ``None`` or a pair of ``int`` > 0
+
+        :param frames: The number of frames to play (until the game stops if None)
+        :type frames:  ``None`` or ``int`` >= 0
+
+        :param script: The keys to hold down in each frame
+        :type script:  sequence of sequences of ``str``
+        """
+        HeadlessBackend.__init__(self,frames,script)
+        self._size = None if size is None else tuple(size)
+
+    # PUBLIC METHODS
+    def make_view(self,app):
+        """
+        Returns a new :class:`GRaster` for a game.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        return GRaster(app.width,app.height,size=self._size)
+
+
+# #mark -
+class NullBackend(HeadlessBackend):
+    """
+    A class representing a game that draws nothing.
+
+    The view of the game is a :class:`GNullView`, which only counts the objects drawn.
+    """
+    NAME = 'null'
+
+    # PUBLIC METHODS
+    def make_view(self,app):
+        """
+        Returns a new :class:`GNullView` for a game.
+
+        :param app: the game
+        :type app:  :class:`GameApp`
+        """
+        return GNullView(app.width,app.height)
+
+
+# #mark -
+# The current backend
+_backend = KivyBackend()
+
+# The backend of each name
+_NAMES = {'kivy': KivyBackend, 'raster': RasterBackend, 'null': NullBackend}
+
+
+def get_backend():
+    """
+    :return: The current backend.
+    :rtype:  :class:`Backend`
+    """
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Sets the backend of every game and object made after this call.
+
+    Objects made on one backend may not be drawn on another one, so the backend should
+    be set once, before the game is made.
+
+    A ``ValueError`` is raised if ``backend`` is a string that is not the name of a
+    backend, and a ``TypeError`` if it is neither a string nor a :class:`Backend`.
+    Unlike the asserts of the setters, these checks stay when Python runs with -O.
+
+    :param backend: The backend, or the name of one ('kivy', 'raster' or 'null')
+    :type backend:  :class:`Backend` or ``str``
+    """
+    global _backend
+    if type(backend) == str:
+        if backend not in _NAMES:
+            raise ValueError('%s is not a backend name' % repr(backend))
+        backend = _NAMES[backend]()
+    if not isinstance(backend,Backend):
+        raise TypeError('%s is not a backend' % repr(backend))
+    _backend = backend
+
+
+def is_retained():
+    """
+    Checks whether objects keep the Kivy graphics commands that draw them.
+
+    :return: True if the current backend draws with Kivy
+    :rtype:  ``bool``
+    """
+    return _backend.RETAINED
+
+
+def is_audible():
+    """
+    Checks whether sounds are played.
+
+    :return: True if the current backend plays sounds
+    :rtype:  ``bool``
+    """
+    return _backend.AUDIBLE
@@ -11,6 +11,8 @@ Date:   August 1, 2017 (Python 3 version)
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
+from .gview import GView
+from .backend import is_retained
 
 def is_color(c):
     """
@@ -71,11 +73,81 @@ def is_gobject_list(g):
     """
     try:
         from functools import reduce
-        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g))
+        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g), True)
     except:
         return False
 
 
+def _make_color(value):
+    """
+    :return: A Kivy color, or a plain stand-in if the backend does not draw with Kivy
+    :rtype:  ``Color`` or :class:`_Color`
+
+    :param value: The color
+    :type value:  a 4-element sequence of floats between 0 and 1
+    """
+    if is_retained():
+        return Color(value[0],value[1],value[2],value[3])
+    return _Color(value)
+
+
+# #mark -
+
+class _Pair(object):
+    """
+    A stand-in for a Kivy ``Translate`` or ``Scale`` when objects are not drawn with Kivy.
+
+    The Kivy instructions take about half a kilobyte each, while this takes a tenth of
+    that, which matters when there are many thousands of objects.
+    """
+    __slots__ = ('x','y')
+
+    def __init__(self,x,y):
+        """
+        Creates a new pair of values.
+
+        :param x: The horizontal value
+        :type x:  ``float``
+
+        :param y: The vertical value
+        :type y:  ``float``
+        """
+        self.x = x
+        self.y = y
+
+
+class _Angle(object):
+    """
+    A stand-in for a Kivy ``Rotate`` when objects are not drawn with Kivy.
+    """
+    __slots__ = ('angle',)
+
+    def __init__(self,angle):
+        """
+        Creates a new rotation.
+
+        :param angle: The angle in degrees
+        :type angle:  ``float``
+        """
+        self.angle = angle
+
+
+class _Color(object):
+    """
+    A stand-in for a Kivy ``Color`` when objects are not drawn with Kivy.
+    """
+    __slots__ = ('rgba',)
+
+    def __init__(self,value):
+        """
+        Creates a new color.
+
+        :param value: The color
+        :type value:  a 4-element sequence of floats between 0 and 1
+        """
+        self.rgba = [float(v) for v in value]
+
+
 # #mark -
 
 class GObject(object):
@@ -90,6 +162,14 @@ class GObject(object):
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
     """
 
+    # The attributes of every instance.  There is no __dict__, to save memory, but
+    # there is a __weakref__, as Kivy only keeps weak references to callbacks.  Each
+    # subclass lists only the attributes it adds; a subclass without __slots__ (like
+    # most models of a game) gets a __dict__ back.
+    __slots__ = ('_trans', '_rotate', '_scale', '_cache', '_matrix', '_invrse',
+                 '_mtrue', '_defined', '_width', '_height', '_fillcolor', '_linecolor',
+                 '_name', '_edges', '__weakref__')
+
     # MUTABLE PROPERTIES
     @property
     def x(self):
@@ -105,6 +185,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._edges = None
 
     @property
     def y(self):
@@ -120,6 +201,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._edges = None
 
     @property
     def width(self):
@@ -137,6 +219,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._width = float(value)
+        self._edges = None
         if self._defined:
             self._reset()
 
@@ -156,6 +239,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._height = float(value)
+        self._edges = None
         if self._defined:
             self._reset()
 
@@ -188,6 +272,7 @@ class GObject(object):
             self._scale.x = float(value[0])
             self._scale.y = float(value[1])
         self._mtrue = False
+        self._edges = None
 
     @property
     def angle(self):
@@ -207,6 +292,7 @@ class GObject(object):
         self._rotate.angle = float(value)
         if not diff:
             self._mtrue = False
+            self._edges = None
 
     @property
     def linecolor(self):
@@ -241,7 +327,7 @@ class GObject(object):
             else:
                 value = cornell.RGB.CreateName(value).glColor()
 
-        self._linecolor = None if value is None else Color(value[0],value[1],value[2],value[3])
+        self._linecolor = None if value is None else _make_color(value)
         if self._defined:
             self._reset()
 
@@ -279,7 +365,7 @@ class GObject(object):
             else:
                 value = cornell.RGB.CreateName(value).glColor()
 
-        self._fillcolor = None if value is None else Color(value[0],value[1],value[2],value[3])
+        self._fillcolor = None if value is None else _make_color(value)
         if self._defined:
             self._reset()
 
@@ -478,11 +564,17 @@ class GObject(object):
         """
         # Set the properties.
         self._defined = False
+        self._edges = None
 
-        # Create the Kivy transforms for position and size
-        self._trans  = Translate(0,0,0)
-        self._rotate = Rotate(angle=0,axis=(0,0,1))
-        self._scale  = Scale(1,1,1)
+        # Create the Kivy transforms for position and size (or plain stand-ins)
+        if is_retained():
+            self._trans  = Translate(0,0,0)
+            self._rotate = Rotate(angle=0,axis=(0,0,1))
+            self._scale  = Scale(1,1,1)
+        else:
+            self._trans  = _Pair(0.0,0.0)
+            self._rotate = _Angle(0.0)
+            self._scale  = _Pair(1.0,1.0)
 
         # Now update these with the keywords; size first
         try:
@@ -562,6 +654,52 @@ class GObject(object):
         p = self.matrix.inverse()._transform(point[0],point[1])
         return abs(p[0]) < self.width/2.0 and abs(p[1]) < self.height/2.0
 
+    def intersects_rect(self,left,bottom,right,top):
+        """
+        Checks whether the bounding box of this shape overlaps a rectangle
+
+        The rectangle is axis-aligned.  Boxes that only touch along an edge do not
+        overlap.  The edges of this shape are cached until it moves or changes size,
+        so this method is much faster than several calls to :meth:`contains`.
+
+        :param left: the left edge of the rectangle
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the rectangle
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the rectangle
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: the top edge of the rectangle
+        :type top:  ``int`` or ``float`` >= bottom
+
+        :return: True if the bounding box of this shape overlaps the rectangle
+        :rtype:  ``bool``
+        """
+        edges = self._edges
+        if edges is None:
+            edges = self._get_edges()
+        return edges[0] < right and left < edges[2] and edges[1] < top and bottom < edges[3]
+
+    def overlaps(self,other):
+        """
+        Checks whether the bounding boxes of this shape and another one overlap
+
+        Unlike a test of the corners of one shape with :meth:`contains`, this also
+        finds a shape that is wider or taller than the other one and crosses it.
+
+        :param other: the shape to check
+        :type other:  :class:`GObject`
+
+        :return: True if the bounding boxes of the two shapes overlap
+        :rtype:  ``bool``
+        """
+        edges = other._edges
+        if edges is None:
+            edges = other._get_edges()
+        return self.intersects_rect(edges[0],edges[1],edges[2],edges[3])
+
     def transform(self,point):
         """
         Transforms the point to the local coordinate system
@@ -588,11 +726,16 @@ class GObject(object):
         """
         Draws this shape in the provide view.
 
-        Ideally, the view should be the one provided by :class:`GameApp`.
+        Ideally, the view should be the one provided by :class:`GameApp`.  The view may
+        also be a :class:`GRaster`, which draws this shape into a NumPy array, or a
+        :class:`GNullView`, which only counts it.
 
         :param view: view to draw to
-        :type view:  :class:`GView`
+        :type view:  :class:`GView`, :class:`GRaster` or :class:`GNullView`
         """
+        if not isinstance(view,GView):
+            view.draw(self)
+            return
         try:
             view.draw(self._cache)
         except:
@@ -602,6 +745,9 @@ class GObject(object):
     def _reset(self):
         """
         Resets the drawing cache.
+
+        Subclasses must not build a cache unless :func:`is_retained` is True, as the
+        Kivy graphics commands need an OpenGL context.
         """
         self._cache = InstructionGroup()
         self._cache.add(PushMatrix())
@@ -623,6 +769,20 @@ class GObject(object):
         self._invrse.translate(-self._trans.x,-self._trans.y)
         self._mtrue = True
 
+    def _get_edges(self):
+        """
+        Caches and returns the edges (left, bottom, right, top) of the bounding box.
+        """
+        if self._rotate.angle == 0.0:
+            x = self._trans.x
+            y = self._trans.y
+            w = self.width/2.0
+            h = self.height/2.0
+            self._edges = (x-w,y-h,x+w,y+h)
+        else:
+            self._edges = (self.left,self.bottom,self.right,self.top)
+        return self._edges
+
 
 # #mark -
 
@@ -643,6 +803,8 @@ class GScene(GObject):
     All objects stored in a ``GScene`` are drawn as if the point (x,y) is the origin.
     """
 
+    __slots__ = ('_children',)
+
     # MUTABLE PROPERTIES
     @property
     def children(self):
@@ -759,6 +921,8 @@ class GScene(GObject):
         """
         Resets the drawing cache
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         for x in self.children:
             self._cache.add(x._cache)
@@ -11,6 +11,7 @@ Date:   August 1, 2017 (Python 3 version)
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from .gobject import GObject
+from .backend import is_retained
 
 
 def same_side(p1, p2, a, b):
@@ -103,6 +104,8 @@ class GPath(GObject):
     are 0.  However, if they are nonzero, then Python will add them to all of the points
     in the path, shifting the path accordingly.
     """
+
+    __slots__ = ('_linewidth', '_points')
     
     # MUTABLE PROPERTIES
     @property
@@ -119,6 +122,7 @@ class GPath(GObject):
     def points(self,value):
         assert is_point_tuple(value,2),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._edges = None
         if self._defined:
             self._reset()
     
@@ -254,6 +258,8 @@ class GPath(GObject):
         """
         Resets the drawing cache
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         if not self._linecolor is None:
             self._cache.add(self._linecolor)
@@ -280,6 +286,8 @@ class GTriangle(GPath):
     will add them to the triangle vertices.  Similarly, the attributes `width` and 
     `height` are immutable, and are computed directly from the points
     """
+
+    __slots__ = ()
     
     # MUTABLE PROPERTIES
     @property
@@ -297,6 +305,7 @@ class GTriangle(GPath):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         assert len(value) == 6, 'value %s does not have the right length'  %  repr(value)
         self._points = tuple(value)
+        self._edges = None
         if self._defined:
             self._reset()
     
@@ -353,6 +362,8 @@ class GTriangle(GPath):
         """
         Resets the drawing cache
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         
         vertices = ()
@@ -397,6 +408,8 @@ class GPolygon(GPath):
     As with :class:`GPath`, the attributes ``width`` and ``height`` are immutable, and 
     are computed directly from the points
     """
+
+    __slots__ = ('_source', '_source_width', '_source_height', '_mesh', '_verts')
     
     # MUTABLE PROPERTIES
     @property
@@ -413,6 +426,7 @@ class GPolygon(GPath):
     def points(self,value):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._edges = None
         if self._defined:
             self._reset()
     
@@ -575,6 +589,8 @@ class GPolygon(GPath):
         """
         Resets the drawing cache
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         self._make_mesh()
         
@@ -0,0 +1,802 @@
+"""
+A software rasterizer for 2D game support.
+
+This module provides :class:`GRaster`, a view that draws :class:`GObject` instances
+into an RGB NumPy array instead of a Kivy window.  It needs no OpenGL context, so it
+can be used on machines without a GPU, and the array can be given to programs that
+learn from pixels.  Pass a raster to the `draw` method of any object, exactly as you
+would pass the view of a :class:`GameApp`::
+
+    raster = GRaster(800, 700, size=(84, 84))
+    raster.clear()
+    ship.draw(raster)
+    pixels = raster.frame
+
+The raster draws rectangles, ellipses, images, sprites, labels, paths, triangles and
+polygons.  Images are read with the Pillow library, and scaled copies are cached, so
+drawing an image is a single masked copy into the frame.  The images in a
+:class:`GScene` (like a formation of aliens) are drawn together, with one copy for
+every run of children that share an image.  Without Pillow, drawing an image raises
+an ``ImportError``, and labels only draw their background and border.
+
+Author: Toshi Tokuyama (tt426)
+Date:   October 18, 2026
+"""
+import math
+import os
+import numpy as np
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+    ImageFont = None
+
+
+# The type of a packed pixel: the bytes r, g, b and 255, with r the lowest byte
+_PIXEL = np.dtype('<u4')
+
+
+class GRaster(object):
+    """
+    A class representing a software frame buffer for drawing :class:`GObject` instances.
+
+    The raster covers a game of size `width` x `height`, with the origin at the bottom
+    left as in :class:`GView`, and draws it at the resolution `size`.  The pixels are in
+    the attribute `frame`, a NumPy array of shape (rows, columns, 3) and type uint8,
+    whose first row is the top of the game.
+
+    Internally, each pixel is one uint32 (the bytes r, g, b and an unused byte, stored
+    little-endian so that the bytes are in this order on every machine), so
+    that filling or copying a pixel is a single operation; `frame` is a view of the
+    first three bytes of every pixel.
+
+    The raster caches every image at every size it is drawn at.  Call :meth:`flush` if
+    the image files change.
+    """
+
+    # The pixels of the image files, by path (shared by every raster)
+    IMAGE_CACHE = {}
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def width(self):
+        """
+        The width of the game drawn in this raster.
+
+        **invariant**: Value is an ``int`` or ``float`` > 0
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """
+        The height of the game drawn in this raster.
+
+        **invariant**: Value is an ``int`` or ``float`` > 0
+        """
+        return self._height
+
+    @property
+    def size(self):
+        """
+        The resolution (columns, rows) of this raster.
+
+        **invariant**: Value is a pair of ``int`` > 0
+        """
+        return (self._pixels.shape[1],self._pixels.shape[0])
+
+    @property
+    def frame(self):
+        """
+        The pixels of this raster.
+
+        This is a view of the array that the raster draws into, not a copy.  Copy it
+        if you need to keep it after the next frame is drawn.
+
+        **invariant**: Value is a uint8 array of shape (rows, columns, 3)
+        """
+        return self._frame
+
+    # MUTABLE PROPERTIES
+    @property
+    def background(self):
+        """
+        The color that :meth:`clear` fills the raster with.
+
+        **invariant**: Value is a 3- or 4-element sequence of floats between 0 and 1
+        """
+        return self._background
+
+    @background.setter
+    def background(self,value):
+        assert _is_rgba(value), '%s is not a valid color' % repr(value)
+        self._background = tuple(value)
+        self._clearpixel = _pack(value)
+
+    # BUILT-IN METHODS
+    def __init__(self,width,height,size=None,background=(1,1,1),images=None,fonts=None):
+        """
+        Creates a new raster for a game of the given size.
+
+        :param width: The width of the game
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: The height of the game
+        :type height:  ``int`` or ``float`` > 0
+
+        :param size: The resolution (columns, rows); the game size if ``None``
+        :type size:  ``None`` or a pair of ``int`` > 0
+
+        :param background: The color of an empty raster (white, like :class:`GView`)
+        :type background:  a 3- or 4-element sequence of floats between 0 and 1
+
+        :param images: The folder of the image files (the one of :class:`GameApp` if None)
+        :type images:  ``None`` or ``str``
+
+        :param fonts: The folder of the font files (the one of :class:`GameApp` if None)
+        :type fonts:  ``None`` or ``str``
+        """
+        assert type(width) in [int,float] and width > 0, '%s is not positive' % repr(width)
+        assert type(height) in [int,float] and height > 0, '%s is not positive' % repr(height)
+        if size is None:
+            size = (int(round(width)),int(round(height)))
+        assert type(size) in [tuple,list] and len(size) == 2, '%s is not a pair' % repr(size)
+        assert all(type(n) == int and n > 0 for n in size), '%s is not a valid size' % repr(size)
+
+        self._width  = width
+        self._height = height
+        self._sx = size[0]/width
+        self._sy = size[1]/height
+        self._pixels = np.empty((size[1],size[0]),dtype=_PIXEL)
+        self._frame = self._pixels.view(np.uint8).reshape(size[1],size[0],4)[...,:3]
+        self._images = images
+        self._fonts  = fonts
+        self._sprites = {}
+        self._scatters = {}
+        self._texts = {}
+        self._handlers = {}
+        self._ox = 0.0
+        self._oy = 0.0
+        self.background = background
+        self.clear()
+
+    # PUBLIC METHODS
+    def clear(self):
+        """
+        Fills the raster with the background color.
+        """
+        self._pixels.fill(self._clearpixel)
+
+    def draw(self,obj):
+        """
+        Draws a graphics object into this raster.
+
+        Objects are drawn in the order of the calls, so later objects cover earlier ones.
+        The objects in a :class:`GScene` are drawn relative to the position of the scene.
+
+        :param obj: The object to draw
+        :type obj:  :class:`GObject`
+        """
+        handler = self._handlers.get(type(obj))
+        if handler is None:
+            handler = self._find_handler(type(obj))
+        handler(obj)
+
+    def flush(self):
+        """
+        Empties the caches of images and text, so that files are read again.
+        """
+        GRaster.IMAGE_CACHE.clear()
+        self._sprites.clear()
+        self._scatters.clear()
+        self._texts.clear()
+
+    # HIDDEN METHODS (DISPATCH)
+    def _find_handler(self,kind):
+        """
+        Returns the method that draws objects of the given class, and caches it.
+
+        The class is matched by the names of the game2d classes that it inherits from,
+        so subclasses (like the models of a game) are drawn like their parents.
+
+        :param kind: The class of the object
+        :type kind:  a subclass of :class:`GObject`
+        """
+        for base in kind.__mro__:
+            name = _HANDLERS.get(base.__name__)
+            if name is not None:
+                handler = getattr(self,name)
+                self._handlers[kind] = handler
+                return handler
+        raise TypeError('%s cannot be drawn in a raster' % repr(kind))
+
+    def _draw_scene(self,obj):
+        """
+        Draws the children of a scene, relative to the position of the scene.
+
+        Consecutive children that are plain images of the same kind (same source,
+        frame, tint and size, no rotation and no border) are drawn together.  The
+        rotation and scale of the scene are ignored.
+        """
+        ox, oy = self._ox, self._oy
+        self._ox = ox+obj.x
+        self._oy = oy+obj.y
+        try:
+            run = []
+            runkey = None
+            for child in obj.children:
+                key = self._sprite_key(child)
+                if key != runkey and run:
+                    self._draw_run(run,runkey)
+                    run = []
+                runkey = key
+                if key is None:
+                    self.draw(child)
+                else:
+                    run.append(child)
+            if run:
+                self._draw_run(run,runkey)
+        finally:
+            self._ox = ox
+            self._oy = oy
+
+    def _draw_rectangle(self,obj):
+        """
+        Draws a rectangle, with its fill and its border.
+        """
+        if obj.angle != 0:
+            self._draw_rotated(obj,_rectangle_mask)
+            return
+        box = self._box(obj)
+        if box is None:
+            return
+        fill = obj.fillcolor
+        if fill is not None:
+            self._fill(box,fill)
+        self._draw_border(obj)
+
+    def _draw_ellipse(self,obj):
+        """
+        Draws an ellipse, with its fill.
+
+        The border of an ellipse is not drawn.
+        """
+        self._draw_rotated(obj,_ellipse_mask)
+
+    def _draw_image(self,obj):
+        """
+        Draws an image (or the current frame of a sprite), with its border.
+        """
+        if obj.source is None:
+            return
+        if obj.angle != 0:
+            self._draw_rotated(obj,_rectangle_mask,self._texture(obj))
+            return
+        box = self._box(obj)
+        if box is None:
+            return
+        r0, r1, c0, c1, rows, cols = box
+        key = (obj.source,_frame_of(obj),obj.fillcolor,obj.width,obj.height,obj.scale)
+        rgb, alpha, opaque = self._sprite(obj,key)
+        if opaque is not None:
+            np.copyto(self._pixels[r0:r1,c0:c1],rgb[rows,cols],where=opaque[rows,cols])
+        else:
+            region = self._frame[r0:r1,c0:c1]
+            a = alpha[rows,cols]
+            region[:] = region*(1-a)+rgb[rows,cols]*a+0.5
+        self._draw_border(obj)
+
+    def _draw_label(self,obj):
+        """
+        Draws a label, with its background, its text and its border.
+
+        The text is drawn in the `linecolor` of the label, aligned by `halign` and
+        `valign`.  The rotation of a label is ignored.
+        """
+        box = self._box(obj)
+        if box is None:
+            return
+        if obj.fillcolor:
+            self._fill(box,obj.fillcolor)
+        if ImageFont is not None and obj.text:
+            self._draw_text(obj)
+        self._draw_border(obj)
+
+    def _draw_path(self,obj):
+        """
+        Draws the line segments of a path.
+        """
+        color = obj.linecolor
+        if color is None or obj.linewidth <= 0:
+            return
+        points = self._points(obj)
+        half = max(obj.linewidth*(self._sx+self._sy)/4.0,0.5)
+        for ii in range(len(points)-1):
+            self._draw_segment(points[ii],points[ii+1],half,color)
+
+    def _draw_polygon(self,obj):
+        """
+        Draws a triangle or a polygon, with its fill and its border.
+        """
+        points = self._points(obj)
+        if obj.fillcolor is not None:
+            self._fill_polygon(points,obj.fillcolor)
+        color = obj.linecolor
+        if color is not None and obj.linewidth > 0:
+            half = max(obj.linewidth*(self._sx+self._sy)/4.0,0.5)
+            for ii in range(len(points)):
+                self._draw_segment(points[ii],points[(ii+1) % len(points)],half,color)
+
+    # HIDDEN METHODS (PIXELS)
+    def _extent(self,obj):
+        """
+        Returns the size (columns, rows) of an unrotated object in pixels.
+
+        Every object covers at least one pixel, so small objects do not vanish at low
+        resolutions.
+        """
+        sx, sy = obj.scale
+        return (max(int(round(obj.width*abs(sx)*self._sx)),1),
+                max(int(round(obj.height*abs(sy)*self._sy)),1))
+
+    def _corner(self,obj,width,height):
+        """
+        Returns the pixel (row, column) of the top left corner of an unrotated object.
+
+        :param width: The number of columns of the object
+        :param height: The number of rows of the object
+        """
+        c0 = int(math.floor((obj.x+self._ox)*self._sx-width/2.0+0.5))
+        r0 = int(math.floor((self._height-obj.y-self._oy)*self._sy-height/2.0+0.5))
+        return (r0,c0)
+
+    def _box(self,obj):
+        """
+        Returns the pixels (r0, r1, c0, c1, rows, cols) covered by an unrotated object.
+
+        The rows r0..r1-1 and the columns c0..c1-1 are the part of the object inside
+        the raster, while rows and cols are the slices of the object itself that they
+        show.  Returns ``None`` if the object is outside the raster.
+        """
+        width, height = self._extent(obj)
+        r0, c0 = self._corner(obj,width,height)
+        return self._clip(r0,r0+height,c0,c0+width)
+
+    def _clip(self,r0,r1,c0,c1):
+        """
+        Returns the box (r0, r1, c0, c1, rows, cols) of the part of a rectangle of pixels
+        inside the raster, as in :meth:`_box`, or ``None`` if there is none.
+        """
+        rows, cols = self._pixels.shape
+        if c1 <= 0 or r1 <= 0 or c0 >= cols or r0 >= rows:
+            return None
+        inrows = slice(max(-r0,0),(r1-r0)-max(r1-rows,0))
+        incols = slice(max(-c0,0),(c1-c0)-max(c1-cols,0))
+        return (max(r0,0),min(r1,rows),max(c0,0),min(c1,cols),inrows,incols)
+
+    def _fill(self,box,color):
+        """
+        Fills the pixels of a box with a color.
+        """
+        r0, r1, c0, c1, rows, cols = box
+        if len(color) < 4 or color[3] >= 1:
+            self._pixels[r0:r1,c0:c1] = _pack(color)
+        else:
+            region = self._frame[r0:r1,c0:c1]
+            region[:] = region*(1-color[3])+np.array(color[:3])*(255*color[3])+0.5
+
+    def _paint(self,r0,r1,c0,c1,inside,color):
+        """
+        Paints a color into the pixels r0..r1-1 x c0..c1-1 where inside is True.
+        """
+        if len(color) < 4 or color[3] >= 1:
+            np.copyto(self._pixels[r0:r1,c0:c1],_pack(color),where=inside)
+        else:
+            region = self._frame[r0:r1,c0:c1]
+            blend = region*(1-color[3])+np.array(color[:3])*(255*color[3])+0.5
+            np.copyto(region,blend.astype(np.uint8),where=inside[...,None])
+
+    def _draw_run(self,run,key):
+        """
+        Draws a run of plain images of the same kind with one copy into the frame.
+
+        The corners of all of the images are computed at once, and every visible pixel
+        of every image is written with a single scatter.  Opaque images are copied;
+        the others are blended with the pixels gathered from the frame, so where two
+        images of the run overlap, only the later one is seen.
+        """
+        if len(run) == 1:
+            self._draw_image(run[0])
+            return
+
+        scatter = self._scatters.get(key)
+        if scatter is None:
+            scatter = self._make_scatter(run[0],key)
+        height, width, vr, vc, offsets, color, alpha = scatter
+
+        xs = np.fromiter((obj.x for obj in run),dtype=float,count=len(run))
+        ys = np.fromiter((obj.y for obj in run),dtype=float,count=len(run))
+        c0 = np.floor((xs+self._ox)*self._sx-width/2.0+0.5).astype(np.intp)
+        r0 = np.floor((self._height-ys-self._oy)*self._sy-height/2.0+0.5).astype(np.intp)
+
+        rows, cols = self._pixels.shape
+        index = (r0*cols+c0)[:,None]+offsets
+        if (r0.min() < 0 or c0.min() < 0 or r0.max()+height > rows or
+            c0.max()+width > cols):
+            rr = r0[:,None]+vr
+            cc = c0[:,None]+vc
+            inside = (rr >= 0) & (rr < rows) & (cc >= 0) & (cc < cols)
+            index = index[inside]
+            color = np.broadcast_to(color,inside.shape+color.shape[1:])[inside]
+            if alpha is not None:
+                alpha = np.broadcast_to(alpha,inside.shape+(1,))[inside]
+        else:
+            index = index.reshape(-1)
+            color = np.broadcast_to(color,(len(run),)+color.shape).reshape(-1,*color.shape[1:])
+            if alpha is not None:
+                alpha = np.broadcast_to(alpha,(len(run),)+alpha.shape).reshape(-1,1)
+
+        if alpha is None:
+            self._pixels.reshape(-1)[index] = color
+        else:
+            pixels = self._pixels.view(np.uint8).reshape(-1,4)
+            pixels[index,:3] = pixels[index,:3]*(1-alpha)+color*alpha+0.5
+
+    def _draw_border(self,obj):
+        """
+        Draws the border of an unrotated rectangle, centered on its edges.
+        """
+        color = obj.linecolor
+        width = obj.linewidth
+        if color is None or width <= 0:
+            return
+        cols, rows = self._extent(obj)
+        r0, c0 = self._corner(obj,cols,rows)
+        r1, c1 = r0+rows, c0+cols
+        tx = max(int(round(width*self._sx)),1)
+        ty = max(int(round(width*self._sy)),1)
+        for edge in [(r0-ty//2,r0+(ty+1)//2,c0,c1),(r1-ty//2,r1+(ty+1)//2,c0,c1),
+                     (r0,r1,c0-tx//2,c0+(tx+1)//2),(r0,r1,c1-tx//2,c1+(tx+1)//2)]:
+            box = self._clip(*edge)
+            if box is not None:
+                self._fill(box,color)
+
+    def _draw_rotated(self,obj,shape,texture=None):
+        """
+        Draws a rotated (or scaled) object by testing every pixel of its bounding box.
+
+        :param shape: A function from local coordinates to the pixels inside the shape
+        :param texture: The pixels (rgb, alpha) of an image, or ``None`` for the fill
+        """
+        sx, sy = obj.scale
+        w = obj.width/2.0
+        h = obj.height/2.0
+        x = obj.x+self._ox
+        y = obj.y+self._oy
+        angle = math.radians(obj.angle)
+        cos, sin = math.cos(angle), math.sin(angle)
+        ex = abs(w*sx*cos)+abs(h*sy*sin)
+        ey = abs(w*sx*sin)+abs(h*sy*cos)
+
+        rows, cols = self._pixels.shape
+        c0 = max(int(math.floor((x-ex)*self._sx)),0)
+        c1 = min(int(math.ceil((x+ex)*self._sx)),cols)
+        r0 = max(int(math.floor((self._height-y-ey)*self._sy)),0)
+        r1 = min(int(math.ceil((self._height-y+ey)*self._sy)),rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+
+        # The centers of the pixels, in the coordinates of the object
+        gx = (np.arange(c0,c1)+0.5)/self._sx-x
+        gy = self._height-(np.arange(r0,r1)+0.5)/self._sy-y
+        gx, gy = np.meshgrid(gx,gy)
+        lx = (gx*cos+gy*sin)/sx
+        ly = (gy*cos-gx*sin)/sy
+        inside = shape(lx,ly,w,h)
+
+        if texture is None:
+            if obj.fillcolor is not None:
+                self._paint(r0,r1,c0,c1,inside,obj.fillcolor)
+            return
+
+        rgb, alpha = texture
+        th, tw = alpha.shape[:2]
+        tc = np.clip(((lx+w)/(2*w)*tw).astype(int),0,tw-1)
+        tr = np.clip(((h-ly)/(2*h)*th).astype(int),0,th-1)
+        a = alpha[tr,tc]*inside[...,None]
+        region = self._frame[r0:r1,c0:c1]
+        region[:] = region*(1-a)+rgb[tr,tc]*a+0.5
+
+    def _draw_segment(self,p,q,half,color):
+        """
+        Draws a line segment (in pixel coordinates) of the given half width.
+        """
+        rows, cols = self._pixels.shape
+        c0 = max(int(math.floor(min(p[0],q[0])-half)),0)
+        c1 = min(int(math.ceil(max(p[0],q[0])+half)),cols)
+        r0 = max(int(math.floor(min(p[1],q[1])-half)),0)
+        r1 = min(int(math.ceil(max(p[1],q[1])+half)),rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+
+        gx, gy = np.meshgrid(np.arange(c0,c1)+0.5,np.arange(r0,r1)+0.5)
+        dx, dy = q[0]-p[0], q[1]-p[1]
+        length = dx*dx+dy*dy
+        if length == 0:
+            t = 0
+        else:
+            t = np.clip(((gx-p[0])*dx+(gy-p[1])*dy)/length,0,1)
+        ex = gx-(p[0]+t*dx)
+        ey = gy-(p[1]+t*dy)
+        self._paint(r0,r1,c0,c1,ex*ex+ey*ey <= half*half,color)
+
+    def _fill_polygon(self,points,color):
+        """
+        Fills a polygon (in pixel coordinates) with the even-odd rule.
+        """
+        rows, cols = self._pixels.shape
+        px = points[:,0]
+        py = points[:,1]
+        c0 = max(int(math.floor(px.min())),0)
+        c1 = min(int(math.ceil(px.max())),cols)
+        r0 = max(int(math.floor(py.min())),0)
+        r1 = min(int(math.ceil(py.max())),rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+
+        gx, gy = np.meshgrid(np.arange(c0,c1)+0.5,np.arange(r0,r1)+0.5)
+        inside = np.zeros(gx.shape,dtype=bool)
+        for ii in range(len(points)):
+            x0, y0 = points[ii-1]
+            x1, y1 = points[ii]
+            if y0 == y1:
+                continue
+            cross = (gy >= min(y0,y1)) & (gy < max(y0,y1))
+            cross &= gx < x0+(gy-y0)*(x1-x0)/(y1-y0)
+            inside ^= cross
+        self._paint(r0,r1,c0,c1,inside,color)
+
+    def _points(self,obj):
+        """
+        Returns the points of a path in pixel coordinates, as an array of shape (n, 2).
+
+        The points are moved, rotated and scaled by the object, as in Kivy.
+        """
+        points = np.array(obj.points,dtype=float).reshape(-1,2)
+        sx, sy = obj.scale
+        angle = math.radians(obj.angle)
+        cos, sin = math.cos(angle), math.sin(angle)
+        x = points[:,0]*sx
+        y = points[:,1]*sy
+        gx = x*cos-y*sin+obj.x+self._ox
+        gy = x*sin+y*cos+obj.y+self._oy
+        return np.stack((gx*self._sx,(self._height-gy)*self._sy),axis=1)
+
+    def _draw_text(self,obj):
+        """
+        Draws the text of a label, with Pillow.
+        """
+        size = max(int(round(obj.font_size*self._sy)),1)
+        key = (obj.text,obj.font_name,obj.bold,size)
+        mask = self._texts.get(key)
+        if mask is None:
+            mask = self._make_text(obj,key)
+
+        # Align the text in the whole box of the label, then clip it to the raster
+        bw, bh = self._extent(obj)
+        top, left = self._corner(obj,bw,bh)
+        mh, mw = mask.shape
+        if obj.halign == 'left':
+            left = left
+        elif obj.halign == 'right':
+            left = left+bw-mw
+        else:
+            left = left+(bw-mw)//2
+        if obj.valign == 'bottom':
+            top = top+bh-mh
+        elif obj.valign != 'top':
+            top = top+(bh-mh)//2
+
+        box = self._clip(top,top+mh,left,left+mw)
+        if box is None:
+            return
+        r0, r1, c0, c1, rows, cols = box
+        color = obj.linecolor
+        alpha = mask[rows,cols,None]
+        if color is not None and len(color) > 3:
+            alpha = alpha*color[3]
+        rgb = np.array((0,0,0) if color is None else color[:3])*255
+        region = self._frame[r0:r1,c0:c1]
+        region[:] = region*(1-alpha)+rgb*alpha+0.5
+
+    # HIDDEN METHODS (CACHES)
+    def _sprite_key(self,obj):
+        """
+        Returns the key of the cached sprite of a plain image, or ``None`` for any other
+        object.
+
+        A plain image is an unrotated image (or sprite) with no border.
+        """
+        if self._handlers.get(type(obj)) != self._draw_image:
+            if self._find_handler(type(obj)) != self._draw_image:
+                return None
+        if obj.source is None or obj.angle != 0 or (obj.linecolor is not None and
+                                                   obj.linewidth > 0):
+            return None
+        return (obj.source,_frame_of(obj),obj.fillcolor,obj.width,obj.height,obj.scale)
+
+    def _sprite(self,obj,key):
+        """
+        Returns the image of an object scaled to its size in pixels, caching it.
+
+        The key is the one given by :meth:`_sprite_key`, so images of the same size
+        share their pixels.
+
+        The result is a triple (rgb, alpha, opaque).  If every pixel is fully opaque
+        or fully clear, rgb holds packed pixels, opaque is the bool mask of the opaque
+        pixels, and the image is copied with it; otherwise rgb holds floats in 0..255,
+        opaque is ``None`` and the image is blended with alpha.
+        """
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        rgb, alpha = self._texture(obj)
+        cols, rows = self._extent(obj)
+        tr = ((np.arange(rows)+0.5)*alpha.shape[0]/rows).astype(int)
+        tc = ((np.arange(cols)+0.5)*alpha.shape[1]/cols).astype(int)
+        rgb = rgb[tr[:,None],tc]
+        alpha = alpha[tr[:,None],tc]
+
+        if np.all((alpha == 0) | (alpha == 1)):
+            packed = np.full((rows,cols,4),255,dtype=np.uint8)
+            packed[...,:3] = rgb+0.5
+            sprite = (packed.view(_PIXEL)[...,0],None,alpha[...,0] > 0)
+        else:
+            sprite = (rgb,alpha,None)
+        self._sprites[key] = sprite
+        return sprite
+
+    def _make_scatter(self,obj,key):
+        """
+        Returns the visible pixels of the image of an object, for :meth:`_draw_run`,
+        caching them.
+
+        The result is a tuple (height, width, rows, cols, offsets, color, alpha), where
+        rows and cols are the positions of the visible pixels in the image, offsets is
+        their position in the flattened frame (relative to the top left corner of the
+        image), color is their packed pixels (or their rgb floats) and alpha is ``None``
+        for an opaque image (or the alpha of the pixels).
+        """
+        rgb, alpha, opaque = self._sprite(obj,key)
+        visible = opaque if opaque is not None else alpha[...,0] > 0
+        vr, vc = np.nonzero(visible)
+        offsets = vr*self._pixels.shape[1]+vc
+        if opaque is not None:
+            scatter = visible.shape+(vr,vc,offsets,rgb[visible],None)
+        else:
+            scatter = visible.shape+(vr,vc,offsets,rgb[visible],alpha[visible])
+        self._scatters[key] = scatter
+        return scatter
+
+    def _texture(self,obj):
+        """
+        Returns the pixels (rgb, alpha) of the image of an object, as floats.
+
+        The rgb values are in 0..255 and multiplied by the tint of the object.
+        """
+        pixels = self._load(obj.source)
+        frame = _frame_of(obj)
+        if frame is not None:
+            rows, cols = obj._format
+            fh = pixels.shape[0]//rows
+            fw = pixels.shape[1]//cols
+            r, c = divmod(frame,cols)
+            pixels = pixels[r*fh:(r+1)*fh,c*fw:(c+1)*fw]
+        rgb = pixels[...,:3].astype(np.float32)
+        if obj.fillcolor is not None:
+            rgb *= np.array(obj.fillcolor[:3],dtype=np.float32)
+        alpha = pixels[...,3:].astype(np.float32)/255
+        return (rgb,alpha)
+
+    def _make_text(self,obj,key):
+        """
+        Returns the coverage of the text of a label as floats in 0..1, caching it.
+        """
+        text, name, bold, size = key
+        font = ImageFont.truetype(self._font_path(name,bold),size)
+        draw = ImageDraw.Draw(Image.new('L',(1,1)))
+        left, top, right, bottom = draw.multiline_textbbox((0,0),text,font=font)
+        image = Image.new('L',(max(right-left,1),max(bottom-top,1)),0)
+        ImageDraw.Draw(image).multiline_text((-left,-top),text,fill=255,font=font)
+        mask = np.asarray(image,dtype=np.float32)/255
+        self._texts[key] = mask
+        return mask
+
+    def _font_path(self,name,bold):
+        """
+        Returns the file of a font: a file in the Fonts folder, or the Kivy default.
+        """
+        if name:
+            folder = self._fonts if self._fonts is not None else _app_folder('fonts','Fonts')
+            path = os.path.join(folder,name)
+            if os.path.exists(path):
+                return path
+        import kivy
+        default = 'Roboto-Bold.ttf' if bold else 'Roboto-Regular.ttf'
+        return os.path.join(kivy.kivy_data_dir,'fonts',default)
+
+    def _load(self,name):
+        """
+        Returns the pixels of an image file in the Images folder, reading it once.
+
+        The pixels are a uint8 array of shape (rows, columns, 4), whose first row is
+        the top of the image and whose last channel is the alpha.
+        """
+        if Image is None:
+            raise ImportError('drawing an image in a raster needs the Pillow library')
+        folder = self._images if self._images is not None else _app_folder('images','Images')
+        path = os.path.join(folder,name)
+        pixels = GRaster.IMAGE_CACHE.get(path)
+        if pixels is None:
+            with Image.open(path) as image:
+                pixels = np.asarray(image.convert('RGBA'))
+            GRaster.IMAGE_CACHE[path] = pixels
+        return pixels
+
+
+# #mark -
+# HELPER FUNCTIONS
+
+# The method that draws each game2d class, by class name
+_HANDLERS = {'GScene': '_draw_scene', 'GLabel': '_draw_label', 'GSprite': '_draw_image',
+             'GImage': '_draw_image', 'GEllipse': '_draw_ellipse',
+             'GRectangle': '_draw_rectangle', 'GTriangle': '_draw_polygon',
+             'GPolygon': '_draw_polygon', 'GPath': '_draw_path'}
+
+
+def _frame_of(obj):
+    """
+    Returns the frame of a sprite, or ``None`` for any other object.
+    """
+    return obj.frame if hasattr(obj,'_format') else None
+
+
+def _rectangle_mask(lx,ly,w,h):
+    """
+    Returns which local coordinates are inside a rectangle of half size (w, h).
+    """
+    return (np.abs(lx) <= w) & (np.abs(ly) <= h)
+
+
+def _ellipse_mask(lx,ly,w,h):
+    """
+    Returns which local coordinates are inside an ellipse of radii (w, h).
+    """
+    return (lx/w)**2+(ly/h)**2 <= 1
+
+
+def _pack(color):
+    """
+    Returns a color (with values in 0..1) as a packed pixel (see :data:`_PIXEL`).
+    """
+    rgba = np.full(4,255,dtype=np.uint8)
+    rgba[:3] = np.array(color[:3],dtype=float)*255+0.5
+    return rgba.view(_PIXEL)[0]
+
+
+def _is_rgba(value):
+    """
+    Returns True if value is a 3- or 4-element sequence of numbers in 0..1.
+    """
+    return (type(value) in [tuple,list] and 3 <= len(value) <= 4 and
+            all(type(v) in [int,float] and 0 <= v <= 1 for v in value))
+
+
+def _app_folder(attribute,default):
+    """
+    Returns the folder of a kind of resource set by :class:`GameApp`, or the default.
+    """
+    from .app import GameApp
+    return getattr(GameApp,attribute,default)
@@ -13,6 +13,7 @@ from kivy.graphics.instructions import *
 from kivy.uix.label import Label
 from kivy.uix.image import Image
 from .gobject import GObject
+from .backend import is_retained
 from .app import GameApp
 
 class GRectangle(GObject):
@@ -28,6 +29,8 @@ class GRectangle(GObject):
     The only new property for this class is ``linewidth``, which controls the width of
     the border around the rectangle.  For all other properties, see the documentation
     for :class:`GObject`."""
+
+    __slots__ = ('_linewidth',)
     
     # MUTABLE PROPERTIES 
     @property
@@ -80,6 +83,8 @@ class GRectangle(GObject):
         """
         Resets the drawing cache
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
@@ -111,6 +116,8 @@ class GEllipse(GRectangle):
     This class has exactly the same properties as :class:`GRectangle`.  See the 
     documentation of that class and :class:`GObject` for a complete list of attributes.
     """
+
+    __slots__ = ()
     
     # BUILT-IN METHODS
     def __init__(self,**keywords):
@@ -166,6 +173,8 @@ class GEllipse(GRectangle):
         """
         Resets the drawing cache.
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
@@ -204,6 +213,8 @@ class GImage(GRectangle):
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
+
+    __slots__ = ('_source', '_texture')
     
     # MUTABLE PROPERTIES
     @property
@@ -253,6 +264,8 @@ class GImage(GRectangle):
         """
         Resets the drawing cache.
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
@@ -297,6 +310,8 @@ class GLabel(GRectangle):
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
     provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+
+    __slots__ = ('_label', '_fsize', '_halign', '_valign', '_hanchor', '_vanchor', '_ha', '_hv')
     
     # MUTABLE PROPERTIES
     @property
@@ -305,7 +320,7 @@ class GLabel(GRectangle):
         The size of the text font in points.
         
         **Invariant**: Must be a positive number (int or float)"""
-        return self._fsize
+        return self._label.font_size
     
     @font_size.setter
     def font_size(self,value):
@@ -428,6 +443,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._edges = None
         self._hanchor = 'center'
         self._ha = value
     
@@ -444,6 +460,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._edges = None
         self._vanchor = 'center'
         self._hv = value
     
@@ -674,6 +691,8 @@ class GLabel(GRectangle):
         elif self.valign == 'bottom':
             self._label.bottom = -self.height/2.0
         
+        if not is_retained():
+            return
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
@@ -12,6 +12,7 @@ Date:   November 1, 2017 (Python 3 version)
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from .grectangle import GRectangle, GObject
+from .backend import is_retained
 from .app import GameApp
 
 # #mark -
@@ -34,6 +35,8 @@ class GSprite(GRectangle):
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
+
+    __slots__ = ('_source', '_texture', '_format', '_frame', '_images', '_bounds')
     
     # MUTABLE PROPERTIES
     @property
@@ -126,6 +129,8 @@ class GSprite(GRectangle):
         """
         Resets the drawing cache.
         """
+        if not is_retained():
+            return
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
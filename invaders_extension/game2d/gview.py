@@ -5,6 +5,9 @@ These class are both 'singletons'.  That means they are included with :class:`Ga
 and you should never try to create new versions of these classes.  Instead, you should
 read the documentation on how to use the provided objects.
 
+The classes :class:`GNullView` and :class:`GFakeInput` replace them when the game runs
+on the null backend (see :mod:`backend`), with no window and no keyboard.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
@@ -379,3 +382,227 @@ class GView(FloatLayout):
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
         self.canvas.add(self._frame)
+
+
+# #mark -
+class GNullView(object):
+    """
+    A class representing a view that draws nothing.
+
+    This is the view of :class:`GameApp` on the null backend.  It only counts what is
+    drawn, so the game code can be run and timed with no window and no graphics.  A
+    :class:`GScene` counts as a single draw, as it is a single command in a
+    :class:`GView`.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def width(self):
+        """
+        The width of the game.
+
+        **Invariant**: Must be an int or float >= 0.
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """
+        The height of the game.
+
+        **Invariant**: Must be an int or float >= 0.
+        """
+        return self._height
+
+    @property
+    def frames(self):
+        """
+        The number of times the view was cleared (one per animation frame).
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._frames
+
+    @property
+    def draws(self):
+        """
+        The total number of objects drawn.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._draws
+
+    @property
+    def drawn(self):
+        """
+        The number of objects drawn since the view was last cleared.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._drawn
+
+    @property
+    def counts(self):
+        """
+        The total number of objects drawn, by class name.
+
+        **Invariant**: Must be a dict from ``str`` to int > 0.
+        """
+        return dict(self._counts)
+
+    # BUILT-IN METHODS
+    def __init__(self,width=0.0,height=0.0):
+        """
+        Creates a new view with no draws.
+
+        :param width: The width of the game
+        :type width:  ``int`` or ``float`` >= 0
+
+        :param height: The height of the game
+        :type height:  ``int`` or ``float`` >= 0
+        """
+        self._width  = width
+        self._height = height
+        self._frames = 0
+        self._draws  = 0
+        self._drawn  = 0
+        self._counts = {}
+
+    # PUBLIC METHODS
+    def draw(self,obj):
+        """
+        Counts a drawn object.
+
+        You should use the `draw` method in :class:`GObject` instead.
+
+        :param obj: the object drawn
+        :type obj:  :class:`GObject`
+        """
+        name = type(obj).__name__
+        self._counts[name] = self._counts.get(name,0)+1
+        self._draws += 1
+        self._drawn += 1
+
+    def clear(self):
+        """
+        Starts a new animation frame.
+
+        This method is called for you automatically at the start of the animation
+        frame.
+        """
+        self._frames += 1
+        self._drawn = 0
+
+
+# #mark -
+class GFakeInput(GInput):
+    """
+    A class representing a scripted input handler.
+
+    This is the input of :class:`GameApp` on the null and raster backends.  It is read
+    like :class:`GInput`, but nothing is connected to it.  Instead, keys are held down
+    with :meth:`press` and :meth:`set_keys`, and the mouse with :meth:`set_touch`.
+
+    The handler may also be given a script: a sequence with the keys to hold down in
+    each animation frame.  The backend calls :meth:`advance` at the start of every
+    frame, which holds down the keys of the next entry.  When the script is over, no
+    keys are held down.
+    """
+
+    # IMMUTABLE ATTRIBUTES
+    @property
+    def touch(self):
+        """
+        The current (x,y) coordinate of the mouse, if pressed.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be either a :class:`Point2` or None (if there is no touch).
+        """
+        return self._touch
+
+    @property
+    def finished(self):
+        """
+        Whether every frame of the script has been played.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a bool.
+        """
+        return self._next is None
+
+    # BUILT-IN METHODS
+    def __init__(self,script=()):
+        """
+        Creates a new input handler with no keys held down.
+
+        :param script: The keys to hold down in each frame
+        :type script:  iterable of sequences of ``str``
+        """
+        GInput.__init__(self)
+        self._script = iter(script)
+        self._next = next(self._script,None)
+
+    # PUBLIC METHODS
+    def press(self,*keys):
+        """
+        Holds down the given keys.
+
+        :param keys: the keys to hold down
+        :type keys:  ``str``
+        """
+        for key in keys:
+            if not self._keystate.get(key,False):
+                self._keycount += 1
+            self._keystate[key] = True
+
+    def release(self,*keys):
+        """
+        Releases the given keys.
+
+        :param keys: the keys to release
+        :type keys:  ``str``
+        """
+        for key in keys:
+            if self._keystate.get(key,False):
+                self._keycount -= 1
+            self._keystate[key] = False
+
+    def set_keys(self,keys):
+        """
+        Holds down exactly the given keys, releasing all others.
+
+        :param keys: the keys to hold down
+        :type keys:  sequence of ``str``
+        """
+        self._keystate = dict.fromkeys(keys,True)
+        self._keycount = len(self._keystate)
+
+    def set_touch(self,point):
+        """
+        Presses the mouse at the given point, or releases it if point is None.
+
+        :param point: the position of the mouse
+        :type point:  :class:`Point2`, a pair of numbers or ``None``
+        """
+        if point is None or isinstance(point,Point2):
+            self._touch = point
+        else:
+            self._touch = Point2(point[0],point[1])
+
+    def advance(self):
+        """
+        Holds down the keys of the next frame of the script.
+
+        If the script is over, all keys are released.
+
+        :return: True if a frame of the script was played
+        :rtype:  ``bool``
+        """
+        if self._next is None:
+            self.set_keys(())
+            return False
+        self.set_keys(self._next)
+        self._next = next(self._script,None)
+        return True
@@ -2,11 +2,13 @@
 Sound classes for 2D game support.
 
 This classes wrap the Kivy audio interface, making it simpler for students to use.
+On a headless backend (see :mod:`backend`), sounds are not loaded and are silent.
 
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 from kivy.core.audio import SoundLoader
+from .backend import is_audible
 from .app import GameApp
 
 
@@ -36,13 +38,15 @@ class Sound(object):
         
         **Invariant**: Must float in the range 0..1.
         """
-        return self._sound.volume
+        return self._volume if self._sound is None else self._sound.volume
     
     @volume.setter
     def volume(self,value):
         assert type(value) in [int, float] and value >= 0 and value <= 1, \
             'value %s is not a valid volume' % repr(value)
-        self._sound.volume = value
+        self._volume = value
+        if not self._sound is None:
+            self._sound.volume = value
     
     # IMMUTABLE PROPERTIES
     @property
@@ -66,7 +70,7 @@ class Sound(object):
         
         **Invariant**: Must be a boolean.
         """ 
-        return self._sound.state == 'play'
+        return not self._sound is None and self._sound.state == 'play'
     
     def __init__(self,source):
         """
@@ -78,6 +82,10 @@ class Sound(object):
         from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
+        self._volume = 1
+        self._sound  = None
+        if not is_audible():
+            return
         self._sound  = SoundLoader.load(source)
         if self._sound is None:
             raise IOError('Module game2d cannot read the file %s' % repr(source))
@@ -91,6 +99,8 @@ class Sound(object):
         :param loop: Whether or not to loop the sound
         :type loop:  ``bool``
         """
+        if self._sound is None:
+            return
         self._sound.loop = loop
         self._sound.play()
 
@@ -100,7 +110,8 @@ class Sound(object):
         
         This will stop the sound immediately, even if it is looping.
         """
-        self._sound.stop()
+        if not self._sound is None:
+            self._sound.stop()
 
 
 # #mark -
@@ -0,0 +1,996 @@
+"""
+Headless simulation module for Alien Invaders
+
+This module contains a pure-data version of the wave subcontroller.  Instances of
+HeadlessWave play exactly the same rules as Wave (marching, laser bolts, collisions,
+scoring, winning and losing), but they never create a GObject.  Positions are plain
+numbers, so a wave can be stepped without Kivy and without a window.
+
+HeadlessGame wraps a HeadlessWave in the same state machine that Invaders uses, so
+a complete game can be simulated in an ordinary loop:
+
+    game = HeadlessGame()
+    keys = HeadlessInput()
+    while not game.isComplete():
+        game.update(1/60, keys)
+
+Every wave has its own random number generator, made from a seed.  The aliens only
+fire with this generator, so two waves with the same seed and the same input play
+exactly the same game (see replay.py).
+
+The state of a wave or a game can be saved as a tuple of numbers, with the method
+save, and brought back with the method restore.  Saving copies no arrays and makes
+no objects besides the tuple, and restoring only changes what differs, so a search
+can branch from a state many times per second.
+
+The whole state of a game (the state machine and the wave, including the random
+number generator) can also be packed into a snapshot with packState, which is the
+saved state as bytes, and a HeadlessGame can be set to a snapshot with setSnapshot.
+Invaders packs its own state the same way, so a game in the window can be continued
+by a HeadlessGame.  A snapshot has a fixed binary layout (see SNAPSHOT_GAME and
+SNAPSHOT_WAVE), so reading one from a replay file only ever decodes numbers.
+
+Wave uses a HeadlessWave for all of its game logic.  It only keeps the models from
+models.py so that it has something to draw; the rendering is an optional view that
+is attached to the simulation.
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from formation import *
+from collide import *
+import numpy as np
+import random
+import struct
+
+# PRIMARY RULE: This module may only access consts.py, config.py, formation.py and
+# collide.py.  It must never import game2d, models.py or anything else that needs Kivy.
+
+# The version of the layout of a snapshot
+SNAPSHOT_VERSION = 1
+
+# The layout of the start of a snapshot: version, seed, state, whether there is a wave
+SNAPSHOT_GAME = struct.Struct('<BQB?')
+
+# The layout of the numbers of a wave: flags (see SNAPSHOT_FLAGS), ship x, ship x at
+# the start of the step, offset, offset at the start of the step, time, gauss value
+# of the random number generator, direction, steps to the next shot, lives, score,
+# rows, columns, number of player bolts and number of alien bolts
+SNAPSHOT_WAVE = struct.Struct('<B8dbiiQHHII')
+
+# The bits of the flags of a wave: the ship x is set, the ship x at the start of the
+# step is set, the aliens moved, the gauss value is set
+SNAPSHOT_FLAGS = ('shipx', 'prevshipx', 'moved', 'gauss')
+
+# The arrays after the numbers of a wave: whether each alien is alive, the player
+# bolts and the alien bolts (x, y, y0 each) and the state of the Mersenne Twister
+_ALIVE_TYPE = np.dtype('u1')
+_BOLT_TYPE = np.dtype('<f8')
+_RNG_TYPE = np.dtype('<u4')
+_RNG_SIZE = 625
+
+
+class HeadlessInput(object):
+    """
+    A class to script the keyboard for a headless game.
+
+    This class has the two parts of GInput that the game reads: the method is_key_down
+    and the attribute key_count.  Instead of listening to a keyboard, the keys that are
+    held down are set with setKeys.
+
+    INSTANCE ATTRIBUTES:
+        _keys: the keys currently held down [set of str, possibly empty]
+    """
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down.
+        """
+        return len(self._keys)
+
+    def __init__(self, keys=()):
+        """
+        Initializer: Creates an input with the given keys held down
+
+        Parameter keys: The keys held down
+        Precondition: keys is a sequence of str (e.g. 'left', 'up')
+        """
+        self.setKeys(keys)
+
+    def setKeys(self, keys):
+        """
+        Sets the keys that are held down, releasing all other keys
+
+        Parameter keys: The keys held down
+        Precondition: keys is a sequence of str (e.g. 'left', 'up')
+        """
+        self._keys = set(keys)
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is currently held down
+
+        Parameter key: The key to test
+        Precondition: key is a str
+        """
+        return key in self._keys
+
+
+class HeadlessWave(object):
+    """
+    This class simulates a single wave of Alien Invaders without any graphics.
+
+    It follows the same rules as Wave.  The only difference is the representation:
+    the ship, the aliens and the laser bolts are positions (the centers of the
+    objects), and their sizes come from the configuration (see config.py).
+
+    The update methods have the same names as the ones in Wave and must be called in
+    the same order as in Invaders.updateGame.  The method step does this for you.
+
+    INSTANCE ATTRIBUTES:
+        _shipx:      the x-coordinate of the ship [int or float, or None if destroyed]
+        _aliens:     the positions of the aliens [Formation of ALIEN_ROWS x ALIENS_IN_ROW]
+        _shiphash:   the ship, if it is not destroyed [SpatialHash with the key 'ship']
+        _bolts:      the player laser bolts on screen [list of [x, y, y0], possibly empty]
+        _alienbolts: the alien laser bolts on screen [list of [x, y, y0], possibly empty]
+        _direction:  the direction in which the aliens are moving [1 or -1]
+        _time:       the amount of time since the last Alien "step" [number >= 0]
+        _moved:      whether the aliens moved since the last test against the walls [bool]
+        _tofire:     the number of steps until the next alien shot [int >= 0]
+        _lives:      the number of lives left [int]
+        _score:      the score of the game [int >= 0]
+        _prevshipx:  the x-coordinate of the ship at the start of the step [number or None]
+        _prevoffset: the offset of the formation at the start of the step [pair of floats]
+        _seed:       the seed of the random number generator [int >= 0]
+        _rng:        the random number generator for the alien shots [random.Random]
+        _config:     the constants of the game [Config]
+
+    The value y0 of a bolt is its y-coordinate at the start of the step (or where it
+    was fired, if it was fired during the step).  Together with _prevshipx and
+    _prevoffset, this allows a view to draw the wave between two steps.  The method
+    beginStep records these values, and must be called before each step.
+    """
+
+    # GETTERS AND SETTERS
+
+    def getSeed(self):
+        """
+        Returns the seed of the random number generator of this wave
+        """
+        return self._seed
+
+    def getConfig(self):
+        """
+        Returns the configuration of this wave
+        """
+        return self._config
+
+    def getShipX(self):
+        """
+        Returns the x-coordinate of the ship, or None if the ship is destroyed
+        """
+        return self._shipx
+
+    def getAliens(self):
+        """
+        Returns the formation of aliens
+        """
+        return self._aliens
+
+    def getBolts(self):
+        """
+        Returns the positions ([x, y, y0]) of the player laser bolts on the screen
+        """
+        return self._bolts
+
+    def getAlienBolts(self):
+        """
+        Returns the positions ([x, y, y0]) of the alien laser bolts on the screen
+        """
+        return self._alienbolts
+
+    def getDirection(self):
+        """
+        Returns the direction in which the aliens are moving (1 or -1)
+        """
+        return self._direction
+
+    def getLives(self):
+        """
+        Returns the number of lives left
+        """
+        return self._lives
+
+    def setLives(self, value):
+        """
+        Sets the number of lives left
+
+        Parameter value: The number of lives
+        Precondition: value is an int
+        """
+        assert type(value) == int
+        self._lives = value
+
+    def getTime(self):
+        """
+        Returns the the amount of time since the last Alien "step"
+        """
+        return self._time
+
+    def getScore(self):
+        """
+        Returns the score of the game
+        """
+        return self._score
+
+    def setScore(self, value):
+        """
+        Sets the score of the game
+
+        Parameter value: The score
+        Precondition: value is an int >= 0
+        """
+        self._score = value
+
+    # INITIALIZER
+
+    def __init__(self, seed=None, config=None):
+        """
+        Initializer: Creates the aliens and the ship at their starting positions
+
+        Parameter seed: The seed of the random number generator (a new one if None)
+        Precondition: seed is None or an int >= 0
+
+        Parameter config: The configuration of the game (the one in consts.py if None)
+        Precondition: config is None or a Config
+        """
+        assert seed is None or (type(seed) == int and seed >= 0)
+        assert config is None or isinstance(config, Config)
+        self._config = DEFAULT if config is None else config
+        self._seed = newSeed() if seed is None else seed
+        self._rng = random.Random(self._seed)
+        self._time = 0
+        self._direction = 1
+        self._moved = True
+        config = self._config
+        self._aliens = Formation(config.ALIEN_ROWS, config.ALIENS_IN_ROW,
+                                 config.LEFT_TO_FIRST, config.TOP_TO_FIRST,
+                                 config.ADDING_ROW, config.ADDING_COLUMN,
+                                 config.ALIEN_WIDTH, config.ALIEN_HEIGHT)
+        self._shiphash = SpatialHash(config.ADDING_ROW, config.ADDING_COLUMN)
+        self._shipx = None
+        self.restoreShip()
+        self._bolts = []
+        self._alienbolts = []
+        self._tofire = self._rng.randrange(1, config.BOLT_RATE, 1)
+        self._lives = config.SHIP_LIVES
+        self._score = 0
+        self.beginStep()
+
+    # UPDATE METHODS
+
+    def step(self, dt, input):
+        """
+        Plays one frame of the wave, in the same order as Invaders.updateGame.
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+
+        Parameter input: The keys held down during this frame
+        Precondition: input has a method is_key_down (e.g. GInput or HeadlessInput)
+        """
+        self.beginStep()
+        self.updateShip(input)
+        self.updateAlien(dt)
+        self.updateBolts(input)
+        self.updateAlienBolts()
+        self.collision()
+        self.collisionShip()
+
+    def beginStep(self):
+        """
+        Records the positions at the start of a step, so that a view can draw the wave
+        between this step and the next one.
+        """
+        self._prevshipx = self._shipx
+        self._prevoffset = self._aliens.getOffset()
+        for bolt in self._bolts:
+            bolt[2] = bolt[1]
+        for bolt in self._alienbolts:
+            bolt[2] = bolt[1]
+
+    def updateShip(self, input):
+        """
+        Moves the ship horizontally if 'left' or 'right' is held down.
+        The ship can not go beyond the borders of the game.
+
+        Parameter input: The keys held down during this frame
+        Precondition: input has a method is_key_down (e.g. GInput or HeadlessInput)
+        """
+        if self._shipx is not None:
+            config = self._config
+            old = self._shipx
+            if input.is_key_down('left'):
+                if self._shipx - config.SHIP_WIDTH/2 >= 0:
+                    self._shipx -= config.SHIP_MOVEMENT
+            if input.is_key_down('right'):
+                if self._shipx + config.SHIP_WIDTH/2 <= config.GAME_WIDTH:
+                    self._shipx += config.SHIP_MOVEMENT
+            if self._shipx != old:
+                self._shiphash.remove('ship', *_shipBox(old, config))
+                self._shiphash.insert('ship', *self.shipBox())
+
+    def updateAlien(self, dt):
+        """
+        Marches the aliens by ALIEN_H_WALK every ALIEN_SPEED seconds, and moves
+        them down by ALIEN_V_WALK when they reach the side of the screen.
+
+        The time left over after a step is kept, so the aliens march at the same
+        speed no matter how the time is split into frames.
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        self._time += dt
+        config = self._config
+        if self._time > config.ALIEN_SPEED:
+            self._aliens.march(self._direction * config.ALIEN_H_WALK, 0)
+            self._moved = True
+            self._time -= config.ALIEN_SPEED
+            self._tofire -= 1
+        self.moveLeftRight()
+
+    def moveLeftRight(self):
+        """
+        Turns the aliens around when they reach the side of the screen.
+
+        If the rightmost alien reaches the right end of the screen, the aliens move
+        down by ALIEN_V_WALK and back to the left by ALIEN_H_WALK. Similarly for the
+        leftmost alien and the left end of the screen.
+
+        The aliens can only reach a wall by moving, so nothing is tested if they have
+        not moved since the last test.
+        """
+        if not self._moved or self._aliens.isEmpty():
+            return
+        self._moved = False
+        config = self._config
+        if self.mostright() >= config.BORDER_RIGHT:
+            self._aliens.march(-config.ALIEN_H_WALK, -config.ALIEN_V_WALK)
+            self._moved = True
+            self._direction = -1
+        elif self.mostleft() <= config.ALIEN_WIDTH/2 + config.ALIEN_H_SEP:
+            self._aliens.march(config.ALIEN_H_WALK, -config.ALIEN_V_WALK)
+            self._moved = True
+            self._direction = 1
+
+    def mostright(self):
+        """
+        Returns the x-coordinate of the rightmost alien that is alive
+        """
+        return self._aliens.mostright()
+
+    def mostleft(self):
+        """
+        Returns the x-coordinate of the leftmost alien that is alive
+        """
+        return self._aliens.mostleft()
+
+    def countAlienAlive(self):
+        """
+        Returns the number of aliens that are alive
+        """
+        return self._aliens.count()
+
+    def alienOneLeft(self):
+        """
+        Returns the position of the first alien that is alive, or None if there is none
+        """
+        index = self._aliens.first()
+        return None if index == -1 else self._aliens.position(index)
+
+    def makeBolts(self):
+        """
+        Creates a bolt at the top of the ship.
+        """
+        y = self._config.SHIP_BOTTOM + self._config.SHIP_HEIGHT/2
+        self._bolts.append([self._shipx, y, y])
+
+    def updateBolts(self, input):
+        """
+        Fires a bolt if 'up' is held down (and no bolt is on screen), moves the player
+        bolts up, and removes the bolts that have left the screen.
+
+        Parameter input: The keys held down during this frame
+        Precondition: input has a method is_key_down (e.g. GInput or HeadlessInput)
+        """
+        if input.is_key_down('up'):
+            if self._bolts == [] and self._shipx is not None:
+                self.makeBolts()
+
+        for bolt in self._bolts:
+            bolt[1] += self._config.BOLT_SPEED
+
+        i = 0
+        while i < len(self._bolts):
+            if self._bolts[i][1] - self._config.BOLT_HEIGHT/2 > self._config.GAME_HEIGHT:
+                del self._bolts[i]
+            else:
+                i += 1
+
+    def makeAlienBolts(self):
+        """
+        Creates a bolt below the bottom-most alien of a random column.
+        """
+        columns = self._aliens.getColumns()
+
+        if columns != []:
+            col = columns[self._rng.randint(0, len(columns)-1)]
+            x, y = self._aliens.position(self._aliens.lowest(col))
+            y -= self._config.ALIEN_WIDTH/2
+            self._alienbolts.append([x, y, y])
+
+    def updateAlienBolts(self):
+        """
+        Makes the aliens fire when it is their turn, moves the alien bolts down, and
+        removes the bolts that have left the screen.
+        """
+        if self._tofire == 0:
+            self.makeAlienBolts()
+
+        for bolt in self._alienbolts:
+            bolt[1] -= self._config.BOLT_SPEED
+            self._tofire = self._rng.randrange(1, self._config.BOLT_RATE, 1)
+
+        i = 0
+        while i < len(self._alienbolts):
+            if self._alienbolts[i][1] + self._config.BOLT_HEIGHT/2 < 0:
+                del self._alienbolts[i]
+            else:
+                i += 1
+
+    # COLLISION DETECTION
+
+    def collision(self):
+        """
+        Removes every alien hit by a player bolt, along with the bolt, and adds the
+        points for that alien to the score.
+
+        A bolt hits the first alien in its way since the start of the step, so a fast
+        bolt cannot pass through an alien between two steps.
+
+        Returns the number of aliens destroyed.
+        """
+        near = set()
+        for bolt in self._bolts:
+            near.update(self._aliens.near(*_sweptBox(bolt, self._config)).tolist())
+        if len(near) == 0:
+            return 0
+
+        # Test the bolts in the coordinates of the formation
+        near = np.array(sorted(near), dtype=int)
+        offx, offy = self._aliens.getOffset()
+        bolts = np.array(self._bolts, dtype=float)
+        config = self._config
+        hits = resolveSweptHits(sweptHits(bolts[:, 0] - offx, bolts[:, 1] - offy,
+                                          bolts[:, 1] - bolts[:, 2],
+                                          config.BOLT_WIDTH, config.BOLT_HEIGHT,
+                                          self._aliens.getX()[near],
+                                          self._aliens.getY()[near],
+                                          config.ALIEN_WIDTH, config.ALIEN_HEIGHT))
+        hits = [(int(near[alien]), bolt) for alien, bolt in hits]
+
+        rows = self._aliens.getRow()
+        for alien, bolt in hits:
+            self._aliens.kill(alien)
+            self._score += alienScore(int(rows[alien]))
+        for alien, bolt in sorted(hits, key=lambda hit: hit[1], reverse=True):
+            del self._bolts[bolt]
+        return len(hits)
+
+    def collisionShip(self):
+        """
+        Destroys the ship if it is hit by an alien bolt, and removes that bolt.
+
+        As in collision, the whole path of each bolt in the step is tested, and the
+        bolt that reaches the ship first is the one removed.
+
+        Returns True if the ship was destroyed.
+        """
+        if self._shipx is None:
+            return False
+
+        near = [bolt for bolt in self._alienbolts
+                if len(self._shiphash.query(*_sweptBox(bolt, self._config))) > 0]
+        if near == []:
+            return False
+
+        bolts = np.array(near, dtype=float)
+        config = self._config
+        hits = resolveSweptHits(sweptHits(bolts[:, 0], bolts[:, 1],
+                                          bolts[:, 1] - bolts[:, 2],
+                                          config.BOLT_WIDTH, config.BOLT_HEIGHT,
+                                          [self._shipx], [config.SHIP_BOTTOM],
+                                          config.SHIP_WIDTH, config.SHIP_HEIGHT))
+        if hits == []:
+            return False
+
+        self._shiphash.remove('ship', *self.shipBox())
+        self._shipx = None
+        self._alienbolts.remove(near[hits[0][1]])
+        return True
+
+    def loseRound(self):
+        """
+        Returns True if the ship is destroyed
+        """
+        return self._shipx is None
+
+    def overDefenseLine(self):
+        """
+        Returns True if an alien has passed over the defense line
+        """
+        if self._aliens.isEmpty():
+            return False
+        return (self._aliens.bottom() - self._config.ALIEN_HEIGHT/2
+                <= self._config.DEFENSE_LINE)
+
+    def restoreShip(self):
+        """
+        Restores the ship after it was destroyed
+        """
+        if self._shipx is None:
+            self._shipx = self._config.GAME_WIDTH / 2
+            self._prevshipx = self._shipx
+            self._shiphash.insert('ship', *self.shipBox())
+
+    def save(self):
+        """
+        Returns the state of the wave as a tuple
+
+        The tuple only holds numbers and tuples of numbers, so it cannot be changed,
+        and it can be restored any number of times.
+        """
+        return (self._shipx, self._prevshipx, self._aliens.save(), self._prevoffset,
+                tuple(map(tuple, self._bolts)), tuple(map(tuple, self._alienbolts)),
+                self._direction, self._time, self._moved, self._tofire, self._lives,
+                self._score, self._rng.getstate())
+
+    def restore(self, state):
+        """
+        Sets the wave to a state returned by save
+
+        Parameter state: The state of the wave
+        Precondition: state is a tuple returned by save
+        """
+        (shipx, self._prevshipx, aliens, self._prevoffset, bolts, alienbolts,
+         self._direction, self._time, self._moved, self._tofire, self._lives,
+         self._score, rng) = state
+        if shipx != self._shipx:
+            if self._shipx is not None:
+                self._shiphash.remove('ship', *self.shipBox())
+            self._shipx = shipx
+            if self._shipx is not None:
+                self._shiphash.insert('ship', *self.shipBox())
+        self._aliens.restore(aliens)
+        self._bolts = list(map(list, bolts))
+        self._alienbolts = list(map(list, alienbolts))
+        self._rng.setstate(rng)
+
+    def shipXAt(self, alpha):
+        """
+        Returns the x-coordinate of the ship a fraction alpha of the way through the
+        last step, or None if the ship is destroyed
+
+        Parameter alpha: The fraction of the step
+        Precondition: alpha is a number in 0..1
+        """
+        if self._shipx is None or self._prevshipx is None:
+            return self._shipx
+        return interpolate(self._prevshipx, self._shipx, alpha)
+
+    def offsetAt(self, alpha):
+        """
+        Returns the offset (x, y) of the formation a fraction alpha of the way through
+        the last step
+
+        Parameter alpha: The fraction of the step
+        Precondition: alpha is a number in 0..1
+        """
+        offx, offy = self._aliens.getOffset()
+        return (interpolate(self._prevoffset[0], offx, alpha),
+                interpolate(self._prevoffset[1], offy, alpha))
+
+    def shipBox(self):
+        """
+        Returns the edges (left, bottom, right, top) of the ship
+
+        Precondition: the ship is not destroyed
+        """
+        return _shipBox(self._shipx, self._config)
+
+
+class HeadlessGame(object):
+    """
+    This class plays a complete game of Alien Invaders without any graphics.
+
+    It is the same state machine as Invaders (see the specification of
+    Invaders.update), except that it draws nothing and makes no sound.  The input is
+    passed to update instead of being read from a window.
+
+    INSTANCE ATTRIBUTES:
+        _state:     the current state of the game represented as a value from consts.py
+        _wave:      the wave being played [HeadlessWave, or None if _state is STATE_INACTIVE]
+        _last_keys: the number of keys pressed during the frame [None]
+        _seed:      the seed of the wave [int >= 0]
+        _config:    the constants of the game [Config]
+    """
+
+    # GETTERS
+
+    def getState(self):
+        """
+        Returns the current state of the game
+        """
+        return self._state
+
+    def getWave(self):
+        """
+        Returns the wave being played, or None if the game has not started
+        """
+        return self._wave
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave
+        """
+        return self._seed
+
+    def getConfig(self):
+        """
+        Returns the configuration of the game
+        """
+        return self._config
+
+    def getSnapshot(self):
+        """
+        Returns the whole state of the game as a snapshot (see packState)
+        """
+        return packState(self._seed, self._state, self._wave)
+
+    def setSnapshot(self, data):
+        """
+        Sets the whole state of the game to a snapshot
+
+        A ValueError is raised if data is not a snapshot of a game with the
+        configuration of this one, and the game is then left as it was.
+
+        Parameter data: The snapshot
+        Precondition: data is a bytes-like object
+        """
+        self.restore(unpackState(data, self._config))
+
+    def save(self):
+        """
+        Returns the whole state of the game as a tuple (seed, state, wave)
+
+        The wave is the tuple saved by the wave, or None if there is no wave.
+        """
+        return saveGame(self._seed, self._state, self._wave)
+
+    def restore(self, state):
+        """
+        Sets the whole state of the game to a tuple returned by save
+
+        The wave is reused if there is one, so restoring does not make a new
+        formation.
+
+        Parameter state: The state of the game
+        Precondition: state is a tuple returned by save (or by saveGame)
+        """
+        self._seed, self._state, wave = state
+        if wave is None:
+            self._wave = None
+        else:
+            if self._wave is None:
+                self._wave = HeadlessWave(self._seed, self._config)
+            self._wave.restore(wave)
+        self._last_keys = None
+
+    # INITIALIZER
+
+    def __init__(self, seed=None, config=None):
+        """
+        Initializer: Creates a game that is waiting for a key press
+
+        Parameter seed: The seed of the wave (a new one if None)
+        Precondition: seed is None or an int >= 0
+
+        Parameter config: The configuration of the game (the one in consts.py if None)
+        Precondition: config is None or a Config
+        """
+        assert seed is None or (type(seed) == int and seed >= 0)
+        assert config is None or isinstance(config, Config)
+        self._config = DEFAULT if config is None else config
+        self._seed = newSeed() if seed is None else seed
+        self._state = STATE_INACTIVE
+        self._wave = None
+        self._last_keys = None
+
+    # UPDATE METHODS
+
+    def update(self, dt, input):
+        """
+        Plays a single frame of the game.
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+
+        Parameter input: The keys held down during this frame
+        Precondition: input has the method is_key_down and the attribute key_count
+        """
+        if self._wave is not None:
+            self._wave.beginStep()
+
+        if self._state == STATE_INACTIVE:
+            self.determine_state(input)
+
+        if self._state == STATE_NEWWAVE:
+            self._wave = HeadlessWave(self._seed, self._config)
+            self._state = STATE_ACTIVE
+
+        if self._state == STATE_ACTIVE:
+            self.updateGame(dt, input)
+            self.alive_again()
+            self.determine_win_or_lose()
+
+        if self._state == STATE_CONTINUE:
+            self._state = STATE_ACTIVE
+
+        if self._state == STATE_PAUSED:
+            self._last_keys = None
+            self.determine_state(input)
+
+    def updateGame(self, dt, input):
+        """
+        Plays one frame of the wave when self._state == STATE_ACTIVE.
+        """
+        self._wave.step(dt, input)
+        self.alive_again()
+
+    def determine_state(self, input):
+        """
+        Starts the game, or continues it after a lost life, on a key press.
+        """
+        if ((input.key_count > 0 and self._last_keys is None)
+                and self._state == STATE_INACTIVE):
+            self._state = STATE_NEWWAVE
+
+        if ((input.is_key_down('s') and self._last_keys is None)
+                and self._state == STATE_PAUSED):
+            self._state = STATE_CONTINUE
+            self._wave.restoreShip()
+
+    def alive_again(self):
+        """
+        Takes away a life when the ship is destroyed.
+        """
+        if self._wave.loseRound() and self._state == STATE_ACTIVE:
+            self._wave.setLives(self._wave.getLives()-1)
+            if self._wave.getLives() != 0:
+                self._state = STATE_PAUSED
+
+    def determine_win_or_lose(self):
+        """
+        Completes the game if all lives are lost, if an alien passes the defense line,
+        or if all of the aliens are destroyed.
+        """
+        if self._wave.getLives() < 1 or self._wave.overDefenseLine():
+            self._state = STATE_COMPLETE
+        if self._wave.getAliens().isEmpty():
+            self._state = STATE_COMPLETE
+
+    def isComplete(self):
+        """
+        Returns True if the game is over (won or lost)
+        """
+        return self._state == STATE_COMPLETE
+
+    def isWon(self):
+        """
+        Returns True if the game is over and every alien was destroyed
+        """
+        return self.isComplete() and self._wave.getAliens().isEmpty()
+
+
+# HELPER FUNCTIONS
+
+def saveGame(seed, state, wave):
+    """
+    Returns the state of a game as a tuple (seed, state, wave), as in HeadlessGame.save
+
+    Parameter seed: The seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter state: The state of the game
+    Precondition: state is one of the states in consts.py
+
+    Parameter wave: The wave being played
+    Precondition: wave is a HeadlessWave, or None if state is STATE_INACTIVE
+    """
+    return (seed, state, None if wave is None else wave.save())
+
+
+def packState(seed, state, wave):
+    """
+    Returns a snapshot of a game, as a bytes object
+
+    The snapshot is the tuple of saveGame in a fixed binary layout: SNAPSHOT_GAME,
+    then (if there is a wave) SNAPSHOT_WAVE followed by the arrays of the wave.  Use
+    unpackState to get the tuple back.
+
+    Parameter seed: The seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter state: The state of the game
+    Precondition: state is one of the states in consts.py
+
+    Parameter wave: The wave being played
+    Precondition: wave is a HeadlessWave, or None if state is STATE_INACTIVE
+    """
+    data = SNAPSHOT_GAME.pack(SNAPSHOT_VERSION, seed, state, wave is not None)
+    if wave is None:
+        return data
+
+    (shipx, prevshipx, (offx, offy, mask), prevoffset, bolts, alienbolts, direction,
+     time, moved, tofire, lives, score, (version, key, gauss)) = wave.save()
+    aliens = wave.getAliens()
+    flags = 0
+    for (bit, value) in enumerate((shipx is not None, prevshipx is not None, moved,
+                                   gauss is not None)):
+        flags |= value << bit
+    data += SNAPSHOT_WAVE.pack(flags, shipx or 0, prevshipx or 0, offx, offy,
+                               prevoffset[0], prevoffset[1], time, gauss or 0,
+                               direction, tofire, lives, score, aliens.getRows(),
+                               aliens.getCols(), len(bolts), len(alienbolts))
+    data += aliens.getAlive().astype(_ALIVE_TYPE).tobytes()
+    data += np.array(bolts, _BOLT_TYPE).tobytes()
+    data += np.array(alienbolts, _BOLT_TYPE).tobytes()
+    data += np.array(key, _RNG_TYPE).tobytes()
+    return data
+
+
+def unpackState(data, config):
+    """
+    Returns the tuple (seed, state, wave) of saveGame packed in a snapshot
+
+    A ValueError is raised if data is not a snapshot made by packState for a game with
+    the given configuration.
+
+    Parameter data: The snapshot
+    Precondition: data is a bytes-like object
+
+    Parameter config: The configuration of the game
+    Precondition: config is a Config
+    """
+    data = memoryview(data).cast('B')
+    if len(data) < SNAPSHOT_GAME.size:
+        raise ValueError('the snapshot is too short')
+    version, seed, state, haswave = SNAPSHOT_GAME.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError('the snapshot is not of version %d' % SNAPSHOT_VERSION)
+    if state > STATE_COMPLETE:
+        raise ValueError('%d is not a valid state of a snapshot' % state)
+    if not haswave:
+        if len(data) != SNAPSHOT_GAME.size:
+            raise ValueError('the snapshot has the wrong size')
+        return (seed, state, None)
+
+    if len(data) < SNAPSHOT_GAME.size + SNAPSHOT_WAVE.size:
+        raise ValueError('the snapshot is too short')
+    (flags, shipx, prevshipx, offx, offy, prevoffx, prevoffy, time, gauss, direction,
+     tofire, lives, score, rows, cols, nbolts, nalienbolts) = \
+        SNAPSHOT_WAVE.unpack_from(data, SNAPSHOT_GAME.size)
+    if (rows, cols) != (config.ALIEN_ROWS, config.ALIENS_IN_ROW):
+        raise ValueError('the snapshot has %d x %d aliens, not %d x %d'
+                         % (rows, cols, config.ALIEN_ROWS, config.ALIENS_IN_ROW))
+    if flags >> len(SNAPSHOT_FLAGS) != 0 or direction not in (1, -1) or tofire < 0:
+        raise ValueError('the snapshot has invalid values')
+    sizes = (rows*cols*_ALIVE_TYPE.itemsize, 3*nbolts*_BOLT_TYPE.itemsize,
+             3*nalienbolts*_BOLT_TYPE.itemsize, _RNG_SIZE*_RNG_TYPE.itemsize)
+    if len(data) != SNAPSHOT_GAME.size + SNAPSHOT_WAVE.size + sum(sizes):
+        raise ValueError('the snapshot has the wrong size')
+
+    offset = SNAPSHOT_GAME.size + SNAPSHOT_WAVE.size
+    arrays = []
+    for (size, dtype) in zip(sizes, (_ALIVE_TYPE, _BOLT_TYPE, _BOLT_TYPE, _RNG_TYPE)):
+        arrays.append(np.frombuffer(data[offset:offset+size], dtype))
+        offset += size
+    alive, bolts, alienbolts, key = arrays
+    numbers = np.array((shipx, prevshipx, offx, offy, prevoffx, prevoffy, time, gauss))
+    if (alive.max() > 1 or key[-1] > _RNG_SIZE-1 or not np.isfinite(numbers).all()
+            or not np.isfinite(bolts).all() or not np.isfinite(alienbolts).all()):
+        raise ValueError('the snapshot has invalid values')
+
+    mask = int.from_bytes(np.packbits(alive, bitorder='little').tobytes(), 'little')
+    flag = {name: (flags >> bit) & 1 == 1 for (bit, name) in enumerate(SNAPSHOT_FLAGS)}
+    wave = (shipx if flag['shipx'] else None,
+            prevshipx if flag['prevshipx'] else None, (offx, offy, mask),
+            (prevoffx, prevoffy), tuple(map(tuple, bolts.reshape(-1, 3).tolist())),
+            tuple(map(tuple, alienbolts.reshape(-1, 3).tolist())), direction, time,
+            flag['moved'], tofire, lives, score,
+            (3, tuple(key.tolist()), gauss if flag['gauss'] else None))
+    return (seed, state, wave)
+
+
+def newSeed():
+    """
+    Returns a new seed for the random number generator of a wave
+
+    The seed is taken from the module random, so seeding that module also fixes the
+    seeds of the waves that are made without one.
+    """
+    return random.getrandbits(32)
+
+
+def interpolate(previous, current, alpha):
+    """
+    Returns the value a fraction alpha of the way from previous to current
+
+    Parameter previous: The value at the start of a step
+    Precondition: previous is a number (int or float)
+
+    Parameter current: The value at the end of a step
+    Precondition: current is a number (int or float)
+
+    Parameter alpha: The fraction of the step
+    Precondition: alpha is a number in 0..1
+    """
+    return previous + alpha * (current - previous)
+
+
+def alienScore(row):
+    """
+    Returns the points for destroying an alien in the given row
+
+    The aliens in the rows further from the ship are worth more points.
+
+    Parameter row: The row of the alien (0 is the top row)
+    Precondition: row is an int in 0..ALIEN_ROWS-1
+    """
+    if row % 6 == 0:
+        return 30
+    elif (row-1) % 6 == 0 or (row-2) % 6 == 0:
+        return 20
+    return 10
+
+
+def _shipBox(x, config):
+    """
+    Returns the edges (left, bottom, right, top) of the ship at the given x-coordinate
+
+    Parameter x: The x-coordinate of the ship
+    Precondition: x is a number (int or float)
+
+    Parameter config: The configuration of the game
+    Precondition: config is a Config
+    """
+    return (x - config.SHIP_WIDTH/2, config.SHIP_BOTTOM - config.SHIP_HEIGHT/2,
+            x + config.SHIP_WIDTH/2, config.SHIP_BOTTOM + config.SHIP_HEIGHT/2)
+
+
+def _sweptBox(bolt, config):
+    """
+    Returns the edges (left, bottom, right, top) of the box covered by a bolt in a step,
+    from its position at the start of the step to its current one
+
+    Parameter bolt: The position of the bolt
+    Precondition: bolt is a list [x, y, y at the start of the step] of numbers
+
+    Parameter config: The configuration of the game
+    Precondition: config is a Config
+    """
+    return (bolt[0] - config.BOLT_WIDTH/2, min(bolt[1], bolt[2]) - config.BOLT_HEIGHT/2,
+            bolt[0] + config.BOLT_WIDTH/2, max(bolt[1], bolt[2]) + config.BOLT_HEIGHT/2)
@@ -57,7 +57,10 @@ class Ship(GImage):
 
     posx : The x coordinate of the position of the ship. Value is int or a float.
             
-    """    
+    """
+
+    __slots__ = ()
+
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
 
     def getPosx(self):
@@ -107,18 +110,7 @@ class Ship(GImage):
         Parameter alienBolt: The laser alienbolt to check
         Precondition: bolt is of class Bolt
         """
-        top_left = self.contains((
-            alienBolt.x - BOLT_WIDTH/2, alienBolt.y + BOLT_HEIGHT/2))
-        top_right = self.contains((
-            alienBolt.x + BOLT_WIDTH/2, alienBolt.y + BOLT_HEIGHT/2))
-        bottom_right = self.contains((
-            alienBolt.x + BOLT_WIDTH/2, alienBolt.y - BOLT_HEIGHT/2))
-        bottom_left = self.contains((
-            alienBolt.x - BOLT_WIDTH/2, alienBolt.y - BOLT_HEIGHT/2))
-
-        determine_hit_ship = top_left or top_right or bottom_left or bottom_right
-
-        return determine_hit_ship
+        return self.overlaps(alienBolt)
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
 class Alien(GImage):
@@ -146,6 +138,9 @@ class Alien(GImage):
 
     APosy: y-coordinate of the position of the alien  [int or float >= 0]
     """
+
+    __slots__ = ()
+
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     
     def getAPosx(self):
@@ -203,18 +198,7 @@ class Alien(GImage):
         Precondition: bolt is of class Bolt
         """
 
-        top_left = self.contains((
-            bolt.x - BOLT_WIDTH/2, bolt.y + BOLT_HEIGHT/2))
-        top_right = self.contains((
-            bolt.x + BOLT_WIDTH/2, bolt.y + BOLT_HEIGHT/2))
-        bottom_right = self.contains((
-            bolt.x + BOLT_WIDTH/2, bolt.y - BOLT_HEIGHT/2))
-        bottom_left = self.contains((
-            bolt.x - BOLT_WIDTH/2, bolt.y - BOLT_HEIGHT/2))
-
-        determine_hit = top_left or top_right or bottom_left or bottom_right
-        #print(determine_hit)
-        return determine_hit
+        return self.overlaps(bolt)
     
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
@@ -246,11 +230,22 @@ class Bolt(GRectangle):
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
         Y: The y-coordinate of the bolt [int or float]
     """
+
+    __slots__ = ('_velocity',)
     
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)   
     def getX(self):
         return self.x
 
+    def setX(self, value):
+        """
+        Sets the x-coordinate of the bolt.
+
+        Parameter: x coordinate
+        Precondition: Value is int or a float
+        """
+        self.x = value
+
     def getY(self):
         """
         Returns: The y-coordinate of the bolt
@@ -328,6 +323,9 @@ class DLine(GPath):
     """
     Class representing the defense line
     """
+
+    __slots__ = ()
+
     def __init__(self, points, linecolor, linewidth):
         super().__init__(points = points, linecolor = linecolor, 
             linewidth = linewidth)
@@ -342,7 +340,24 @@ class alienBolt(GRectangle):
         Y: The y-coordinate of the bolt [int or float]
     """
 
+    __slots__ = ('_velocity',)
+
     # Getters and Setters
+    def getX(self):
+        """
+        Returns: The x-coordinate of the bolt
+        """
+        return self.x
+
+    def setX(self, value):
+        """
+        Sets the x-coordinate of the bolt.
+
+        Parameter: x coordinate
+        Precondition: Value is int or a float
+        """
+        self.x = value
+
     def getY(self):
         """
         Returns: The y-coordinate of the bolt
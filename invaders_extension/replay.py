@@ -0,0 +1,647 @@
+"""
+Replay module for Alien Invaders
+
+This module contains the classes to record the input of a game and to play it back
+without any graphics.
+
+A game only depends on its seed (see headless.py), on the time of each update and on
+the keys held down at each update.  An InputRecorder keeps all three, so a game
+played in the window can be played again by a HeadlessGame, frame for frame, with
+the same result:
+
+    recorder = InputRecorder(seed)
+    ...
+    recorder.record(dt, input)      # once per update, before the update
+    ...
+    game = replay(recorder)
+
+Only the keys that the game tests are recorded.  Any other key is recorded as the
+key OTHER_KEY, since it still counts as a key press when the game starts.
+
+A long session can also be recorded to a file.  A ReplayWriter has the same methods
+as an InputRecorder, but it writes the updates to disk instead of keeping them, and
+a ReplayReader reads them back.  The file is a header, then records, then a footer:
+
+    header:   MAGIC, the format version, the seed, ALIEN_ROWS, ALIENS_IN_ROW and
+              ALIEN_SPEED (see HEADER)
+    run:      the keys as a bitfield (bit i for GAME_KEYS[i], bit 6 for OTHER_KEY),
+              the time of an update and the number of updates in a row with that
+              time and those keys (see RUN)
+    keyframe: KEYFRAME_TAG, the number of updates before it and the size of the
+              snapshot (see KEYFRAME), followed by the snapshot (see packState)
+    footer:   the tick and the offset of every keyframe (see INDEX_ENTRY), then
+              the offset of the first entry, the number of entries and INDEX_MAGIC
+              (see TRAILER)
+
+Keys are usually held for many updates, and with a fixed tick rate the time never
+changes, so a run covers many updates and an hour of play is a few kilobytes.
+
+A recorder asks for a keyframe every KEYFRAME_INTERVAL updates.  To reach a late
+update, ReplayReader.seek starts from the last keyframe before it, found with the
+footer, and only plays the updates after that keyframe.
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from headless import *
+import bisect
+import mmap
+import queue
+import struct
+import threading
+
+# PRIMARY RULE: This module may only access consts.py, config.py and headless.py.  It
+# must never import game2d, models.py or anything else that needs Kivy.
+
+# The keys that the game tests, in the order they are recorded
+GAME_KEYS = ('left', 'right', 'up', 's', 'n', 'm')
+
+# The key that stands for every key not in GAME_KEYS
+OTHER_KEY = 'other'
+
+# The first bytes of every replay file
+MAGIC = b'AIRP'
+
+# The version of the replay file format
+FORMAT_VERSION = 4
+
+# The layout of the header: magic, format, seed, rows, columns, speed
+HEADER = struct.Struct('<4sHIHHd')
+
+# The layout of a run: keys, time of an update, number of updates
+RUN = struct.Struct('<BdI')
+
+# The first byte of a keyframe, which is never the first byte of a run
+KEYFRAME_TAG = 0xFF
+
+# The layout of the start of a keyframe: KEYFRAME_TAG, tick, size of the snapshot
+KEYFRAME = struct.Struct('<BQI')
+
+# The layout of an entry in the seek index: tick, offset of the keyframe
+INDEX_ENTRY = struct.Struct('<QQ')
+
+# The layout of the end of the file: offset of the index, number of entries, magic
+TRAILER = struct.Struct('<QI4s')
+
+# The last bytes of a replay file with a seek index
+INDEX_MAGIC = b'AIRX'
+
+# The number of updates between two keyframes (one minute at TICK_RATE)
+KEYFRAME_INTERVAL = 60 * TICK_RATE
+
+# The number of bytes a ReplayWriter collects before it hands them to its thread
+BUFFER_SIZE = 1 << 16
+
+# The keys for each bitfield, so that reading a run does not loop over the bits
+_KEYS_OF = [tuple(key for (bit, key) in enumerate(GAME_KEYS + (OTHER_KEY,))
+                  if (bits >> bit) & 1) for bits in range(1 << (len(GAME_KEYS)+1))]
+
+
+class InputRecorder(object):
+    """
+    A class to record the input of a game, one update at a time.
+
+    INSTANCE ATTRIBUTES:
+        _seed:  the seed of the wave being recorded [int >= 0]
+        _ticks: the time and keys of each update, in order
+                [list of (number, tuple of str) pairs, possibly empty]
+        _keyframes: the snapshot after each multiple of KEYFRAME_INTERVAL updates
+                [dict of int to bytes, possibly empty]
+
+    The keys of a tick are the keys in GAME_KEYS held down at that update (in the
+    order of GAME_KEYS), followed by OTHER_KEY if any other key was held down.
+    """
+
+    # GETTERS
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave being recorded
+        """
+        return self._seed
+
+    def getTicks(self):
+        """
+        Returns the list of (dt, keys) pairs recorded so far
+
+        This list is part of the recorder and must not be changed.
+        """
+        return self._ticks
+
+    # INITIALIZER
+
+    def __init__(self, seed):
+        """
+        Initializer: Creates a recorder with no updates
+
+        Parameter seed: The seed of the wave being recorded
+        Precondition: seed is an int >= 0
+        """
+        assert type(seed) == int and seed >= 0
+        self._seed = seed
+        self._ticks = []
+        self._keyframes = {}
+
+    # PUBLIC METHODS
+
+    def record(self, dt, input):
+        """
+        Records the time and the keys of the next update
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+
+        Parameter input: The keys held down during this update
+        Precondition: input has the method is_key_down and the attribute key_count
+        """
+        self._ticks.append((dt, keyState(input)))
+
+    def tickCount(self):
+        """
+        Returns the number of updates recorded so far
+        """
+        return len(self._ticks)
+
+    def needsKeyframe(self):
+        """
+        Returns True if a keyframe should be recorded before the next update
+        """
+        return needsKeyframe(self.tickCount())
+
+    def keyframe(self, data):
+        """
+        Records the state of the game before the next update
+
+        Parameter data: The state of the game
+        Precondition: data is a snapshot made by packState
+        """
+        self._keyframes[self.tickCount()] = data
+
+    def getKeyframe(self, tick):
+        """
+        Returns the snapshot recorded after the given number of updates, or None if
+        there is no keyframe there
+
+        Parameter tick: The number of updates
+        Precondition: tick is an int >= 0
+        """
+        return self._keyframes.get(tick)
+
+    def close(self):
+        """
+        Ends the recording
+
+        This method does nothing, since the updates are kept in memory.  It is here so
+        that an InputRecorder can be used wherever a ReplayWriter is.
+        """
+        pass
+
+
+class ReplayWriter(object):
+    """
+    A class to record the input of a game to a replay file, one update at a time.
+
+    The updates are packed into runs as they are recorded.  The runs are collected
+    in a buffer, and once the buffer is full it is written to the file by a separate
+    thread, so that recording never waits for the disk.  The last run, the rest of
+    the buffer and the seek index are only written by close, which must be called at
+    the end.
+
+    INSTANCE ATTRIBUTES:
+        _seed:   the seed of the wave being recorded [int >= 0]
+        _file:   the replay file [binary file open for writing, or None if closed]
+        _bits:   the keys of the current run [int in 0..127, or None if no updates]
+        _dt:     the time of an update in the current run [number]
+        _count:  the number of updates in the current run [int >= 0]
+        _ticks:  the number of updates recorded so far [int >= 0]
+        _buffer: the records not yet handed to the thread [bytearray]
+        _offset: the offset in the file of the end of _buffer [int >= HEADER.size]
+        _index:  the tick and the offset of each keyframe recorded so far
+                 [list of (int, int) pairs, possibly empty]
+        _queue:  the buffers waiting to be written, then None when closed [queue.Queue]
+        _thread: the thread that writes the buffers [threading.Thread]
+    """
+
+    # GETTERS
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave being recorded
+        """
+        return self._seed
+
+    # INITIALIZER
+
+    def __init__(self, path, seed):
+        """
+        Initializer: Creates a replay file with no updates, replacing any old file
+
+        Parameter path: The name of the replay file
+        Precondition: path is a str
+
+        Parameter seed: The seed of the wave being recorded
+        Precondition: seed is an int >= 0
+        """
+        assert type(seed) == int and seed >= 0
+        self._seed = seed
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, seed, ALIEN_ROWS,
+                                     ALIENS_IN_ROW, ALIEN_SPEED))
+        self._bits = None
+        self._dt = 0
+        self._count = 0
+        self._ticks = 0
+        self._buffer = bytearray()
+        self._offset = HEADER.size
+        self._index = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    # PUBLIC METHODS
+
+    def record(self, dt, input):
+        """
+        Records the time and the keys of the next update
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+
+        Parameter input: The keys held down during this update
+        Precondition: input has the method is_key_down and the attribute key_count
+        """
+        assert self._file is not None, 'the replay file is closed'
+        bits = keyBits(keyState(input))
+        if bits != self._bits or dt != self._dt or self._count == 0xFFFFFFFF:
+            self._endRun()
+            self._bits = bits
+            self._dt = dt
+        self._count += 1
+        self._ticks += 1
+
+    def tickCount(self):
+        """
+        Returns the number of updates recorded so far
+        """
+        return self._ticks
+
+    def needsKeyframe(self):
+        """
+        Returns True if a keyframe should be recorded before the next update
+        """
+        return needsKeyframe(self._ticks)
+
+    def keyframe(self, data):
+        """
+        Records the state of the game before the next update
+
+        Parameter data: The state of the game
+        Precondition: data is a snapshot made by packState
+        """
+        assert self._file is not None, 'the replay file is closed'
+        self._endRun()
+        self._index.append((self._ticks, self._offset))
+        self._append(KEYFRAME.pack(KEYFRAME_TAG, self._ticks, len(data)) + data)
+
+    def close(self):
+        """
+        Writes everything that is left, with the seek index, and closes the replay file
+
+        Nothing can be recorded after this.  Closing a closed writer does nothing.
+        """
+        if self._file is not None:
+            self._endRun()
+            where = self._offset
+            for entry in self._index:
+                self._buffer += INDEX_ENTRY.pack(*entry)
+            self._buffer += TRAILER.pack(where, len(self._index), INDEX_MAGIC)
+            self._queue.put(bytes(self._buffer))
+            self._queue.put(None)
+            self._thread.join()
+            self._file.close()
+            self._file = None
+
+    # HIDDEN METHODS
+
+    def _endRun(self):
+        """
+        Adds the current run (if any) to the buffer
+        """
+        if self._count > 0:
+            self._append(RUN.pack(self._bits, self._dt, self._count))
+            self._count = 0
+
+    def _append(self, record):
+        """
+        Adds a record to the buffer, and hands the buffer to the thread once it is full
+
+        Parameter record: The record
+        Precondition: record is a bytes object
+        """
+        self._buffer += record
+        self._offset += len(record)
+        if len(self._buffer) >= BUFFER_SIZE:
+            self._queue.put(bytes(self._buffer))
+            self._buffer = bytearray()
+
+    def _drain(self):
+        """
+        Writes the buffers in the queue to the file until the queue gives None
+
+        This method runs in the thread of the writer.
+        """
+        data = self._queue.get()
+        while data is not None:
+            self._file.write(data)
+            data = self._queue.get()
+        self._file.flush()
+
+
+class ReplayReader(object):
+    """
+    A class to read back a replay file made by a ReplayWriter.
+
+    The file is memory-mapped instead of read, and each record is only decoded when
+    the updates are played.  Opening a replay takes the same time no matter how long
+    the session was, and the file never has to fit in memory.
+
+    The seek index is read when the file is opened.  A file that was not closed (e.g.
+    because the game crashed) has no index; its updates can still be played, but it
+    cannot seek.
+
+    INSTANCE ATTRIBUTES:
+        _file:    the replay file [binary file open for reading, or None if closed]
+        _map:     the contents of the file [mmap.mmap]
+        _end:     the offset of the end of the records [int >= HEADER.size]
+        _index:   the tick and the offset of each keyframe, by tick
+                  [sorted list of (int, int) pairs, possibly empty]
+        _seed:    the seed of the recorded wave [int >= 0]
+        _rows:    the value of ALIEN_ROWS in the recorded game [int > 0]
+        _cols:    the value of ALIENS_IN_ROW in the recorded game [int > 0]
+        _speed:   the value of ALIEN_SPEED in the recorded game [float > 0]
+    """
+
+    # GETTERS
+
+    def getSeed(self):
+        """
+        Returns the seed of the recorded wave
+        """
+        return self._seed
+
+    def getConfig(self):
+        """
+        Returns the configuration of the recorded game
+
+        Only ALIEN_ROWS, ALIENS_IN_ROW and ALIEN_SPEED are recorded; the other values
+        are the ones in consts.py.
+        """
+        return Config(ALIEN_ROWS=self._rows, ALIENS_IN_ROW=self._cols,
+                      ALIEN_SPEED=self._speed)
+
+    def getKeyframes(self):
+        """
+        Returns the ticks of the keyframes, in order
+
+        The keyframe at tick n is the state of the game after n updates.
+        """
+        return [tick for (tick, offset) in self._index]
+
+    # INITIALIZER
+
+    def __init__(self, path):
+        """
+        Initializer: Opens a replay file
+
+        A ValueError is raised if the file is not a replay file of this format.
+
+        Parameter path: The name of the replay file
+        Precondition: path is a str naming a file that exists
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError('%s is not a replay file' % repr(path))
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError('%s is not a replay file' % repr(path))
+        magic, format, seed, rows, cols, speed = HEADER.unpack_from(self._map)
+        if magic != MAGIC or format != FORMAT_VERSION:
+            self.close()
+            raise ValueError('%s is not a replay file of version %d'
+                             % (repr(path), FORMAT_VERSION))
+
+        self._seed = seed
+        self._rows = rows
+        self._cols = cols
+        self._speed = speed
+        self._readIndex()
+
+    # PUBLIC METHODS
+
+    def matchesConfig(self):
+        """
+        Returns True if the recorded game has the same aliens as this one (the values
+        ALIEN_ROWS, ALIENS_IN_ROW and ALIEN_SPEED in consts.py)
+        """
+        return self.getConfig() == DEFAULT
+
+    def getTicks(self, offset=HEADER.size):
+        """
+        Returns an iterator over the (dt, keys) pairs of the recorded updates
+
+        The records are decoded as the iterator reaches them.
+
+        Parameter offset: The offset of the record to start from
+        Precondition: offset is HEADER.size or the offset of a record in the file
+
+        Precondition: the reader is not closed
+        """
+        assert self._file is not None, 'the replay file is closed'
+        while offset < self._end:
+            if self._map[offset] == KEYFRAME_TAG:
+                tag, tick, size = KEYFRAME.unpack_from(self._map, offset)
+                offset += KEYFRAME.size + size
+            else:
+                bits, dt, count = RUN.unpack_from(self._map, offset)
+                offset += RUN.size
+                keys = _KEYS_OF[bits]
+                for tick in range(count):
+                    yield (dt, keys)
+
+    def tickCount(self):
+        """
+        Returns the number of recorded updates
+
+        Precondition: the reader is not closed
+        """
+        assert self._file is not None, 'the replay file is closed'
+        total = 0
+        offset = HEADER.size
+        while offset < self._end:
+            if self._map[offset] == KEYFRAME_TAG:
+                tag, tick, size = KEYFRAME.unpack_from(self._map, offset)
+                offset += KEYFRAME.size + size
+            else:
+                bits, dt, count = RUN.unpack_from(self._map, offset)
+                offset += RUN.size
+                total += count
+        return total
+
+    def seek(self, tick):
+        """
+        Returns the HeadlessGame after the given number of recorded updates, and an
+        iterator over the updates after those
+
+        The game starts from the last keyframe at or before tick, so only the updates
+        between that keyframe and tick are played.
+
+        Parameter tick: The number of updates to play
+        Precondition: tick is an int in 0..tickCount()
+        """
+        assert type(tick) == int and tick >= 0
+        game = HeadlessGame(self._seed, self.getConfig())
+        offset = HEADER.size
+        start = 0
+        pos = bisect.bisect_right(self._index, (tick, self._end)) - 1
+        if pos >= 0:
+            start, offset = self._index[pos]
+            tag, start, size = KEYFRAME.unpack_from(self._map, offset)
+            offset += KEYFRAME.size
+            game.setSnapshot(self._map[offset:offset+size])
+            offset += size
+
+        ticks = self.getTicks(offset)
+        input = ReplayInput(ticks)
+        for update in range(tick - start):
+            dt = input.advance()
+            game.update(dt, input)
+        return (game, input)
+
+    def close(self):
+        """
+        Closes the replay file.  Closing a closed reader does nothing.
+        """
+        if self._file is not None:
+            self._map.close()
+            self._file.close()
+            self._file = None
+
+    # HIDDEN METHODS
+
+    def _readIndex(self):
+        """
+        Reads the seek index at the end of the file, if there is one
+        """
+        self._end = len(self._map)
+        self._index = []
+        if self._end >= HEADER.size + TRAILER.size:
+            where, count, magic = TRAILER.unpack_from(self._map, self._end - TRAILER.size)
+            if magic == INDEX_MAGIC:
+                self._index = [INDEX_ENTRY.unpack_from(self._map, where + i*INDEX_ENTRY.size)
+                               for i in range(count)]
+                self._end = where
+
+
+class ReplayInput(HeadlessInput):
+    """
+    A class to play back the keys recorded by an InputRecorder or a replay file.
+
+    Each call to advance holds down the keys of the next update.
+
+    INSTANCE ATTRIBUTES:
+        _ticks: the updates not yet played [iterator of (number, tuple of str) pairs]
+        _next:  the next update to play [(number, tuple of str) pair, or None if finished]
+    """
+
+    def __init__(self, ticks):
+        """
+        Initializer: Creates an input with no keys held down, before the first update
+
+        Parameter ticks: The recorded updates
+        Precondition: ticks is an iterable of (dt, keys) pairs, as in InputRecorder
+        """
+        super().__init__()
+        self._ticks = iter(ticks)
+        self._next = next(self._ticks, None)
+
+    def isFinished(self):
+        """
+        Returns True if every recorded update has been played
+        """
+        return self._next is None
+
+    def advance(self):
+        """
+        Holds down the keys of the next update, and returns the time of that update
+
+        Precondition: not isFinished()
+        """
+        assert not self.isFinished()
+        dt, keys = self._next
+        self.setKeys(keys)
+        self._next = next(self._ticks, None)
+        return dt
+
+
+# HELPER FUNCTIONS
+
+def keyState(input):
+    """
+    Returns the keys held down, as they are recorded by InputRecorder
+
+    Parameter input: The keys held down
+    Precondition: input has the method is_key_down and the attribute key_count
+    """
+    keys = tuple(key for key in GAME_KEYS if input.is_key_down(key))
+    if input.key_count > len(keys):
+        keys += (OTHER_KEY,)
+    return keys
+
+
+def needsKeyframe(tick):
+    """
+    Returns True if a keyframe should be recorded after the given number of updates
+
+    Parameter tick: The number of updates
+    Precondition: tick is an int >= 0
+    """
+    return tick > 0 and tick % KEYFRAME_INTERVAL == 0
+
+
+def keyBits(keys):
+    """
+    Returns the keys recorded for an update as a bitfield
+
+    Bit i is 1 if GAME_KEYS[i] is in keys, and bit 6 is 1 if OTHER_KEY is in keys.
+
+    Parameter keys: The keys recorded for an update
+    Precondition: keys is a tuple as returned by keyState
+    """
+    bits = 0
+    for (bit, key) in enumerate(GAME_KEYS + (OTHER_KEY,)):
+        if key in keys:
+            bits |= 1 << bit
+    return bits
+
+
+def replay(recorder):
+    """
+    Returns the HeadlessGame made by playing back a recorded game
+
+    The game is exactly the one that was recorded, after its last recorded update.
+
+    Parameter recorder: The recorded game
+    Precondition: recorder is an InputRecorder or a ReplayReader
+    """
+    config = recorder.getConfig() if isinstance(recorder, ReplayReader) else None
+    game = HeadlessGame(recorder.getSeed(), config)
+    input = ReplayInput(recorder.getTicks())
+    while not input.isFinished():
+        dt = input.advance()
+        game.update(dt, input)
+    return game
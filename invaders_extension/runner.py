@@ -0,0 +1,205 @@
+"""
+Parallel runner module for Alien Invaders
+
+This module plays many headless games at once, one game per task, on every core of
+the machine.  Each task is a seed and a configuration (a dict that changes some of
+the constants in config.NAMES), and each game is played by a simple bot (see
+chaseBot) until it is over or MAX_TICKS updates have passed:
+
+    tasks = [(seed, {'ALIEN_SPEED': 0.5}) for seed in range(1000)]
+    results = runGames(tasks)
+    print(results[:, FIELDS.index('won')].mean())
+
+The games are played in a pool of processes.  The workers do not send their results
+back through the pool; instead, every task owns one row of a table in shared memory,
+and the worker writes its metrics straight into that row.  Only the table is copied,
+once, when every game is over.
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from headless import *
+import multiprocessing
+import sys
+import numpy as np
+import time
+from multiprocessing import shared_memory
+try:
+    import resource
+except ImportError:     # Windows has no resource module
+    resource = None
+
+# PRIMARY RULE: This module may only access consts.py, config.py and headless.py.  It
+# must never import game2d, models.py or anything else that needs Kivy.
+
+# The metrics written for each game, in the order of the columns of the results
+# (seconds is the cpu time the worker spent on the game, so it does not depend on how
+# busy the machine is, and memory is the peak resident memory of the worker in
+# kilobytes, or 0 if unknown)
+FIELDS = ('seed', 'won', 'score', 'lives', 'aliens', 'ticks', 'seconds', 'memory')
+
+# The number of updates after which a game is stopped (one hour at TICK_RATE)
+MAX_TICKS = 3600 * TICK_RATE
+
+# The table of results in a worker, and the shared memory that holds it
+_results = None
+_memory = None
+
+# The tasks and the number of updates per game in a worker
+_tasks = None
+_maxticks = None
+
+
+def runGames(tasks, processes=None, maxticks=MAX_TICKS):
+    """
+    Returns a float array with one row per task and one column per name in FIELDS
+
+    Each task is played as a HeadlessGame with the given seed, where the constants in
+    the configuration replace the values in consts.py.  A game that is still going
+    after maxticks updates is stopped and counted as lost.
+
+    Parameter tasks: The games to play
+    Precondition: tasks is a nonempty list of (seed, config) pairs, where seed is an
+    int >= 0 and config is a dict of valid values for a Config
+
+    Parameter processes: The number of worker processes (one per core if None)
+    Precondition: processes is None or an int > 0
+
+    Parameter maxticks: The number of updates after which a game is stopped
+    Precondition: maxticks is an int > 0
+    """
+    assert len(tasks) > 0
+    for seed, config in tasks:
+        assert type(seed) == int and seed >= 0
+        assert set(config) <= set(NAMES), 'unknown constants in %s' % repr(config)
+
+    shape = (len(tasks), len(FIELDS))
+    memory = shared_memory.SharedMemory(create=True, size=8 * shape[0] * shape[1])
+    try:
+        with multiprocessing.Pool(processes, _attach,
+                                  (memory.name, shape, tasks, maxticks)) as pool:
+            for index in pool.imap_unordered(_play, range(len(tasks))):
+                pass
+            # Leaving the with statement stops the workers with SIGTERM, which they
+            # ignore if they inherited a handler for it (as SDL installs), so they
+            # are asked to exit first
+            pool.close()
+            pool.join()
+        result = np.ndarray(shape, dtype=float, buffer=memory.buf).copy()
+    finally:
+        memory.close()
+        memory.unlink()
+    return result
+
+
+def playGame(seed, config=None, maxticks=MAX_TICKS):
+    """
+    Returns the HeadlessGame played by chaseBot with the given seed, and the number of
+    updates it took
+
+    Parameter seed: The seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter config: The configuration of the game (the one in consts.py if None)
+    Precondition: config is None or a Config
+
+    Parameter maxticks: The number of updates after which the game is stopped
+    Precondition: maxticks is an int > 0
+    """
+    game = HeadlessGame(seed, config)
+    input = HeadlessInput()
+    ticks = 0
+    while not game.isComplete() and ticks < maxticks:
+        input.setKeys(chaseBot(game))
+        game.update(1/TICK_RATE, input)
+        ticks += 1
+    return (game, ticks)
+
+
+def chaseBot(game):
+    """
+    Returns the keys a simple bot holds down in the next update of a game
+
+    The bot always fires, moves under the first alien alive, starts the game and
+    presses 's' when the game is paused.
+
+    Parameter game: The game being played
+    Precondition: game is a HeadlessGame
+    """
+    if game.getState() == STATE_PAUSED:
+        return ('s',)
+    wave = game.getWave()
+    if wave is None or wave.getShipX() is None:
+        return ('up',)
+
+    target = wave.alienOneLeft()
+    movement = game.getConfig().SHIP_MOVEMENT
+    if target is None:
+        return ('up',)
+    if target[0] < wave.getShipX() - movement:
+        return ('up', 'left')
+    if target[0] > wave.getShipX() + movement:
+        return ('up', 'right')
+    return ('up',)
+
+
+# HIDDEN FUNCTIONS (RUN IN THE WORKERS)
+
+def _attach(name, shape, tasks, maxticks):
+    """
+    Attaches a worker to the table of results in shared memory
+
+    Parameter name: The name of the shared memory
+    Precondition: name is a str
+
+    Parameter shape: The shape of the table
+    Precondition: shape is a pair (tasks, len(FIELDS))
+
+    Parameter tasks: The games to play
+    Precondition: tasks is a list of (seed, config) pairs, as in runGames
+
+    Parameter maxticks: The number of updates after which a game is stopped
+    Precondition: maxticks is an int > 0
+    """
+    global _results, _memory, _tasks, _maxticks
+    _memory = shared_memory.SharedMemory(name=name)
+    _results = np.ndarray(shape, dtype=float, buffer=_memory.buf)
+    _tasks = tasks
+    _maxticks = maxticks
+
+
+def _play(index):
+    """
+    Plays one task and writes its metrics into its row of the results
+
+    Parameter index: The index of the task
+    Precondition: index is an int in 0..len(_tasks)-1
+    """
+    seed, config = _tasks[index]
+    start = time.process_time()
+    game, ticks = playGame(seed, Config(**config), _maxticks)
+    seconds = time.process_time() - start
+
+    wave = game.getWave()
+    row = _results[index]
+    row[FIELDS.index('seed')] = seed
+    row[FIELDS.index('won')] = game.isWon()
+    row[FIELDS.index('score')] = wave.getScore()
+    row[FIELDS.index('lives')] = wave.getLives()
+    row[FIELDS.index('aliens')] = wave.countAlienAlive()
+    row[FIELDS.index('ticks')] = ticks
+    row[FIELDS.index('seconds')] = seconds
+    row[FIELDS.index('memory')] = _peakMemory()
+
+
+def _peakMemory():
+    """
+    Returns the peak resident memory of this process in kilobytes, or 0 if unknown
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':    # macOS counts in bytes
+        peak //= 1024
+    return peak
@@ -0,0 +1,254 @@
+"""
+Parameter sweep for Alien Invaders
+
+This module is a command line tool that plays many headless games for every point
+of a grid of configurations (see config.py), and reports how each point did.  For
+example,
+
+    python sweep.py --seeds 200 --set ALIEN_SPEED=0.5,0.75,1.0 --set BOLT_RATE=3,5
+
+plays 200 games (seeds 0..199) for each of the 6 pairs of values, on every core of
+the machine (see runner.py).  Each point of the grid becomes one row, with the values
+of the swept constants and these columns:
+
+    games:            the number of games played
+    win_rate:         the fraction of the games that were won
+    score:            the mean final score
+    duration:         the mean length of a game in simulated seconds
+    ticks_per_second: the number of updates simulated per second of cpu time of the
+                      workers (not of wall time, which depends on the other programs)
+    peak_memory:      the largest peak resident memory of a worker, in kilobytes
+
+The rows are printed, and written to a file with --out: a CSV file if its name ends
+in .csv, or a NumPy structured array if it ends in .npy.
+
+# Toshi Tokuyama (tt426)
+"""
+import sys
+
+# consts.py reads the size and speed of the aliens from sys.argv when it is imported,
+# so the options of this tool must be hidden from it first.  This is only done when
+# the tool is run; importing this module leaves sys.argv alone.
+if __name__ == '__main__':
+    _ARGV = sys.argv[1:]
+    sys.argv = sys.argv[:1]
+
+from consts import *
+from config import *
+from runner import *
+import argparse
+import csv
+import itertools
+import numpy as np
+
+# PRIMARY RULE: This module may only access consts.py, config.py and runner.py.  It
+# must never import game2d, models.py or anything else that needs Kivy.
+
+# The columns reported for each point of the grid, after the swept constants
+COLUMNS = ('games', 'win_rate', 'score', 'duration', 'ticks_per_second', 'peak_memory')
+
+
+def main(argv):
+    """
+    Runs the sweep given by the command line options
+
+    Parameter argv: The command line options
+    Precondition: argv is a list of str
+    """
+    parser = argparse.ArgumentParser(prog='sweep.py',
+                                     description='Plays headless games for every point '
+                                     'of a grid of configurations.')
+    parser.add_argument('--seeds', type=int, default=100,
+                        help='the number of games per point (default 100)')
+    parser.add_argument('--first', type=int, default=0,
+                        help='the first seed (default 0)')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=V1,V2',
+                        help='a constant and its values (may be given more than once)')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='the number of worker processes (default one per core)')
+    parser.add_argument('--maxticks', type=int, default=MAX_TICKS,
+                        help='the number of updates after which a game is stopped')
+    parser.add_argument('--out', default=None,
+                        help='the file to write the rows to (.csv or .npy)')
+    args = parser.parse_args(argv)
+
+    if args.seeds < 1 or args.first < 0 or args.maxticks < 1:
+        parser.error('--seeds and --maxticks must be > 0, and --first >= 0')
+    if args.processes is not None and args.processes < 1:
+        parser.error('--processes must be > 0')
+    if args.out is not None and not args.out.endswith(('.csv', '.npy')):
+        parser.error('--out must name a .csv or a .npy file')
+    try:
+        names, points = parseGrid(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+
+    rows = sweep(names, points, range(args.first, args.first+args.seeds),
+                 args.processes, args.maxticks)
+    printRows(names, rows)
+    if args.out is not None and args.out.endswith('.csv'):
+        writeCsv(args.out, names, rows)
+    elif args.out is not None:
+        np.save(args.out, toArray(names, rows))
+
+
+def parseGrid(options):
+    """
+    Returns the swept names and the points of the grid given by the --set options
+
+    The points are the tuples of the cartesian product of the values, in the order of
+    the names.  A ValueError is raised if an option is not a constant of a Config
+    with valid values.
+
+    Parameter options: The --set options
+    Precondition: options is a list of str of the form 'NAME=V1,V2,...'
+    """
+    names = []
+    values = []
+    for option in options:
+        name, sep, text = option.partition('=')
+        if not sep or name not in NAMES or name in names:
+            raise ValueError('%s does not set a new constant of config.py' % repr(option))
+        names.append(name)
+        values.append([_parseValue(name, value) for value in text.split(',')])
+
+    points = list(itertools.product(*values))
+    for point in points:
+        try:
+            Config(**dict(zip(names, point)))
+        except (TypeError, ValueError):
+            values = ['%s=%s' % (name, value) for (name, value) in zip(names, point)]
+            raise ValueError('%s is not a valid configuration' % ', '.join(values))
+    return (tuple(names), points)
+
+
+def sweep(names, points, seeds, processes=None, maxticks=MAX_TICKS):
+    """
+    Returns the rows of a sweep, one per point of the grid
+
+    Each row is a tuple with the values of the point, followed by one value per name
+    in COLUMNS.
+
+    Parameter names: The swept constants
+    Precondition: names is a tuple of names in NAMES
+
+    Parameter points: The points of the grid
+    Precondition: points is a nonempty list of tuples of valid values for names
+
+    Parameter seeds: The seeds played at every point
+    Precondition: seeds is a nonempty sequence of ints >= 0
+
+    Parameter processes: The number of worker processes (one per core if None)
+    Precondition: processes is None or an int > 0
+
+    Parameter maxticks: The number of updates after which a game is stopped
+    Precondition: maxticks is an int > 0
+    """
+    tasks = [(seed, dict(zip(names, point))) for point in points for seed in seeds]
+    results = runGames(tasks, processes, maxticks)
+
+    rows = []
+    for (index, point) in enumerate(points):
+        games = results[index*len(seeds):(index+1)*len(seeds)]
+        ticks = games[:, FIELDS.index('ticks')]
+        seconds = games[:, FIELDS.index('seconds')].sum()
+        rows.append(point + (len(games),
+                             games[:, FIELDS.index('won')].mean(),
+                             games[:, FIELDS.index('score')].mean(),
+                             ticks.mean()/TICK_RATE,
+                             ticks.sum()/seconds if seconds > 0 else 0.0,
+                             int(games[:, FIELDS.index('memory')].max())))
+    return rows
+
+
+def printRows(names, rows):
+    """
+    Prints the rows of a sweep as a table
+
+    Parameter names: The swept constants
+    Precondition: names is a tuple of names in NAMES
+
+    Parameter rows: The rows of the sweep
+    Precondition: rows is a list of tuples as returned by sweep
+    """
+    header = names + COLUMNS
+    table = [header] + [tuple(_formatValue(value) for value in row) for row in rows]
+    widths = [max(len(line[col]) for line in table) for col in range(len(header))]
+    for line in table:
+        print('  '.join(text.rjust(width) for (text, width) in zip(line, widths)))
+
+
+def writeCsv(path, names, rows):
+    """
+    Writes the rows of a sweep to a CSV file, with a header line
+
+    Parameter path: The name of the file
+    Precondition: path is a str
+
+    Parameter names: The swept constants
+    Precondition: names is a tuple of names in NAMES
+
+    Parameter rows: The rows of the sweep
+    Precondition: rows is a list of tuples as returned by sweep
+    """
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(names + COLUMNS)
+        writer.writerows(rows)
+
+
+def toArray(names, rows):
+    """
+    Returns the rows of a sweep as a NumPy structured array, with one field per column
+
+    Parameter names: The swept constants
+    Precondition: names is a tuple of names in NAMES
+
+    Parameter rows: The rows of the sweep
+    Precondition: rows is a list of tuples as returned by sweep
+    """
+    dtype = [(name, 'i8' if all(type(row[col]) == int for row in rows) else 'f8')
+             for (col, name) in enumerate(names)]
+    dtype += [('games', 'i8'), ('win_rate', 'f8'), ('score', 'f8'), ('duration', 'f8'),
+              ('ticks_per_second', 'f8'), ('peak_memory', 'i8')]
+    return np.array(rows, dtype=dtype)
+
+
+# HELPER FUNCTIONS
+
+def _parseValue(name, text):
+    """
+    Returns the value of a constant given on the command line, as an int if possible
+
+    A ValueError is raised if text is not a number.
+
+    Parameter name: The name of the constant
+    Precondition: name is in NAMES
+
+    Parameter text: The value as given
+    Precondition: text is a str
+    """
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError('%s is not a number for %s' % (repr(text), name))
+
+
+def _formatValue(value):
+    """
+    Returns a value of a row as text for printing
+
+    Parameter value: The value
+    Precondition: value is an int or a float
+    """
+    if isinstance(value, (float, np.floating)):
+        return '%.3f' % value if abs(value) < 1000 else '%.0f' % value
+    return str(value)
+
+
+if __name__ == '__main__':
+    main(_ARGV)
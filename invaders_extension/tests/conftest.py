@@ -0,0 +1,40 @@
+"""
+Test configuration for Alien Invaders
+
+The modules of the game import each other by name (from consts import *), so the
+folder of the game is put first on the path.  consts.py and Kivy both read the
+command line when they are imported, so the options of pytest are hidden from them.
+
+Run the tests from the folder of the game with
+
+    python -m pytest tests
+
+# Toshi Tokuyama (tt426)
+"""
+import os
+import sys
+import pytest
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+sys.argv = sys.argv[:1]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def nullbackend():
+    """
+    Sets game2d to the null backend, with the resource folders of the game
+
+    Models made with the Kivy backend need an OpenGL context, which the tests do not
+    have, so every test that makes a model must use this fixture.  Making a GameApp
+    sets the resource folders to the folder of its class, so they are set again for
+    every test.
+    """
+    import game2d
+    game2d.set_backend('null')
+    folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    game2d.GameApp.images = os.path.join(folder, 'Images')
+    game2d.GameApp.fonts = os.path.join(folder, 'Fonts')
+    game2d.GameApp.sounds = os.path.join(folder, 'Sounds')
+    return game2d
@@ -0,0 +1,64 @@
+"""
+Unit tests for app.py, on the null backend
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+import pytest
+
+pytestmark = pytest.mark.usefixtures('nullbackend')
+
+
+def run(script, record=True):
+    """
+    Returns the game after playing a script of keys on the null backend
+
+    Parameter script: The keys held down at each frame
+    Precondition: script is a list of tuples of str
+
+    Parameter record: Whether to record the input in memory
+    Precondition: record is a bool
+    """
+    import game2d
+    from app import Invaders
+    game2d.set_backend(game2d.NullBackend(frames=len(script), script=script))
+    Invaders.record = record
+    try:
+        game = Invaders(width=GAME_WIDTH, height=GAME_HEIGHT, tickrate=TICK_RATE)
+        game.run()
+    finally:
+        Invaders.record = False
+    return game
+
+
+SCRIPT = [()]*3 + [('a',)]*2 + [()]*2 + [('left', 'up')]*200 + [('right', 'up')]*400
+
+
+def test_save_matches_replayed_game():
+    from replay import replay
+    game = run(SCRIPT)
+    assert game.getRecorder().tickCount() == len(SCRIPT)
+    assert game.save()[1] != STATE_INACTIVE
+    assert game.save() == replay(game.getRecorder()).save()
+
+
+def test_records_only_when_asked():
+    game = run(SCRIPT, False)
+    assert game.getRecorder() is None
+    assert game.save()[1] != STATE_INACTIVE
+
+
+def test_restore_sets_saved_state():
+    from replay import ReplayInput
+    from headless import HeadlessGame
+    game = run(SCRIPT)
+    recorder = game.getRecorder()
+    past = HeadlessGame(recorder.getSeed())
+    input = ReplayInput(recorder.getTicks()[:300])
+    while not input.isFinished():
+        dt = input.advance()
+        past.update(dt, input)
+
+    game.restore(past.save())
+    assert game.save() == past.save()
+    assert game.getSnapshot() == past.getSnapshot()
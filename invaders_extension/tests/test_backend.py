@@ -0,0 +1,65 @@
+"""
+Unit tests for game2d/backend.py
+
+# Toshi Tokuyama (tt426)
+"""
+import pytest
+
+
+def test_incomplete_backend_cannot_be_made():
+    import game2d
+
+    class Viewless(game2d.Backend):
+        def make_input(self, app):
+            return None
+
+        def run(self, app):
+            pass
+
+        def stop(self, app):
+            pass
+
+    for backend in (game2d.Backend, game2d.HeadlessBackend, Viewless):
+        with pytest.raises(TypeError):
+            backend()
+
+
+def test_set_backend_by_name(nullbackend):
+    import game2d
+    assert isinstance(game2d.get_backend(), game2d.NullBackend)
+    assert not game2d.backend.is_retained() and not game2d.backend.is_audible()
+    game2d.set_backend('raster')
+    assert isinstance(game2d.get_backend(), game2d.RasterBackend)
+    with pytest.raises(ValueError):
+        game2d.set_backend('opengl')
+    with pytest.raises(TypeError):
+        game2d.set_backend(game2d.NullBackend)
+
+
+def test_null_backend_plays_script_and_counts_draws(nullbackend):
+    class Game(nullbackend.GameApp):
+        def start(self):
+            self.keys = []
+            self.box = nullbackend.GRectangle(x=10, y=10, width=5, height=5)
+
+        def update(self, dt):
+            self.keys.append(self.input.is_key_down('up'))
+            if self.input.is_key_down('q'):
+                self.stop()
+
+        def draw(self):
+            self.box.draw(self.view)
+            self.box.draw(self.view)
+
+    nullbackend.set_backend(nullbackend.NullBackend(frames=10, script=[(), ('up',)]))
+    game = Game(width=100, height=100)
+    game.run()
+    assert game.keys == [False, True] + [False]*8
+    assert game.view.frames == 10
+    assert game.view.draws == 20
+    assert game.view.counts == {'GRectangle': 20}
+
+    nullbackend.set_backend(nullbackend.NullBackend(script=[()]*3 + [('q',)]))
+    game = Game(width=100, height=100)
+    game.run()
+    assert len(game.keys) == 4
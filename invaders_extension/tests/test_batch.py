@@ -0,0 +1,71 @@
+"""
+Unit tests for batch.py
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from headless import *
+from batch import *
+import numpy as np
+
+
+# The keys held down for each bit of an action
+KEYS = ((ACTION_LEFT, 'left'), (ACTION_RIGHT, 'right'), (ACTION_FIRE, 'up'))
+
+
+def test_batch_matches_single_waves():
+    # The aliens of a batch fire with another generator, so their bolts are removed
+    rng = np.random.default_rng(4)
+    waves = BatchWave(8, seed=0)
+    singles = [HeadlessWave(seed) for seed in range(8)]
+    keys = HeadlessInput()
+    for frame in range(2000):
+        actions = rng.integers(0, 8, size=8)
+        waves.step(actions)
+        waves.getAlienBolts()[2][:] = False
+        for game in range(8):
+            keys.setKeys([key for bit, key in KEYS if actions[game] & bit])
+            singles[game].step(1/TICK_RATE, keys)
+            singles[game].getAlienBolts().clear()
+
+        for game in range(8):
+            wave = singles[game]
+            assert waves.getShipX()[game] == wave.getShipX()
+            assert (waves.getOffset()[0][game],
+                    waves.getOffset()[1][game]) == wave.getAliens().getOffset()
+            assert waves.getAlive()[game].tolist() == wave.getAliens().getAlive().tolist()
+            assert waves.getScore()[game] == wave.getScore()
+            assert waves.getBolts()[2][game] == (len(wave.getBolts()) == 1)
+    assert waves.getScore().sum() > 0
+
+
+def test_step_returns_copies():
+    waves = BatchWave(4, seed=1)
+    fire = np.full(4, ACTION_FIRE)
+    reward, score, done = waves.step(fire)
+    first = (score.copy(), done.copy())
+    for frame in range(3000):
+        waves.step(fire)
+    assert waves.getScore().any()
+    assert np.array_equal(score, first[0])
+    assert np.array_equal(done, first[1])
+
+
+def test_done_games_do_not_change():
+    waves = BatchWave(16, seed=2)
+    rng = np.random.default_rng(5)
+    frames = 0
+    while not waves.isDone().any() and frames < 100000:
+        waves.step(rng.integers(0, 8, size=16))
+        frames += 1
+    done = waves.isDone().copy()
+    score = waves.getScore().copy()
+    lives = waves.getLives().copy()
+    for frame in range(200):
+        reward, now, over = waves.step(np.full(16, ACTION_FIRE))
+        assert not reward[done].any()
+    assert np.array_equal(waves.getScore()[done], score[done])
+    assert np.array_equal(waves.getLives()[done], lives[done])
+    waves.reset(done)
+    assert not waves.isDone()[done].any()
+    assert (waves.getScore()[done] == 0).all()
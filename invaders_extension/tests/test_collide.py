@@ -0,0 +1,86 @@
+"""
+Unit tests for collide.py
+
+# Toshi Tokuyama (tt426)
+"""
+from collide import *
+import numpy as np
+
+
+def test_swept_hits_fast_bolt_cannot_tunnel():
+    # A bolt 2 high moves up 100 through a target 10 high at y=50
+    times = sweptHits([0], [110], 100, 2, 2, [0], [50], 10, 10)
+    assert times[0, 0] == 0.34
+    assert not np.isfinite(sweptHits([0], [110], 100, 2, 2, [20], [50], 10, 10)).any()
+
+
+def test_swept_hits_bolt_starting_inside_and_leaving():
+    # The bolt starts at y=50, inside the target, and ends above it at y=70
+    times = sweptHits([0], [70], 20, 2, 2, [0], [50], 10, 10)
+    assert times.tolist() == [[0.0]]
+    # The same for a bolt moving down
+    times = sweptHits([0], [30], -20, 2, 2, [0], [50], 10, 10)
+    assert times.tolist() == [[0.0]]
+
+
+def test_swept_hits_edges_and_still_bolts():
+    # A bolt that ends touching a target, or that started touching it, misses it
+    assert np.isinf(sweptHits([0], [44], 10, 2, 2, [0], [50], 10, 10)).all()
+    assert np.isinf(sweptHits([0], [66], 10, 2, 2, [0], [50], 10, 10)).all()
+    assert sweptHits([0], [45], 10, 2, 2, [0], [50], 10, 10)[0, 0] == 1.0 - 0.1
+    # A bolt that does not move hits what it overlaps at time 0
+    assert sweptHits([0, 0], [50, 80], 0, 2, 2, [0], [50], 10, 10).tolist() == \
+        [[0.0], [np.inf]]
+
+
+def test_swept_hits_include_overlaps_at_the_end_of_the_frame():
+    rng = np.random.default_rng(3)
+    bx, by = rng.uniform(0, 100, (2, 40))
+    tx, ty = rng.uniform(0, 100, (2, 30))
+    alive = rng.random(30) < 0.8
+    times = sweptHits(bx, by, 7, 4, 16, tx, ty, 33, 33, alive)
+    hits = np.abs(bx[:, None] - tx) < (4+33)/2
+    hits &= np.abs(by[:, None] - ty) < (16+33)/2
+    hits &= alive
+    assert np.isfinite(times[hits]).all()
+    assert ((times >= 0) & (times <= 1))[np.isfinite(times)].all()
+
+
+def test_resolve_swept_hits_takes_the_first_target_in_the_way():
+    times = np.array([[0.5, 0.2, np.inf],
+                      [0.1, np.inf, 0.3]])
+    assert resolveSweptHits(times) == [(0, 1), (1, 0)]
+    assert resolveSweptHits(np.zeros((0, 2))) == []
+
+
+def test_spatial_hash_query_finds_overlapping_boxes():
+    grid = SpatialHash(10, 10)
+    grid.insert('a', 1, 1, 4, 4)
+    grid.insert('b', 18, 8, 35, 12)
+    assert grid.query(2, 2, 3, 3) == {'a'}
+    assert grid.query(21, 11, 22, 11) == {'b'}
+    assert grid.query(50, 50, 60, 60) == set()
+
+
+def test_spatial_hash_remove_and_translate():
+    grid = SpatialHash(10, 10)
+    grid.insert('a', 1, 1, 4, 4)
+    grid.translate(100, 0)
+    assert grid.query(2, 2, 3, 3) == set()
+    assert grid.query(102, 2, 103, 3) == {'a'}
+    grid.remove('a', 101, 1, 104, 4)
+    assert grid.query(0, 0, 200, 200) == set()
+
+
+def test_formation_near_includes_every_overlapping_alien():
+    from formation import Formation
+    formation = Formation(5, 11, 30, 600, 40, 40, 33, 33)
+    formation.march(17, -45)
+    rng = np.random.default_rng(1)
+    for x, y in rng.uniform(0, 700, (200, 2)):
+        box = (x-2, y-8, x+2, y+8)
+        near = set(formation.near(*box).tolist())
+        for index in range(55):
+            left, bottom, right, top = formation.box(index)
+            if left < box[2] and box[0] < right and bottom < box[3] and box[1] < top:
+                assert index in near
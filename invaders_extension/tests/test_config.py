@@ -0,0 +1,43 @@
+"""
+Unit tests for config.py
+
+# Toshi Tokuyama (tt426)
+"""
+import consts
+from config import *
+import pytest
+
+
+def test_default_matches_consts():
+    for name in NAMES + DERIVED:
+        assert getattr(DEFAULT, name) == getattr(consts, name)
+
+
+def test_derived_follow_values():
+    config = Config(ALIEN_WIDTH=40, GAME_WIDTH=1000)
+    assert config.ADDING_ROW == 40 + config.ALIEN_H_SEP
+    assert config.BORDER_RIGHT == 1000 - 20 - config.ALIEN_H_SEP
+
+
+def test_replace_keeps_other_values():
+    config = Config(ALIEN_ROWS=3).replace(ALIEN_SPEED=0.5)
+    assert config == Config(ALIEN_ROWS=3, ALIEN_SPEED=0.5)
+    assert config != DEFAULT
+
+
+def test_rejects_unknown_names_and_types():
+    with pytest.raises(TypeError):
+        Config(SPEED=1)
+    with pytest.raises(TypeError):
+        Config(ALIEN_SPEED='fast')
+    with pytest.raises(TypeError):
+        Config(ALIEN_ROWS=2.0)
+
+
+def test_rejects_values_out_of_range():
+    with pytest.raises(ValueError):
+        Config(ALIEN_SPEED=-1)
+    with pytest.raises(ValueError):
+        Config(ALIEN_ROWS=0)
+    with pytest.raises(ValueError):
+        Config(BOLT_RATE=1)
@@ -0,0 +1,81 @@
+"""
+Unit tests for env.py
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from env import *
+import numpy as np
+import pytest
+
+
+def play(env, seed, actions):
+    """
+    Plays a game of an environment until it is over, and returns the observations
+    and the total reward
+
+    Parameter env: The environment
+    Precondition: env is an InvadersEnv
+
+    Parameter seed: The seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter actions: The seed of the actions
+    Precondition: actions is an int >= 0
+    """
+    rng = np.random.default_rng(actions)
+    observations = [env.reset(seed).copy()]
+    total = 0
+    done = False
+    while not done:
+        obs, reward, done, info = env.step(rng.integers(ACTIONS))
+        observations.append(obs.copy())
+        total += reward
+    assert total == info['score']
+    return (observations, total)
+
+
+def test_same_seed_and_actions_same_game():
+    first, score = play(InvadersEnv(), 3, 1)
+    again, total = play(InvadersEnv(), 3, 1)
+    assert total == score
+    assert len(again) == len(first)
+    assert all(np.array_equal(a, b) for a, b in zip(first, again))
+
+
+def test_observation_is_filled_in_place():
+    env = InvadersEnv(Config(ALIEN_ROWS=2, ALIENS_IN_ROW=3))
+    obs = env.reset(0)
+    assert env.getObservationSize() == FEATURES + 6 + 3*NEAREST_BOLTS
+    assert obs.dtype == np.float32
+    assert obs[OBS_SHIP_X] == pytest.approx(0.5)
+    assert obs[OBS_SHIP_ALIVE] == 1
+    assert obs[FEATURES:FEATURES+6].tolist() == [1]*6
+    again, reward, done, info = env.step(ACTION_FIRE)
+    assert again is obs
+    assert obs[OBS_BOLT_ON] == 1
+
+
+def test_observation_follows_the_wave():
+    env = InvadersEnv()
+    env.reset(5)
+    for step in range(400):
+        obs, reward, done, info = env.step(ACTION_LEFT | ACTION_FIRE)
+        wave = env.getWave()
+        aliens = wave.getAliens()
+        assert obs[OBS_OFFSET_X] == np.float32(aliens.getOffset()[0]/GAME_WIDTH)
+        assert obs[OBS_DIRECTION] == wave.getDirection()
+        assert obs[FEATURES:FEATURES+aliens.getAlive().size].tolist() == \
+            aliens.getAlive().tolist()
+        assert obs[-3*NEAREST_BOLTS+2::3].sum() == min(len(wave.getAlienBolts()),
+                                                        NEAREST_BOLTS)
+        if done:
+            break
+
+
+def test_step_after_done_fails():
+    env = InvadersEnv(Config(SHIP_LIVES=1))
+    play(env, 2, 0)
+    assert env.isDone()
+    with pytest.raises(RuntimeError):
+        env.step(0)
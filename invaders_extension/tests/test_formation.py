@@ -0,0 +1,131 @@
+"""
+Unit tests for formation.py
+
+# Toshi Tokuyama (tt426)
+"""
+from formation import *
+import numpy as np
+
+
+def make(rows=3, cols=4):
+    """
+    Returns a formation with the aliens 10 apart, the first one at (5, 100)
+
+    Parameter rows: The number of rows
+    Precondition: rows is an int > 0
+
+    Parameter cols: The number of aliens in a row
+    Precondition: cols is an int > 0
+    """
+    return Formation(rows, cols, 5, 100, 10, 10, 8, 6)
+
+
+def test_layout_is_row_major():
+    formation = make()
+    assert formation.getX().tolist() == [5, 15, 25, 35]*3
+    assert formation.getY().tolist() == [100]*4 + [90]*4 + [80]*4
+    assert formation.getRow().tolist() == [0]*4 + [1]*4 + [2]*4
+    assert formation.getAlive().all()
+
+
+def test_march_moves_offset_only():
+    formation = make()
+    x = formation.getX().copy()
+    formation.march(3, -2)
+    formation.march(1, 0)
+    assert formation.getOffset() == (4, -2)
+    assert np.array_equal(formation.getX(), x)
+    assert formation.position(5) == (19, 88)
+    assert formation.box(5) == (15, 85, 23, 91)
+
+
+def test_lowest_follows_kills():
+    formation = make()
+    assert [formation.lowest(col) for col in range(4)] == [8, 9, 10, 11]
+    formation.kill(9)
+    formation.kill(5)
+    assert formation.lowest(1) == 1
+    formation.kill(1)
+    assert formation.lowest(1) == -1
+    assert formation.getColumns() == [0, 2, 3]
+    formation.revive(5)
+    assert formation.lowest(1) == 5
+    assert formation.getColumns() == [0, 1, 2, 3]
+
+
+def test_edges_follow_kills_and_offset():
+    formation = make()
+    formation.march(2, -3)
+    assert (formation.mostleft(), formation.mostright(), formation.bottom()) == (7, 37, 77)
+    for index in (0, 4, 8, 11):
+        formation.kill(index)
+    assert (formation.mostleft(), formation.mostright()) == (17, 37)
+    for index in (3, 7):
+        formation.kill(index)
+    assert formation.mostright() == 27
+    for index in (9, 10):
+        formation.kill(index)
+    assert formation.bottom() == 87
+
+
+def check(formation, alive):
+    """
+    Checks every piece of bookkeeping of a formation against a recount
+
+    Parameter formation: The formation to check
+    Precondition: formation is a Formation
+
+    Parameter alive: Which aliens are alive, in row-major order
+    Precondition: alive is a list of bool of size rows*cols
+    """
+    rows = formation.getRows()
+    cols = formation.getCols()
+    indices = [index for index in range(rows*cols) if alive[index]]
+    assert formation.getAlive().tolist() == alive
+    assert formation.getMask() == sum(1 << index for index in indices)
+    assert formation.count() == len(indices)
+    assert formation.isEmpty() == (indices == [])
+    assert formation.isOneLeft() == (len(indices) == 1)
+    assert formation.first() == (indices[0] if indices else -1)
+    for row in range(rows):
+        assert formation.getRowMask(row) == sum(1 << col for col in range(cols)
+                                                if alive[row*cols+col])
+    for col in range(cols):
+        living = [row for row in range(rows) if alive[row*cols+col]]
+        assert formation.getColumnMask(col) == sum(1 << row for row in living)
+        assert formation.lowest(col) == (living[-1]*cols+col if living else -1)
+    assert formation.getColumns() == sorted(set(index % cols for index in indices))
+    assert formation._bottomrow == max([index // cols for index in indices], default=-1)
+    near = formation.near(-50, 0, 100, 150).tolist()
+    assert near == indices
+
+
+def test_kill_revive_restore_match_recount():
+    rng = np.random.default_rng(2)
+    formation = make(4, 5)
+    alive = [True]*20
+    saved = []
+    for move in range(400):
+        index = int(rng.integers(20))
+        if rng.random() < 0.6:
+            formation.kill(index)
+            alive[index] = False
+        else:
+            formation.revive(index)
+            alive[index] = True
+        check(formation, alive)
+        if move % 37 == 0:
+            saved.append((formation.save(), list(alive)))
+
+    for state, alive in reversed(saved):
+        formation.restore(state)
+        check(formation, alive)
+        assert formation.save() == state
+
+
+def test_kill_every_alien():
+    formation = make()
+    for index in range(12):
+        formation.kill(index)
+        formation.kill(index)
+    check(formation, [False]*12)
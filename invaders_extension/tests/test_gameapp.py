@@ -0,0 +1,59 @@
+"""
+Unit tests for the fixed ticks of game2d.GameApp, on the null backend
+
+# Toshi Tokuyama (tt426)
+"""
+import pytest
+
+
+@pytest.fixture
+def make(nullbackend):
+    """
+    Returns a function that makes a game recording its updates and draws
+    """
+    class Recorder(nullbackend.GameApp):
+        def start(self):
+            self.dts = []
+            self.alphas = []
+
+        def update(self, dt):
+            self.dts.append(dt)
+
+        def draw(self):
+            self.alphas.append(self.alpha)
+
+    def make(**keywords):
+        return Recorder(width=100, height=100, **keywords)
+    return make
+
+
+def test_tickrate_runs_fixed_updates(make, nullbackend):
+    nullbackend.set_backend(nullbackend.NullBackend(frames=30))
+    game = make(fps=60, tickrate=120)
+    game.run()
+    assert game.dts == [1/120]*60
+    assert len(game.alphas) == 30
+
+
+def test_slow_tickrate_interpolates(make, nullbackend):
+    nullbackend.set_backend(nullbackend.NullBackend(frames=4))
+    game = make(fps=60, tickrate=30)
+    game.run()
+    assert game.dts == [1/30]*2
+    assert game.alphas == pytest.approx([0.5, 0, 0.5, 0])
+
+
+def test_no_tickrate_updates_once_per_frame(make, nullbackend):
+    nullbackend.set_backend(nullbackend.NullBackend(frames=5))
+    game = make(fps=50)
+    game.run()
+    assert game.dts == [1/50]*5
+
+
+def test_long_frame_is_capped(make, nullbackend):
+    nullbackend.set_backend(nullbackend.NullBackend(frames=0))
+    game = make(fps=60, tickrate=60)
+    game.run()
+    game._refresh(1.0)
+    assert len(game.dts) == game.MAX_TICKS
+    assert 0 <= game.alpha < 1
@@ -0,0 +1,68 @@
+"""
+Unit tests for game2d/gobject.py, on the null backend
+
+# Toshi Tokuyama (tt426)
+"""
+import pytest
+
+pytestmark = pytest.mark.usefixtures('nullbackend')
+
+
+def test_objects_and_models_have_no_dict():
+    from game2d import GRectangle, GEllipse, GImage, GPath, GLabel, GScene
+    from models import Ship, Alien, Bolt, alienBolt, DLine
+    objects = [GRectangle(x=1, y=1, width=2, height=2), GEllipse(width=2, height=2),
+               GImage(width=2, height=2, source='ship.png'), GPath(points=[0, 0, 1, 1]),
+               GLabel(text='A'), GScene(children=[]),
+               Ship(1, 1, 2, 2, 'ship.png'), Alien(1, 1, 2, 2, 'alien1.png'),
+               Bolt(1, 1, 2, 2, (1, 0, 0, 1), 5), alienBolt(1, 1, 2, 2, (1, 0, 0, 1), 5),
+               DLine([0, 0, 1, 0], (0, 0, 0, 1), 2)]
+    for obj in objects:
+        assert not hasattr(obj, '__dict__'), type(obj).__name__
+        with pytest.raises(AttributeError):
+            obj.mistake = 1
+        assert not hasattr(obj._trans, '__dict__')
+        if obj.fillcolor is not None:
+            assert not hasattr(obj._fillcolor, '__dict__')
+
+
+def test_subclass_without_slots_keeps_a_dict():
+    from game2d import GRectangle
+
+    class Box(GRectangle):
+        pass
+
+    box = Box(x=1, y=1, width=2, height=2)
+    box.label = 'box'
+    assert box.__dict__ == {'label': 'box'}
+    assert (box.x, box.width) == (1, 2)
+
+
+def test_intersects_rect_and_overlaps():
+    from game2d import GRectangle
+    box = GRectangle(x=10, y=20, width=4, height=6)
+    assert box.intersects_rect(11, 22, 30, 30)
+    assert not box.intersects_rect(12, 0, 20, 40)
+    assert not box.intersects_rect(0, 23, 20, 40)
+    wide = GRectangle(x=10, y=20, width=100, height=1)
+    assert box.overlaps(wide) and wide.overlaps(box)
+    assert not box.overlaps(GRectangle(x=14, y=20, width=4, height=6))
+
+
+def test_cached_edges_follow_changes():
+    from game2d import GRectangle
+    box = GRectangle(x=10, y=20, width=4, height=6)
+    assert box.intersects_rect(9, 19, 10, 20)
+    box.x = 100
+    assert not box.intersects_rect(9, 19, 10, 20)
+    assert box.intersects_rect(99, 19, 100, 20)
+    box.y = 200
+    assert not box.intersects_rect(99, 19, 100, 20)
+    box.width = 300
+    assert box.intersects_rect(240, 199, 241, 200)
+    box.height = 100
+    assert box.intersects_rect(240, 245, 241, 246)
+    box.left = 0
+    assert box.intersects_rect(1, 245, 2, 246)
+    assert box.intersects_rect(299, 245, 301, 246)
+    assert not box.intersects_rect(300, 245, 301, 246)
@@ -0,0 +1,73 @@
+"""
+Unit tests for game2d/graster.py, on the null backend
+
+# Toshi Tokuyama (tt426)
+"""
+import os
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.usefixtures('nullbackend')
+
+# The folder of the images of the game
+IMAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Images')
+
+
+def test_rectangle_fills_its_pixels():
+    from game2d import GRaster, GRectangle
+    raster = GRaster(100, 50)
+    GRectangle(x=20, y=40, width=10, height=6, fillcolor=(1, 0, 0, 1)).draw(raster)
+    frame = raster.frame
+    assert frame.shape == (50, 100, 3)
+    red = np.all(frame == (255, 0, 0), axis=2)
+    assert red.sum() == 60
+    rows, cols = np.nonzero(red)
+    assert (rows.min(), rows.max(), cols.min(), cols.max()) == (7, 12, 15, 24)
+    assert (frame[~red] == 255).all()
+    raster.clear()
+    assert (raster.frame == 255).all()
+
+
+def test_pixels_are_packed_little_endian():
+    from game2d.graster import _pack, _PIXEL
+    assert _pack((1, 0.5, 0)) == 0xFF0080FF
+    assert _PIXEL.str == '<u4'
+
+
+def test_image_is_copied_at_its_size():
+    from game2d import GRaster, GImage
+    from PIL import Image
+    pixels = np.asarray(Image.open(os.path.join(IMAGES, 'ship.png')).convert('RGBA'))
+    rows, cols = pixels.shape[:2]
+    raster = GRaster(cols, rows, background=(0, 0, 0), images=IMAGES)
+    GImage(x=cols/2, y=rows/2, width=cols, height=rows, source='ship.png').draw(raster)
+
+    opaque = pixels[..., 3] == 255
+    clear = pixels[..., 3] == 0
+    assert opaque.any() and clear.any()
+    assert np.array_equal(raster.frame[opaque], pixels[opaque][:, :3])
+    assert (raster.frame[clear] == 0).all()
+
+
+def test_image_modes_are_read_as_rgba(tmp_path):
+    from game2d import GRaster
+    from PIL import Image
+    gray = Image.new('LA', (4, 2), (200, 255))
+    gray.save(str(tmp_path / 'gray.png'))
+    palette = Image.new('P', (4, 2), 1)
+    palette.putpalette([0, 0, 0, 10, 20, 30])
+    palette.save(str(tmp_path / 'palette.png'))
+    raster = GRaster(10, 10, images=str(tmp_path))
+    raster.flush()
+    assert raster._load('gray.png').tolist() == [[[200, 200, 200, 255]]*4]*2
+    assert raster._load('palette.png').tolist() == [[[10, 20, 30, 255]]*4]*2
+
+
+def test_missing_image_fails(tmp_path):
+    from game2d import GRaster, GImage
+    raster = GRaster(100, 100, images=str(tmp_path))
+    raster.flush()
+    image = GImage(x=50, y=50, width=10, height=10, source='ship.png')
+    with pytest.raises(IOError):
+        image.draw(raster)
+    raster.flush()
@@ -0,0 +1,174 @@
+"""
+Unit tests for headless.py
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from headless import *
+import pickle
+import random
+import pytest
+
+
+def play(wave, frames, seed):
+    """
+    Plays a number of frames of a wave with random keys, and returns the saved states
+
+    Parameter wave: The wave to play
+    Precondition: wave is a HeadlessWave
+
+    Parameter frames: The number of frames
+    Precondition: frames is an int >= 0
+
+    Parameter seed: The seed of the keys
+    Precondition: seed is an int >= 0
+    """
+    rng = random.Random(seed)
+    keys = HeadlessInput()
+    states = []
+    for frame in range(frames):
+        keys.setKeys([key for key in ('left', 'right', 'up') if rng.random() < 0.5])
+        wave.step(1/TICK_RATE, keys)
+        wave.restoreShip()
+        states.append(wave.save())
+    return states
+
+
+def test_same_seed_same_game():
+    assert play(HeadlessWave(3), 600, 1) == play(HeadlessWave(3), 600, 1)
+
+
+def test_seed_changes_alien_fire():
+    assert play(HeadlessWave(3), 600, 1) != play(HeadlessWave(4), 600, 1)
+
+
+def test_ship_stays_on_screen():
+    wave = HeadlessWave(0)
+    keys = HeadlessInput(['left'])
+    for frame in range(1000):
+        wave.beginStep()
+        wave.updateShip(keys)
+    assert wave.getShipX() - SHIP_WIDTH/2 >= -SHIP_MOVEMENT
+    assert wave.getShipX() - SHIP_WIDTH/2 < 0
+
+
+def test_aliens_march_after_alien_speed():
+    wave = HeadlessWave(0)
+    wave.updateAlien(0)
+    start = wave.getAliens().getOffset()
+    wave.updateAlien(ALIEN_SPEED/2)
+    assert wave.getAliens().getOffset() == start
+    wave.updateAlien(ALIEN_SPEED/2 + 1e-6)
+    assert wave.getAliens().getOffset() == (start[0] + ALIEN_H_WALK, start[1])
+
+
+def test_one_player_bolt_at_a_time():
+    wave = HeadlessWave(0)
+    keys = HeadlessInput(['up'])
+    wave.updateBolts(keys)
+    wave.updateBolts(keys)
+    assert len(wave.getBolts()) == 1
+    assert wave.getBolts()[0][1] == SHIP_BOTTOM + SHIP_HEIGHT/2 + 2*BOLT_SPEED
+
+
+def test_bolt_kills_alien_and_scores():
+    wave = HeadlessWave(0)
+    aliens = wave.getAliens()
+    index = aliens.lowest(0)
+    x, y = aliens.position(index)
+    wave.getBolts().append([x, y, y])
+    assert wave.collision() == 1
+    assert not aliens.isAlive(index)
+    assert wave.getBolts() == []
+    assert wave.getScore() == alienScore(index // aliens.getCols())
+
+
+def test_alien_bolt_destroys_ship():
+    wave = HeadlessWave(0)
+    wave.getAlienBolts().append([wave.getShipX(), SHIP_BOTTOM, SHIP_BOTTOM])
+    assert wave.collisionShip()
+    assert wave.loseRound()
+    assert wave.getAlienBolts() == []
+    wave.restoreShip()
+    assert wave.getShipX() == GAME_WIDTH/2
+
+
+def test_game_starts_on_key_and_completes():
+    game = HeadlessGame(5, Config(ALIEN_ROWS=1, ALIENS_IN_ROW=1))
+    keys = HeadlessInput()
+    game.update(1/TICK_RATE, keys)
+    assert game.getState() == STATE_INACTIVE
+    keys.setKeys(['up'])
+    frames = 0
+    while not game.isComplete() and frames < 20000:
+        if game.getState() == STATE_PAUSED:
+            keys.setKeys(['s'])
+        else:
+            keys.setKeys(['up'])
+        game.update(1/TICK_RATE, keys)
+        frames += 1
+    assert game.isComplete()
+
+
+def test_alien_score_by_row():
+    assert [alienScore(row) for row in range(7)] == [30, 20, 20, 10, 10, 10, 30]
+
+
+def test_interpolate_between_steps():
+    assert interpolate(10, 20, 0) == 10
+    assert interpolate(10, 20, 0.25) == 12.5
+    assert interpolate(10, 20, 1) == 20
+
+
+def test_wave_positions_between_steps():
+    wave = HeadlessWave(0)
+    wave.updateAlien(0)
+    wave.beginStep()
+    start = wave.getAliens().getOffset()
+    wave.updateShip(HeadlessInput(['right']))
+    wave.updateAlien(ALIEN_SPEED + 1e-6)
+    assert wave.shipXAt(0) == GAME_WIDTH/2
+    assert wave.shipXAt(0.5) == GAME_WIDTH/2 + SHIP_MOVEMENT/2
+    assert wave.offsetAt(0) == start
+    assert wave.offsetAt(1) == wave.getAliens().getOffset()
+
+
+def test_restore_continues_the_same_game():
+    wave = HeadlessWave(8)
+    play(wave, 300, 2)
+    state = wave.save()
+    later = play(wave, 300, 3)
+    wave.restore(state)
+    assert wave.save() == state
+    assert play(wave, 300, 3) == later
+    assert play(HeadlessWave(8), 300, 2)[-1] == state
+
+
+def test_snapshot_continues_the_same_game():
+    game = HeadlessGame(6)
+    keys = HeadlessInput(['up', 'left'])
+    for frame in range(400):
+        game.update(1/TICK_RATE, keys)
+    copy = HeadlessGame(6)
+    copy.setSnapshot(game.getSnapshot())
+    assert copy.save() == game.save()
+    for frame in range(400):
+        game.update(1/TICK_RATE, keys)
+        copy.update(1/TICK_RATE, keys)
+    assert copy.save() == game.save()
+
+
+def test_malformed_snapshot_is_rejected():
+    game = HeadlessGame(6)
+    game.update(1/TICK_RATE, HeadlessInput(['up']))
+    snapshot = game.getSnapshot()
+    state = game.save()
+    bad = [b'', snapshot[:-1], snapshot + b'\0',
+           bytes([SNAPSHOT_VERSION+1]) + snapshot[1:], pickle.dumps(state)]
+    for data in bad:
+        with pytest.raises(ValueError):
+            game.setSnapshot(data)
+    with pytest.raises(ValueError):
+        HeadlessGame(6, Config(ALIEN_ROWS=2)).setSnapshot(snapshot)
+    assert game.save() == state
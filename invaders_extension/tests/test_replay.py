@@ -0,0 +1,182 @@
+"""
+Unit tests for replay.py
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from headless import *
+from replay import *
+import random
+import pytest
+
+
+def play(recorder, frames, seed):
+    """
+    Plays and records a number of frames of a game with random keys, and returns the
+    game
+
+    A keyframe is recorded whenever the recorder asks for one, as in Invaders.update.
+
+    Parameter recorder: The recorder of the game
+    Precondition: recorder is an InputRecorder or a ReplayWriter
+
+    Parameter frames: The number of frames
+    Precondition: frames is an int >= 0
+
+    Parameter seed: The seed of the keys
+    Precondition: seed is an int >= 0
+    """
+    rng = random.Random(seed)
+    game = HeadlessGame(recorder.getSeed())
+    keys = HeadlessInput()
+    held = []
+    for frame in range(frames):
+        if rng.random() < 0.05:
+            held = [key for key in ('left', 'right', 'up', 's', 'x') if rng.random() < 0.4]
+        keys.setKeys(held)
+        if recorder.needsKeyframe():
+            recorder.keyframe(game.getSnapshot())
+        recorder.record(1/TICK_RATE, keys)
+        game.update(1/TICK_RATE, keys)
+    return game
+
+
+def test_key_state_keeps_game_keys_in_order():
+    assert keyState(HeadlessInput(['up', 'left'])) == ('left', 'up')
+    assert keyState(HeadlessInput(['x', 'up', 'y'])) == ('up', OTHER_KEY)
+    assert keyState(HeadlessInput()) == ()
+
+
+def test_recorder_keeps_every_update():
+    recorder = InputRecorder(7)
+    recorder.record(0.5, HeadlessInput(['right']))
+    recorder.record(0.25, HeadlessInput(['q']))
+    assert recorder.getSeed() == 7
+    assert recorder.tickCount() == 2
+    assert recorder.getTicks() == [(0.5, ('right',)), (0.25, (OTHER_KEY,))]
+
+
+def test_replay_matches_recorded_game():
+    recorder = InputRecorder(11)
+    game = play(recorder, 3000, 1)
+    assert game.getState() != STATE_INACTIVE
+    assert replay(recorder).save() == game.save()
+
+
+def test_file_matches_recorder(tmp_path):
+    path = str(tmp_path / 'game.rpl')
+    recorder = InputRecorder(11)
+    writer = ReplayWriter(path, 11)
+    play(recorder, 3000, 1)
+    game = play(writer, 3000, 1)
+    writer.close()
+
+    reader = ReplayReader(path)
+    try:
+        assert reader.getSeed() == 11
+        assert reader.matchesConfig()
+        assert reader.tickCount() == 3000
+        assert list(reader.getTicks()) == recorder.getTicks()
+        assert replay(reader).save() == game.save()
+    finally:
+        reader.close()
+
+
+def test_runs_pack_repeated_updates(tmp_path):
+    path = str(tmp_path / 'game.rpl')
+    writer = ReplayWriter(path, 0)
+    for tick in range(1000):
+        writer.record(1/TICK_RATE, HeadlessInput(['left'] if tick < 400 else []))
+    writer.close()
+    reader = ReplayReader(path)
+    assert reader.tickCount() == 1000
+    assert reader._end == HEADER.size + 2*RUN.size
+    reader.close()
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.rpl'
+    path.write_bytes(b'not a replay file at all, but long enough for a header')
+    with pytest.raises(ValueError):
+        ReplayReader(str(path))
+
+
+def test_seek_matches_playing_from_start(tmp_path):
+    path = str(tmp_path / 'game.rpl')
+    recorder = InputRecorder(11)
+    writer = ReplayWriter(path, 11)
+    play(recorder, 2*KEYFRAME_INTERVAL + 500, 2)
+    play(writer, 2*KEYFRAME_INTERVAL + 500, 2)
+    writer.close()
+
+    game = HeadlessGame(11)
+    input = ReplayInput(recorder.getTicks())
+    states = [game.save()]
+    while not input.isFinished():
+        dt = input.advance()
+        game.update(dt, input)
+        states.append(game.save())
+    assert not game.isComplete()
+
+    reader = ReplayReader(path)
+    try:
+        assert reader.getKeyframes() == [KEYFRAME_INTERVAL, 2*KEYFRAME_INTERVAL]
+        ticks = [0, 1, KEYFRAME_INTERVAL - 1, KEYFRAME_INTERVAL, KEYFRAME_INTERVAL + 1,
+                 2*KEYFRAME_INTERVAL, len(states) - 1]
+        for tick in ticks:
+            game, input = reader.seek(tick)
+            assert game.save() == states[tick]
+        game, input = reader.seek(KEYFRAME_INTERVAL + 1)
+        while not input.isFinished():
+            dt = input.advance()
+            game.update(dt, input)
+        assert game.save() == states[-1]
+    finally:
+        reader.close()
+
+
+def test_seek_rejects_corrupted_keyframe(tmp_path):
+    path = tmp_path / 'game.rpl'
+    writer = ReplayWriter(str(path), 5)
+    game = play(writer, KEYFRAME_INTERVAL, 1)
+    snapshot = game.getSnapshot()
+    writer.keyframe(snapshot)
+    writer.record(1/TICK_RATE, HeadlessInput())
+    writer.close()
+
+    data = bytearray(path.read_bytes())
+    start = data.index(snapshot)
+    data[start] = SNAPSHOT_VERSION + 1
+    path.write_bytes(bytes(data))
+
+    reader = ReplayReader(str(path))
+    try:
+        assert reader.getKeyframes() == [KEYFRAME_INTERVAL]
+        with pytest.raises(ValueError):
+            reader.seek(KEYFRAME_INTERVAL)
+    finally:
+        reader.close()
+
+
+def test_unclosed_file_plays_but_cannot_seek(tmp_path):
+    path = tmp_path / 'game.rpl'
+    recorder = InputRecorder(3)
+    writer = ReplayWriter(str(path), 3)
+    game = play(recorder, KEYFRAME_INTERVAL + 10, 4)
+    play(writer, KEYFRAME_INTERVAL + 10, 4)
+    writer.close()
+
+    # A game that crashes never writes the footer
+    reader = ReplayReader(str(path))
+    footer = TRAILER.size + len(reader.getKeyframes())*INDEX_ENTRY.size
+    reader.close()
+    path.write_bytes(path.read_bytes()[:-footer])
+
+    reader = ReplayReader(str(path))
+    try:
+        assert reader.getKeyframes() == []
+        assert reader.tickCount() == KEYFRAME_INTERVAL + 10
+        assert list(reader.getTicks()) == recorder.getTicks()
+        assert replay(reader).save() == game.save()
+    finally:
+        reader.close()
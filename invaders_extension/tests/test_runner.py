@@ -0,0 +1,30 @@
+"""
+Unit tests for runner.py
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+from config import *
+from runner import *
+
+
+def test_run_games_matches_play_game():
+    tasks = [(seed, {}) for seed in range(3)] + [(7, {'ALIEN_ROWS': 2, 'SHIP_LIVES': 1})]
+    results = runGames(tasks, processes=2, maxticks=600)
+    assert results.shape == (len(tasks), len(FIELDS))
+    for (row, (seed, config)) in zip(results, tasks):
+        game, ticks = playGame(seed, Config(**config), 600)
+        wave = game.getWave()
+        assert row[FIELDS.index('seed')] == seed
+        assert row[FIELDS.index('won')] == game.isWon()
+        assert row[FIELDS.index('score')] == wave.getScore()
+        assert row[FIELDS.index('lives')] == wave.getLives()
+        assert row[FIELDS.index('aliens')] == wave.countAlienAlive()
+        assert row[FIELDS.index('ticks')] == ticks <= 600
+        assert row[FIELDS.index('seconds')] > 0
+
+
+def test_chase_bot_wins_a_small_game():
+    game, ticks = playGame(3, Config(ALIEN_ROWS=1, ALIENS_IN_ROW=2))
+    assert game.isWon()
+    assert ticks < MAX_TICKS
@@ -0,0 +1,48 @@
+"""
+Unit tests for sweep.py
+
+# Toshi Tokuyama (tt426)
+"""
+from sweep import *
+import csv
+import importlib
+import sys
+import pytest
+
+
+def test_parse_grid_is_cartesian_product():
+    names, points = parseGrid(['ALIEN_SPEED=0.5,1', 'BOLT_RATE=3,5,7'])
+    assert names == ('ALIEN_SPEED', 'BOLT_RATE')
+    assert points == [(0.5, 3), (0.5, 5), (0.5, 7), (1, 3), (1, 5), (1, 7)]
+    assert parseGrid([]) == ((), [()])
+
+
+def test_parse_grid_rejects_bad_options():
+    for options in (['SPEED=1'], ['ALIEN_SPEED'], ['BOLT_RATE=3', 'BOLT_RATE=4'],
+                    ['ALIEN_SPEED=fast'], ['ALIEN_SPEED=-1'], ['ALIEN_ROWS=0']):
+        with pytest.raises(ValueError):
+            parseGrid(options)
+
+
+def test_import_keeps_argv(monkeypatch):
+    import sweep
+    monkeypatch.setattr(sys, 'argv', ['prog', '3', '4'])
+    importlib.reload(sweep)
+    assert sys.argv == ['prog', '3', '4']
+
+
+def test_sweep_rows_and_files(tmp_path):
+    names, points = parseGrid(['ALIEN_ROWS=1,2'])
+    rows = sweep(names, points, range(2), processes=1, maxticks=300)
+    assert [row[:2] for row in rows] == [(1, 2), (2, 2)]
+    for row in rows:
+        assert len(row) == len(names) + len(COLUMNS)
+        assert row[COLUMNS.index('ticks_per_second') + 1] > 0
+
+    path = str(tmp_path / 'sweep.csv')
+    writeCsv(path, names, rows)
+    with open(path) as file:
+        lines = list(csv.reader(file))
+    assert lines[0] == list(names + COLUMNS)
+    assert len(lines) == 3
+    assert toArray(names, rows)['ALIEN_ROWS'].tolist() == [1, 2]
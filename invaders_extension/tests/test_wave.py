@@ -0,0 +1,69 @@
+"""
+Unit tests for wave.py, on the null backend of game2d
+
+# Toshi Tokuyama (tt426)
+"""
+from consts import *
+import pytest
+
+pytestmark = pytest.mark.usefixtures('nullbackend')
+
+
+def test_march_only_moves_the_formation():
+    from wave import Wave
+    wave = Wave(0)
+    aliens = wave.aliensAlive()
+    before = [(alien.x, alien.y) for alien in aliens]
+    for frame in range(200):
+        wave.updateAlien(1/TICK_RATE)
+    wave.syncAliens()
+
+    offx, offy = wave._sim.getAliens().getOffset()
+    assert offx != 0
+    assert (wave._formation.x, wave._formation.y) == (offx, offy)
+    assert [(alien.x, alien.y) for alien in aliens] == before
+
+
+def test_dead_aliens_leave_the_formation():
+    from wave import Wave
+    wave = Wave(0)
+    formation = wave._sim.getAliens()
+    index = formation.lowest(2)
+    formation.kill(index)
+    wave.syncAlive()
+    row, col = divmod(index, formation.getCols())
+    assert wave.getAliens()[row][col] is None
+    assert len(wave._formation.children) == formation.count()
+
+
+def test_bolt_pool_counts_hits_and_misses():
+    from wave import Wave, BoltPool
+    wave = Wave(0)
+    pool = BoltPool(wave.makeBolt, 2)
+    bolts = [pool.acquire() for count in range(3)]
+    assert (pool.getHits(), pool.getMisses(), pool.getFree()) == (0, 3, 0)
+    for bolt in bolts:
+        bolt.setX(50)
+        bolt.setY(60)
+        pool.release(bolt)
+    assert pool.getFree() == pool.getLimit() == 2
+    again = pool.acquire()
+    assert again is bolts[1]
+    assert (again.getX(), again.getY()) == (0, 0)
+    assert (pool.getHits(), pool.getMisses(), pool.getFree()) == (1, 3, 1)
+
+
+def test_wave_reuses_its_bolts():
+    from wave import Wave
+    from game2d import GFakeInput
+    wave = Wave(0)
+    keys = GFakeInput()
+    keys.set_keys(['up'])
+    for frame in range(600):
+        wave.beginStep()
+        wave.updateBolts(keys)
+        wave.collision()
+    pool = wave.getBoltPool()
+    assert pool.getMisses() == 1
+    assert pool.getHits() > 1
+    assert len(wave.getBolts()) + pool.getFree() == 1
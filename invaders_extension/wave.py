@@ -8,6 +8,23 @@ new level, you are expected to make a new instance of the class.
 The subcontroller Wave manages the ship, the aliens and any laser bolts on screen.
 These are model objects.  Their classes are defined in models.py.
 
+The rules of the game are played by a HeadlessWave (see headless.py), which does not
+need any graphics.  Wave passes every update to its HeadlessWave and then moves the
+model objects to match, so the models are only a view of the simulation.  The lives,
+the score, the direction of the aliens and the time until the next alien shot are all
+kept in the HeadlessWave.
+
+The aliens never move on their own.  Their positions are relative to a GScene, which
+is moved to the offset of the formation in the HeadlessWave, so a march step only
+moves the scene, no matter how many aliens there are.  In fact, the models are only
+moved when the wave is drawn, to where the simulation was a fraction alpha of the way
+through its last step.  Between two draws, only the number of bolts and their
+x-coordinates are kept up to date.
+
+A state saved from the HeadlessWave can be restored at any time, and the models are
+never made again: the wave keeps every alien and the ship, alive or not, and the
+bolts that leave the screen go back to a BoltPool to be reused.
+
 Most of your work on this assignment will be in either this module or models.py.
 Whether a helper method belongs in this module or models.py is often a complicated
 issue.  If you do not know, ask on Piazza and we will answer.
@@ -18,7 +35,7 @@ issue.  If you do not know, ask on Piazza and we will answer.
 from game2d import *
 from consts import *
 from models import *
-import random
+from headless import *
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not permitted
@@ -46,8 +63,6 @@ class Wave(object):
         _aliens: the 2d list of aliens in the wave [rectangular 2d list of Alien or None]
         _bolts:  the player laser bolts currently on screen [list of Bolt, possibly empty]
         _dline:  the defensive line being protected [GPath]
-        _lives:  the number of lives left  [int >= 0]
-        _time:   The amount of time since the last Alien "step" [number >= 0]
 
     As you can see, all of these attributes are hidden.  You may find that you want to
     access an attribute in class Invaders. It is okay if you do, but you MAY NOT ACCESS
@@ -61,11 +76,16 @@ class Wave(object):
 
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
 
-        _direction: the direction in which the aliens are moving
         _alienbolts: the alien laser bolts currently on screen [list of Bolt, possibly empty]
-        _tofire: the number of steps between alien shots
         _soundEffect: sound effect when the alien or the ship is destroyed
-        _score: Score of the game
+        _sim: the simulation that plays the rules of this wave [HeadlessWave]
+        _formation: the aliens that are not None, drawn together [GScene]
+        _allaliens: every alien model, alive or not, in row-major order [list of Alien]
+        _mask:      the aliens in _aliens that are not None, as in Formation.getMask [int]
+        _shipmodel: the ship model, kept while the ship is destroyed [Ship]
+        _boltpool:  the player bolts no longer on screen, for reuse [BoltPool of Bolt]
+        _alienpool: the alien bolts no longer on screen, for reuse
+                    [BoltPool of alienBolt]
     """
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
@@ -103,7 +123,7 @@ class Wave(object):
         """
         Returns the number of lives left
         """
-        return self._lives
+        return self._sim.getLives()
 
     def setLives(self, value):
         """
@@ -112,13 +132,13 @@ class Wave(object):
         Precondition: value is int greater than 0 (int>0)
         """
         assert type(value) == int
-        self._lives = value
+        self._sim.setLives(value)
 
     def getTime(self):
         """
         Returns the the amount of time since the last Alien "step"
         """
-        return self._time
+        return self._sim.getTime()
 
     def getAlienBolts(self):
         """
@@ -126,6 +146,30 @@ class Wave(object):
         """
         return self._alienbolts
 
+    def getBoltPool(self):
+        """
+        Returns the pool of unused player bolts
+        """
+        return self._boltpool
+
+    def getAlienBoltPool(self):
+        """
+        Returns the pool of unused alien bolts
+        """
+        return self._alienpool
+
+    def getSeed(self):
+        """
+        Returns the seed of the random number generator of this wave
+        """
+        return self._sim.getSeed()
+
+    def getSim(self):
+        """
+        Returns the simulation that plays the rules of this wave
+        """
+        return self._sim
+
     # Extensions
 
     def getsoundEffect(self):
@@ -144,77 +188,81 @@ class Wave(object):
         """
         Add specification
         """
-        return self._score
+        return self._sim.getScore()
 
     def setScore(self, value):
         """
         Add specification
         """
-        self._score = value
+        self._sim.setScore(value)
 
 
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
 
-    def __init__(self):
+    def __init__(self, seed=None, config=None):
         """
         Initializer: Creates aliens and ship necessary for the game
-        """
-        self._time = 0
 
-        self._direction = 1
+        Parameter seed: The seed of the random number generator (a new one if None)
+        Precondition: seed is None or an int >= 0
+
+        Parameter config: The configuration of the game (the one in consts.py if None)
+        Precondition: config is None or a Config
+        """
+        self._sim = HeadlessWave(seed, config)
+        config = self._sim.getConfig()
 
         self.alien_create()
 
-        self._ship = Ship(x=GAME_WIDTH / 2, y=SHIP_BOTTOM, width=SHIP_WIDTH,
-                            height=SHIP_HEIGHT, source='ship.png')
+        self._shipmodel = Ship(x=config.GAME_WIDTH / 2, y=config.SHIP_BOTTOM,
+                               width=config.SHIP_WIDTH, height=config.SHIP_HEIGHT,
+                               source='ship.png')
+        self._ship = self._shipmodel
 
-        self._dline = DLine(points = [0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE],
+        self._dline = DLine(points = [0,config.DEFENSE_LINE,
+                                      config.GAME_WIDTH,config.DEFENSE_LINE],
                             linecolor = COLOR, linewidth = 2)
 
         self._bolts = []
+        self._boltpool = BoltPool(self.makeBolt)
 
         self._alienbolts = []
-
-        self._tofire = random.randrange(1, BOLT_RATE, 1)
-
-        self._lives = 3
+        self._alienpool = BoltPool(self.makeAlienBolt)
 
         #Extension
         self._soundEffect = True 
 
-        self._score = 0
-
 
     def alien_create(self):
         """
-        Creates the alien used in the game.
+        Creates the alien used in the game, at the positions of the aliens in _sim
+        relative to the formation.
         """
         self._aliens = []
 
-        for row in range(ALIEN_ROWS):
+        config = self._sim.getConfig()
+        formation = self._sim.getAliens()
+        xs = formation.getX().tolist()
+        ys = formation.getY().tolist()
+        cols = formation.getCols()
+        for row in range(formation.getRows()):
             accum = []
-            for alien in range(ALIENS_IN_ROW):
-                if (row % ALIEN_ROWS) == 0:
-                    accum.append(Alien((LEFT_TO_FIRST) + (ADDING_ROW) * alien,
-                                       y=(TOP_TO_FIRST) - (ADDING_COLUMN) * row, width=ALIEN_WIDTH,
-                                       height=ALIEN_HEIGHT, source='alien3.png'))
-                if row in range(1, 3):
-                    accum.append(Alien((LEFT_TO_FIRST) + (ADDING_ROW) * alien,
-                                       y=(TOP_TO_FIRST) - (ADDING_COLUMN) * row, width=ALIEN_WIDTH,
-                                       height=ALIEN_HEIGHT, source='alien2.png'))
-                if row in range(3, 5):
-                    accum.append(Alien((LEFT_TO_FIRST) + (ADDING_ROW) * alien,
-                                       y=(TOP_TO_FIRST) - (ADDING_COLUMN) * row, width=ALIEN_WIDTH,
-                                       height=ALIEN_HEIGHT, source='alien1.png'))
-                if row in range(5, 7):
-                    accum.append(Alien((LEFT_TO_FIRST) + (ADDING_ROW) * alien,
-                                       y=(TOP_TO_FIRST) - (ADDING_COLUMN) * row, width=ALIEN_WIDTH,
-                                       height=ALIEN_HEIGHT, source='alien2.png'))
-                if row in range(7, 10):
-                    accum.append(Alien((LEFT_TO_FIRST) + (ADDING_ROW) * alien,
-                                       y=(TOP_TO_FIRST) - (ADDING_COLUMN) * row, width=ALIEN_WIDTH,
-                                       height=ALIEN_HEIGHT, source='alien1.png'))
+            for col in range(cols):
+                accum.append(Alien(xs[row * cols + col],
+                                   y=ys[row * cols + col], width=config.ALIEN_WIDTH,
+                                   height=config.ALIEN_HEIGHT, source=alienImage(row)))
             self._aliens.append(accum)
+        self._allaliens = self.aliensAlive()
+        self._mask = formation.getMask()
+
+        offx, offy = formation.getOffset()
+        self._formation = GScene(x=offx, y=offy, children=self.aliensAlive())
+
+    def aliensAlive(self):
+        """
+        Returns the list of aliens in _aliens that are not None
+        """
+        return [alien for row in self._aliens for alien in row if alien is not None]
         
     # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
 
@@ -230,13 +278,7 @@ class Wave(object):
         """
         assert isinstance(input, GInput)
 
-        if self._ship is not None:
-            if input.is_key_down('left'):
-                if min(0, self._ship.getPosx() - SHIP_WIDTH/2) == 0:
-                    self._ship.setPosx(self._ship.getPosx() - SHIP_MOVEMENT)
-            if input.is_key_down('right'):
-                if max(self._ship.getPosx() + SHIP_WIDTH/2, GAME_WIDTH) == GAME_WIDTH:
-                    self._ship.setPosx(self._ship.getPosx() + SHIP_MOVEMENT)
+        self._sim.updateShip(input)
 
     ######################################## Alien ########################################
 
@@ -249,182 +291,44 @@ class Wave(object):
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
-        self._time += dt
-        if self._direction == 1:
-            if self._time > ALIEN_SPEED:
-                for x in self.getAliens():
-                    for y in x:
-                        if y != None: # Added
-                            y.setAPosx(y.getAPosx() + ALIEN_H_WALK)
-                            self._time = 0
-                self._tofire -= 1
-        if self._direction == -1:
-            if self._time > ALIEN_SPEED:
-                for x in self.getAliens():
-                    for y in x:
-                        if y != None: # Added
-                            y.setAPosx(y.getAPosx() - ALIEN_H_WALK)
-                            self._time = 0
-                self._tofire -= 1
-        
-        self.moveLeftRight()
-
-
-    def moveLeftRight(self):
-        """
-        If the alien reaches the right end of the screen, the alien will move
-        down by ALIEN_V_WALK and march to the left by ALIEN_H_WALK. Similarily,
-        if the alien reaches the left end of the screen, the alien will move
-        down by ALIEN_V_WALK and march to the right by ALIEN_H_WALK.
-        """
-        if self.countAlienAlive() > 1:
-            if self.mostright() >= GAME_WIDTH - ALIEN_WIDTH/2 - ALIEN_H_SEP:
-                for x in self.getAliens():
-                    for y in x:
-                        if y is not None:
-                            y.setAPosy(y.getAPosy() - ALIEN_V_WALK)
-                            y.setAPosx(y.getAPosx() - ALIEN_H_WALK)
-                    self._direction = -1
-            elif self.mostleft() <= ALIEN_WIDTH/2 + ALIEN_H_SEP:
-                for x in self.getAliens():
-                    for y in x:
-                        if y is not None:
-                            y.setAPosy(y.getAPosy() - ALIEN_V_WALK)
-                            y.setAPosx(y.getAPosx() + ALIEN_H_WALK)
-                    self._direction = 1
-        else:
-            if self.alienOneLeft().getAPosx() >= BORDER_RIGHT:
-                self.alienOneLeft().setAPosy(self.alienOneLeft().getAPosy()
-                                            - ALIEN_V_WALK)
-                self.alienOneLeft().setAPosx(self.alienOneLeft().getAPosx()
-                                            - ALIEN_H_WALK)
-                self._direction = -1
-            elif self.alienOneLeft().getAPosx() <= ALIEN_WIDTH/2 + ALIEN_H_SEP:
-                self.alienOneLeft().setAPosy(self.alienOneLeft().getAPosy()
-                                            - ALIEN_V_WALK)
-                self.alienOneLeft().setAPosx(self.alienOneLeft().getAPosx()
-                                            + ALIEN_H_WALK)
-                self._direction = 1
-                
-
-    def mostright(self):
-        """
-        Finds the rightmost alien that is on the screen.
-        """
-        new_alien = self.transpose(self._aliens)
-        new_list = [] # new_list is 2D list
-        new_list_2 = [] # new_list_2 is 1D list
-
-        # Get x-position of alien for each element in list
-        for row in range(ALIENS_IN_ROW):
-            accum = []
-            for col in range(ALIEN_ROWS):
-                if new_alien[row][col] is not None:
-                    accum.append(new_alien[row][col].getAPosx())
-            new_list.append(accum)
-
-        # Get maximum alien(x-position) from new_list and append to new_list_2
-        for index in range(len(new_list)):
-            if new_list[index] != []:
-                new_list_2.append(max(new_list[index]))
-       
-        # Remove all None(s) from new_list_2
-        for x in new_list_2:
-            if len(new_list_2) > 1:
-                if x == None:
-                    new_list_2.remove(x)
-                getmax = max(new_list_2)
-            else:
-                getmax = new_list_2[0]
-
-        return getmax
-        
-    def mostleft(self):
-        """
-        Finds the leftmost alien that is on the screen.
-        """
-        alien_list = self._aliens
-        new_alien = self.transpose(alien_list)
-        new_list = []  # new_list is 2D list
-        new_list_2 = []  # new_list_2 is 1D list
+        self._sim.updateAlien(dt)
 
-        # Get x-position of alien for each element in list
-        for row in range(ALIENS_IN_ROW):
-            accum = []
-            for col in range(ALIEN_ROWS):
-                if new_alien[row][col] is not None:
-                    accum.append(new_alien[row][col].getAPosx())
-            new_list.append(accum)
-
-        # Get minimum alien(x-position) from new_list and append to new_list_2
-        for index in range(len(new_list)):
-            if new_list[index] != []:
-                new_list_2.append(min(new_list[index]))
-    
-        # Remove all None(s) from new_list_2
-        for x in new_list_2:
-            if len(new_list_2) > 1:
-                if x == None:
-                    new_list_2.remove(x)
-                getmin = min(new_list_2)
-            else:
-                getmin = new_list_2[0]
-
-        return getmin
-
-    def transpose(self, table):
+    def syncAliens(self, alpha=1.0):
         """
-        Returns: copy of table with rows and columns swapped
+        Moves _formation to the offset of the formation in _sim, a fraction alpha of
+        the way through its last step.
 
-        Parameter table: 2d list
-        Precondition: table is a (non-ragged) 2d List
+        Parameter alpha: The fraction of the step
+        Precondition: alpha is a number in 0..1
         """
-        numrows = len(table)  # Need number of rows
-        numcols = len(table[0])  # All rows have same no. cols
-        result = []  # Result (new table) accumulator
-        for m in range(numcols):
-            row = []  # Single row accumulator
-            for n in range(numrows):
-                row.append(table[n][m])  # Create a new row list
-            result.append(row)  # Add result to table
-        return result
+        offx, offy = self._sim.offsetAt(alpha)
+        if self._formation.x != offx or self._formation.y != offy:
+            self._formation.x = offx
+            self._formation.y = offy
 
-        #Code copied from Lecture 16
-
-    def countAlienAlive(self):
+    def syncAlive(self):
         """
-        Counts the number of alien in self._aliens that are not None
+        Matches the aliens in _aliens and _formation to the aliens alive in _sim.
         """
-        count = 0
-
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if self._aliens[row][col] != None:
-                    count += 1
-        return count
+        formation = self._sim.getAliens()
+        if formation.getMask() != self._mask:
+            for index in range(len(self._allaliens)):
+                row, col = divmod(index, formation.getCols())
+                if formation.isAlive(index):
+                    self._aliens[row][col] = self._allaliens[index]
+                else:
+                    self._aliens[row][col] = None
+            self._formation.children = self.aliensAlive()
+            self._mask = formation.getMask()
 
-    def alienOneLeft(self):
+    def countAlienAlive(self):
         """
-        Returns the last alien on the screen.
+        Counts the number of alien in self._aliens that are not None
         """
-        lastalien = []
-
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if self._aliens[row][col] != None:
-                    lastalien.append(self._aliens[row][col])
-        return lastalien[0]
+        return self._sim.countAlienAlive()
 
     ######################################## Bolt ########################################
 
-    def makeBolts(self):
-        """
-        Creates the bolt shot by the ship.
-        """
-        self._bolts.append(Bolt(x=self._ship.getPosx(), y=self._ship.getPosy() + SHIP_HEIGHT/2,
-                           width=BOLT_WIDTH, height=BOLT_HEIGHT,
-                           fillcolor=introcs.HSV(0.2, 0.3, 0.4), velocity=BOLT_SPEED))
-
     def updateBolts(self, input):
         """
         Moves the y-coordinate of the bolts to shoot the alien
@@ -434,100 +338,101 @@ class Wave(object):
         """
         assert isinstance(input, GInput)
 
-        if input.is_key_down('up'):
-            if self._bolts == []:
-                self.makeBolts()
-            
-        for x in self._bolts:
-            x.move()
-        
-        i = 0
-        while i < len(self._bolts):
-            if self._bolts[i].y - BOLT_HEIGHT/2 > GAME_HEIGHT:
-                del self._bolts[i]
-            else:
-                i += 1
+        self._sim.updateBolts(input)
+        self.syncBolts()
 
-    def makeAlienBolts(self):
+    def updateAlienBolts(self):
         """
-        Creates the bolts shot by the alien. The bottom-most alien
-        shoots the bolt.
+        Makes the alien fire the bolts
         """
-        t_list = self.transpose(self._aliens)
-        t_list_2 = [] # Transpose matrix
-        t_list_3 = []
-        
-        #Create a transpose matrix and find y-coordinate
-        for row in range(ALIENS_IN_ROW):
-            accum = []
-            for col in range(ALIEN_ROWS):
-                if t_list[row][col] is not None:
-                    accum.append(t_list[row][col])
-            t_list_2.append(accum)
-        
-        #Find the minimum alien of each row and append to new list
-        for index in range(len(t_list_2)):
-            if t_list_2[index] != []:
-                t_list_3.append(t_list_2[index][-1])
-                column = random.randint(0, len(t_list_3)-1)
-        
-        if len(t_list_3) > 1:
-            for x in t_list_3:
-                if x == None:
-                    t_list_3.remove(x)
+        self._sim.updateAlienBolts()
+        self.syncAlienBolts()
 
-        self._alienbolts.append(alienBolt(x=t_list_3[column].getAPosx(),
-                                y=t_list_3[column].getAPosy() - ALIEN_WIDTH/2,
-                                width=BOLT_WIDTH, height=BOLT_HEIGHT,
-                                fillcolor=COLOR, velocity=BOLT_SPEED))
+    def makeBolt(self):
+        """
+        Returns a new player bolt at (0,0), for _boltpool
+        """
+        config = self._sim.getConfig()
+        return Bolt(x=0, y=0, width=config.BOLT_WIDTH, height=config.BOLT_HEIGHT,
+                    fillcolor=introcs.HSV(0.2, 0.3, 0.4), velocity=config.BOLT_SPEED)
 
-    def updateAlienBolts(self):
+    def makeAlienBolt(self):
         """
-        Makes the alien fire the bolts
+        Returns a new alien bolt at (0,0), for _alienpool
         """
-        #print(self._tofire)
+        config = self._sim.getConfig()
+        return alienBolt(x=0, y=0, width=config.BOLT_WIDTH, height=config.BOLT_HEIGHT,
+                         fillcolor=COLOR, velocity=config.BOLT_SPEED)
 
-        if self._tofire == 0:
-            self.makeAlienBolts()
+    def syncBolts(self):
+        """
+        Matches the bolts in _bolts to the player bolts in _sim.
 
-        for x in self._alienbolts:
-            x.moveBoltAlien()
+        Bolts that are no longer needed go back to their pool, and new ones are
+        taken from it.
+        """
+        positions = self._sim.getBolts()
+        while len(self._bolts) > len(positions):
+            self._boltpool.release(self._bolts.pop())
+        while len(self._bolts) < len(positions):
+            self._bolts.append(self._boltpool.acquire())
+        for index in range(len(positions)):
+            self._bolts[index].setX(positions[index][0])
 
-            self._tofire = random.randrange(1, BOLT_RATE, 1)
+    def syncAlienBolts(self):
+        """
+        Matches the bolts in _alienbolts to the alien bolts in _sim.
 
-        i = 0
-        while i < len(self._alienbolts):
-            if self._alienbolts[i].y + BOLT_HEIGHT/2 < 0:
-                del self._alienbolts[i]
-            else:
-                i += 1
+        Bolts that are no longer needed go back to their pool, and new ones are
+        taken from it.
+        """
+        positions = self._sim.getAlienBolts()
+        while len(self._alienbolts) > len(positions):
+            self._alienpool.release(self._alienbolts.pop())
+        while len(self._alienbolts) < len(positions):
+            self._alienbolts.append(self._alienpool.acquire())
+        for index in range(len(positions)):
+            self._alienbolts[index].setX(positions[index][0])
+
+    def beginStep(self):
+        """
+        Records where everything is before the next step, so that the wave can be drawn
+        between the two.  It must be called once per frame, before any update.
+        """
+        self._sim.beginStep()
 
-        
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self, view):
+    def draw(self, view, alpha=1.0):
         """
         Draws the ship, aliens, defensive line, and bolts
 
-        
+        Everything that moves is drawn a fraction alpha of the way from where it was
+        at the start of the last step to where it is now.
+
         Parameter view: the game view, used in drawing
-        Precondition: Immutable instance of GView; it is inherited from GameApp
+        Precondition: Immutable instance of GView, GRaster or GNullView (the view of
+        the backend); it is inherited from GameApp
+
+        Parameter alpha: The fraction of the step
+        Precondition: alpha is a number in 0..1
         """
-        assert isinstance(view, GView)
+        assert isinstance(view, (GView, GRaster, GNullView))
 
-        for x in self.getAliens():
-            for y in x:
-                if y != None: # Added
-                    y.draw(view)
+        self.syncAliens(alpha)
+        self._formation.draw(view)
 
         if self._ship != None:
+            self._ship.setPosx(self._sim.shipXAt(alpha))
             self.getShip().draw(view)
 
         self.getDlines().draw(view)
 
-        for x in self.getBolts():
+        for x, bolt in zip(self.getBolts(), self._sim.getBolts()):
+            x.setY(interpolate(bolt[2], bolt[1], alpha))
             x.draw(view)
 
-        for x in self.getAlienBolts():
+        for x, bolt in zip(self.getAlienBolts(), self._sim.getAlienBolts()):
+            x.setY(interpolate(bolt[2], bolt[1], alpha))
             x.draw(view)
 
 
@@ -538,73 +443,175 @@ class Wave(object):
         Removes the bolt from _bolt if the bolt hits the alien
         and sets the _alien which was hit to None
         """
-       
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                for z in self.getBolts():
-                    if self._aliens[row][col] != None: # Added
-                        if self._aliens[row][col].collidesAlien(z):
-                            self._aliens[row][col] = None
-                            if self._aliens[row][col] == None:
-                                self._bolts.remove(z)
-
-                            #Extension
-                            if row % 6 == 0:
-                                self.setScore(self.getScore() + 30)
-                            elif (row-1) % 6 == 0 or (row-2) % 6 == 0:
-                                self.setScore(self.getScore() + 20)
-                            else:
-                                self.setScore(self.getScore() + 10)
-                            if self._soundEffect == True:
-                                sound = Sound('pew1.wav')
-                                sound.play()
+        hits = self._sim.collision()
+        if hits > 0:
+            self.syncAlive()
+            self.syncBolts()
+
+            #Extension
+            if self._soundEffect == True:
+                for hit in range(hits):
+                    sound = Sound('pew1.wav')
+                    sound.play()
 
     def collisionShip(self):
         """
         Removes the bolt from _alienbolt if the bolt hits the ship
         and sets _ship to None
         """
-        sound_2 = Sound('blast3.wav')
-        
-        for alienbolts in self.getAlienBolts():
-            if self._ship != None:
-                if self._ship.collidesShip(alienbolts):
-                    self._ship = None
-                    self._alienbolts.remove(alienbolts)
-                    if self._soundEffect == True:
-                        sound_2 = Sound('blast3.wav')
-                        sound_2.play()
+        if self._sim.collisionShip():
+            self._ship = None
+            self.syncAlienBolts()
+            if self._soundEffect == True:
+                sound_2 = Sound('blast3.wav')
+                sound_2.play()
 
     def loseRound(self):
         """
         Returns True if the _ship is equal to None
         """
         
-        return self._ship is None
+        return self._sim.loseRound()
     
     def overDefenseLine(self):
         """
         Returns True is alien pass over the defense line.
         """
-        aliveAlien = []
-
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if self.getAliens()[row][col] != None:
-                    aliveAlien.append(self.getAliens()[row][col])
-
-        for x in aliveAlien:
-            if x.getAPosy()-ALIEN_HEIGHT/2 <= DEFENSE_LINE:
-                return True
+        return self._sim.overDefenseLine()
 
     def restoreShip(self):
         """
         Restores the ship after it was set to None
         """
-        if self._ship == None:
-            self._ship = Ship(x=GAME_WIDTH/2, y=SHIP_BOTTOM, width=SHIP_WIDTH,
-                            height=SHIP_HEIGHT, source='ship.png')
+        self._sim.restoreShip()
+        self._ship = self._shipmodel
 
-        
+    # SAVING AND RESTORING
 
-        
+    def save(self):
+        """
+        Returns the state of the wave as a tuple (see HeadlessWave.save)
+        """
+        return self._sim.save()
+
+    def restore(self, state):
+        """
+        Sets the wave to a state returned by save, without making any new models
+
+        Parameter state: The state of the wave
+        Precondition: state is a tuple returned by save
+        """
+        self._sim.restore(state)
+        self.syncAlive()
+        self.syncAliens()
+        self.syncBolts()
+        self.syncAlienBolts()
+        self._ship = None if self._sim.getShipX() is None else self._shipmodel
+
+
+class BoltPool(object):
+    """
+    A class to reuse the bolt models of a wave.
+
+    A bolt that leaves the screen or hits something is released to the pool instead
+    of being thrown away, and the next bolt fired takes it back, so firing does not
+    make a new model (with all of its graphics) every time.  The pool keeps at most
+    getLimit() unused bolts; any more that are released are thrown away.
+
+    INSTANCE ATTRIBUTES:
+        _factory: makes a new bolt when the pool is empty
+                  [callable with no arguments that returns a Bolt or alienBolt]
+        _free:    the unused bolts [list of Bolt or alienBolt, len <= _limit]
+        _limit:   the most unused bolts kept [int >= 0]
+        _hits:    the number of bolts taken from the pool [int >= 0]
+        _misses:  the number of bolts made because the pool was empty [int >= 0]
+    """
+
+    # GETTERS
+
+    def getLimit(self):
+        """
+        Returns the most unused bolts that the pool keeps
+        """
+        return self._limit
+
+    def getFree(self):
+        """
+        Returns the number of unused bolts in the pool
+        """
+        return len(self._free)
+
+    def getHits(self):
+        """
+        Returns the number of bolts taken from the pool
+        """
+        return self._hits
+
+    def getMisses(self):
+        """
+        Returns the number of bolts made because the pool was empty
+        """
+        return self._misses
+
+    # INITIALIZER
+
+    def __init__(self, factory, limit=BOLT_POOL_SIZE):
+        """
+        Initializer: Creates an empty pool
+
+        Parameter factory: Makes a new bolt
+        Precondition: factory is a callable with no arguments that returns a Bolt or
+        an alienBolt
+
+        Parameter limit: The most unused bolts kept
+        Precondition: limit is an int >= 0
+        """
+        assert callable(factory)
+        assert type(limit) == int and limit >= 0
+        self._factory = factory
+        self._free = []
+        self._limit = limit
+        self._hits = 0
+        self._misses = 0
+
+    # PUBLIC METHODS
+
+    def acquire(self):
+        """
+        Returns a bolt at (0,0): an unused one if there is one, or else a new one
+        """
+        if self._free:
+            self._hits += 1
+            return self._free.pop()
+        self._misses += 1
+        return self._factory()
+
+    def release(self, bolt):
+        """
+        Puts a bolt that is no longer on screen back in the pool
+
+        The bolt is moved back to (0,0).  It is thrown away if the pool is full.
+
+        Parameter bolt: The bolt
+        Precondition: bolt was returned by acquire and is no longer used
+        """
+        if len(self._free) < self._limit:
+            bolt.setX(0)
+            bolt.setY(0)
+            self._free.append(bolt)
+
+
+# HELPER FUNCTIONS
+
+def alienImage(row):
+    """
+    Returns the image file for the aliens in the given row
+
+    Parameter row: The row of the alien (0 is the top row)
+    Precondition: row is an int in 0..ALIEN_ROWS-1
+    """
+    if row == 0:
+        return 'alien3.png'
+    elif row in range(1, 3) or row in range(5, 7):
+        return 'alien2.png'
+    return 'alien1.png'